@@ -89,7 +89,12 @@ class AgentLoop(ABC):
         await self.record(results)
         logger.info("agent_cycle_complete", agent=type(self).__name__)
 
-    async def run_forever(self, interval_seconds: int = 60, max_cycles: int = 0) -> None:
+    async def run_forever(
+        self,
+        interval_seconds: int = 60,
+        max_cycles: int = 0,
+        stop_event: asyncio.Event | None = None,
+    ) -> None:
         """
         Run run_cycle() in a loop, sleeping interval_seconds between cycles.
 
@@ -98,6 +103,8 @@ class AgentLoop(ABC):
         Args:
             interval_seconds: Seconds to sleep between cycles
             max_cycles: Maximum cycles to run (0 = infinite)
+            stop_event: When set, the loop returns after the current cycle; the
+                wait between cycles is cut short
         """
         logger.info(
             "agent_loop_started",
@@ -107,7 +114,7 @@ class AgentLoop(ABC):
         )
 
         cycles_run = 0
-        while True:
+        while stop_event is None or not stop_event.is_set():
             try:
                 await self.run_cycle()
             except Exception as e:
@@ -123,4 +130,30 @@ class AgentLoop(ABC):
                 logger.info("agent_loop_finished", agent=type(self).__name__, cycles=cycles_run)
                 return
 
-            await asyncio.sleep(interval_seconds)
+            if stop_event is None:
+                await self.wait_for_next_cycle(interval_seconds)
+            else:
+                await self._wait_unless_stopped(interval_seconds, stop_event)
+
+        logger.info("agent_loop_stopped", agent=type(self).__name__, cycles=cycles_run)
+
+    async def _wait_unless_stopped(self, interval_seconds: int, stop_event: asyncio.Event) -> None:
+        """Run wait_for_next_cycle(), returning early if stop_event is set."""
+        waiters = {
+            asyncio.ensure_future(self.wait_for_next_cycle(interval_seconds)),
+            asyncio.ensure_future(stop_event.wait()),
+        }
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def wait_for_next_cycle(self, interval_seconds: int) -> None:
+        """
+        Wait between cycles. Subclasses may override to wake early on new work.
+
+        Args:
+            interval_seconds: Maximum seconds to wait
+        """
+        await asyncio.sleep(interval_seconds)
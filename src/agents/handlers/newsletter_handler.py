@@ -110,7 +110,12 @@ class NewsletterHandler:
         )
 
     async def _run_cycle(self) -> CycleResult:
-        return await self._build_orchestrator().run_cycle(mode="production")
+        orchestrator = self._build_orchestrator()
+        try:
+            return await orchestrator.run_cycle(mode="production")
+        finally:
+            # Wait for background usage tracking (see NewsletterAgent.act)
+            await orchestrator.aclose()
 
     @staticmethod
     def _format_reply(result: CycleResult) -> str:
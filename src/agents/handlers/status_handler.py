@@ -19,9 +19,10 @@ logger = get_logger("handler.status")
 class StatusHandler:
     """Builds the /status reply from live DB data."""
 
-    def __init__(self, state_manager: StateManager):
+    def __init__(self, state_manager: StateManager, task_queue: TaskQueue | None = None):
         self.state_manager = state_manager
-        self.task_queue = TaskQueue()
+        # Callers pass their own queue so its connection is shared, not reopened
+        self.task_queue = task_queue or TaskQueue()
 
     async def get_status(self) -> str:
         """
@@ -123,7 +123,12 @@ class NewsletterAgent(AgentLoop):
                 logger.error("newsletter_skipped", reason="production config invalid")
                 continue
             orchestrator = self._build_orchestrator()
-            result = await orchestrator.run_cycle(mode="production")
+            try:
+                result = await orchestrator.run_cycle(mode="production")
+            finally:
+                # Usage tracking runs in the background; let it land before the
+                # agent returns so a shutdown does not cancel it
+                await orchestrator.aclose()
             results.append(result)
         return results
 
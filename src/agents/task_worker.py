@@ -8,6 +8,8 @@ record() → persist outcome; for waiting_clarification tasks, pause the task
            and forward the questions to Telegram instead of finalising.
 """
 
+from typing import Any
+
 from src.agents.base import AgentLoop
 from src.agents.handlers.code_handler import CodeHandler
 from src.agents.handlers.newsletter_handler import HandlerResult, NewsletterHandler
@@ -30,8 +32,9 @@ class TaskWorker(AgentLoop):
     """
     Drains the TaskQueue and dispatches each task to its handler.
 
-    Runs every 5 seconds (configured in MasterAgent). A crash inside
-    a single task is caught and recorded — the worker keeps running.
+    Runs every 5 seconds (configured in MasterAgent), or as soon as a task
+    is pushed from the same process. A crash inside a single task is
+    caught and recorded — the worker keeps running.
     """
 
     def __init__(self, state_manager: StateManager, memory_store: MemoryStore | None = None):
@@ -90,6 +93,17 @@ class TaskWorker(AgentLoop):
                             result.task.chat_id, "assistant", result.reply
                         )
 
+    async def wait_for_next_cycle(self, interval_seconds: int) -> None:
+        """Sleep until the next poll, waking early when a task is pushed in-process."""
+        await self.task_queue.wait_for_push(interval_seconds)
+
+    async def run_forever(self, *args: Any, **kwargs: Any) -> None:
+        """Run the AgentLoop, closing the queue's connection once it returns."""
+        try:
+            await super().run_forever(*args, **kwargs)
+        finally:
+            await self.task_queue.close()
+
     # ------------------------------------------------------------------
     # Dispatch
     # ------------------------------------------------------------------
@@ -103,7 +117,7 @@ class TaskWorker(AgentLoop):
 
             if task.task_type == "status":
                 # Edge case: status task was queued rather than handled inline
-                status_text = await StatusHandler(self.state_manager).get_status()
+                status_text = await StatusHandler(self.state_manager, self.task_queue).get_status()
                 return HandlerResult(task=task, status="done", reply=status_text)
 
             if task.task_type == "code":
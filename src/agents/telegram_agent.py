@@ -22,19 +22,31 @@ Uses python-telegram-bot v20+ async Application API.
 """
 
 import asyncio
+import time
+from collections.abc import Awaitable, Callable
 
 import anthropic
 from telegram import Update
-from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters
+from telegram.ext import Application, ContextTypes, MessageHandler, filters
+from telegram.request import HTTPXRequest
 
+from src.agents.handlers.status_handler import StatusHandler
+from src.config.constants import PLATFORM_LIMITS
 from src.config.settings import settings
 from src.core.state_manager import StateManager
 from src.core.task_queue import Task, TaskQueue
 from src.memory.memory_store import MemoryStore
 from src.utils.logger import get_logger
 
+try:
+    import orjson  # faster JSON decoding of Telegram responses
+except ImportError:
+    orjson = None
+
 logger = get_logger("telegram_agent")
 
+_Handler = Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[None]]
+
 _HELP_TEXT = """
 ElvAgent commands:
 
@@ -52,6 +64,57 @@ Free-form text is classified automatically:
   • Conversation or question → answered directly
 """.strip()
 
+# Fixed replies, built once at import rather than per message
+_UNAUTHORIZED_TEXT = "Unauthorized."
+_START_TEXT = "ElvAgent online.\nType /help for available commands."
+_NEW_CHAT_TEXT = "Conversation cleared. Starting fresh — what would you like to do?"
+_CODE_USAGE_TEXT = "Usage: /code <instruction>\nExample: /code fix the type error in main.py"
+_REMEMBER_USAGE_TEXT = (
+    "Usage: /remember <key> <value>\nExample: /remember default_repo /home/elvern/ElvAgent"
+)
+_NO_FACTS_TEXT = "No facts stored."
+
+# Unauthorized updates are logged at most once per user per window; users not
+# seen for the retention period are forgotten so the map stays bounded.
+_REJECTION_LOG_WINDOW_SECONDS = 60
+_REJECTION_LOG_RETENTION_SECONDS = 300
+
+_MAX_MESSAGE_CHARS = PLATFORM_LIMITS["telegram"]["max_chars"]
+
+# Instruction characters echoed back in the code-task acknowledgment
+_PREVIEW_CHARS = 80
+
+
+def _split_message(text: str, limit: int = _MAX_MESSAGE_CHARS) -> list[str]:
+    """Split *text* into chunks of at most *limit* chars, preferring line breaks."""
+    chunks: list[str] = []
+    while len(text) > limit:
+        split_at = text.rfind("\n", 0, limit)
+        if split_at <= 0:
+            split_at = limit
+        chunks.append(text[:split_at])
+        text = text[split_at:].lstrip("\n")
+    if text:
+        chunks.append(text)
+    return chunks
+
+
+class _OrjsonRequest(HTTPXRequest):
+    """HTTPXRequest that decodes Telegram's JSON responses with orjson.
+
+    parse_json_payload is PTB's documented hook for a custom JSON library.
+    Outbound bodies are left to PTB: string parameters such as message text
+    are sent as-is and never go through json.dumps.
+    """
+
+    @staticmethod
+    def parse_json_payload(payload: bytes) -> dict:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # PTB's decoder replaces invalid UTF-8 and raises TelegramError on bad JSON
+            return HTTPXRequest.parse_json_payload(payload)
+
 
 def _to_api_messages(messages: list) -> list[dict]:
     """Convert MemoryStore Message objects to Claude API message format.
@@ -98,8 +161,27 @@ class TelegramAgent:
         self.state_manager = state_manager
         self.memory_store = memory_store or MemoryStore()
         self.task_queue = TaskQueue()
+        self._status_handler = StatusHandler(state_manager, self.task_queue)
+        # Read once — _authorize runs on every update and _queue_code_task on every task
+        self._owner_id = int(settings.telegram_owner_id)
+        self._working_dir = str(settings.pa_working_dir)
+        # user_id → monotonic time of the last logged rejection
+        self._rejections_logged: dict[int, float] = {}
+        # Command name → handler, so routing an update is a single dict lookup
+        self._commands: dict[str, _Handler] = {
+            "start": self._handle_start,
+            "help": self._handle_help,
+            "status": self._handle_status,
+            "newsletter": self._handle_newsletter,
+            "code": self._handle_code,
+            "new_chat": self._handle_new_chat,
+            "remember": self._handle_remember,
+            "recall": self._handle_recall,
+        }
         # Lazy Anthropic client — only initialised when an API call is needed
         self._anthropic: anthropic.AsyncAnthropic | None = None
+        # Resolved by stop() to end run_forever() gracefully
+        self._stop: asyncio.Future[None] | None = None
 
     # ------------------------------------------------------------------
     # Anthropic client (lazy)
@@ -116,20 +198,18 @@ class TelegramAgent:
     # ------------------------------------------------------------------
 
     async def run_forever(self) -> None:
-        """Start polling and block until the coroutine is cancelled."""
+        """Start polling and block until stop() is called or the coroutine is cancelled."""
+        self._stop = asyncio.get_running_loop().create_future()
         app = self._build_application()
         await app.initialize()
         await app.start()
-        await app.updater.start_polling(drop_pending_updates=True)
+        await self._start_polling(app)
 
-        logger.info(
-            "telegram_agent_polling",
-            owner_id=settings.telegram_owner_id,
-        )
+        logger.info("telegram_agent_polling", owner_id=self._owner_id)
 
         try:
             # Yield control to the event loop; PTB handles messages in the background.
-            await asyncio.Event().wait()
+            await self._stop
         except asyncio.CancelledError:
             pass
         finally:
@@ -137,40 +217,119 @@ class TelegramAgent:
             await app.updater.stop()
             await app.stop()
             await app.shutdown()
+            await self.task_queue.close()
+
+    def stop(self) -> None:
+        """Ask run_forever() to stop polling and shut down gracefully."""
+        if self._stop is not None and not self._stop.done():
+            self._stop.set_result(None)
+
+    async def _start_polling(self, app: Application) -> None:
+        """Resume polling after the last handled update.
+
+        On first run (no stored offset) the backlog is dropped. Otherwise the
+        stored offset is confirmed to Telegram so that only updates past the last
+        handled one — e.g. ones received just before a crash — are delivered.
+        """
+        last_update_id = await self.state_manager.get_telegram_update_offset()
+
+        if last_update_id is None:
+            await app.updater.start_polling(
+                allowed_updates=[Update.MESSAGE], drop_pending_updates=True
+            )
+            return
+
+        await app.bot.get_updates(offset=last_update_id + 1, limit=1, timeout=0)
+        await app.updater.start_polling(allowed_updates=[Update.MESSAGE])
 
     # ------------------------------------------------------------------
     # Application builder
     # ------------------------------------------------------------------
 
+    # Handlers that wait on the task queue or the Claude API. They run via
+    # Application.create_task (awaited on stop()) so the update loop keeps
+    # dispatching while they wait on I/O. Free text is always run this way.
+    _BACKGROUND_COMMANDS = frozenset({"newsletter", "code"})
+
     def _build_application(self) -> Application:
-        app = Application.builder().token(settings.telegram_bot_token).build()
-        app.add_handler(CommandHandler("start", self._handle_start))
-        app.add_handler(CommandHandler("help", self._handle_help))
-        app.add_handler(CommandHandler("status", self._handle_status))
-        app.add_handler(CommandHandler("newsletter", self._handle_newsletter))
-        app.add_handler(CommandHandler("code", self._handle_code))
-        app.add_handler(CommandHandler("new_chat", self._handle_new_chat))
-        app.add_handler(CommandHandler("remember", self._handle_remember))
-        app.add_handler(CommandHandler("recall", self._handle_recall))
-        app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self._handle_free_text))
+        builder = Application.builder().token(settings.telegram_bot_token)
+        if orjson is not None:
+            builder = builder.request(_OrjsonRequest()).get_updates_request(
+                _OrjsonRequest(connection_pool_size=1)
+            )
+        app = builder.build()
+        app.add_handler(MessageHandler(filters.TEXT, self._dispatch))
         return app
 
+    async def _handle_then_record(self, handling: Awaitable[None], update: Update) -> None:
+        """Await a handler, then persist its update as handled (see _start_polling).
+
+        Only the highest handled update id is kept. A handler that raises does
+        not record its update, but background handlers finish out of order, so a
+        later update that succeeds moves the offset past the failed one and it is
+        not delivered again. Updates from anyone but the owner are never
+        recorded; they cost no database write.
+        """
+        await handling
+        if update.effective_user is not None and update.effective_user.id == self._owner_id:
+            await self.state_manager.set_telegram_update_offset(update.update_id)
+
+    async def _dispatch(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Route a text message to its command handler, or to free-text handling."""
+        text = update.message.text
+        if text.startswith("/"):
+            head, *args = text.split()
+            command, _, bot_username = head[1:].partition("@")
+            if bot_username and bot_username.lower() != context.bot.username.lower():
+                return  # addressed to another bot in a group chat
+            command = command.lower()
+            handler = self._commands.get(command)
+            if handler is None:
+                return  # unknown commands are ignored, as before
+            context.args = args
+            background = command in self._BACKGROUND_COMMANDS
+        else:
+            handler = self._handle_free_text
+            background = True
+
+        handling = self._handle_then_record(handler(update, context), update)
+        if background:
+            context.application.create_task(handling, update=update)
+        else:
+            await handling
+
     # ------------------------------------------------------------------
     # Authorization
     # ------------------------------------------------------------------
 
     async def _authorize(self, update: Update) -> bool:
         """Return True if the sender is the configured owner, False otherwise."""
-        if update.effective_user.id != settings.telegram_owner_id:
-            await update.message.reply_text("Unauthorized.")
-            logger.warning(
-                "telegram_unauthorized",
-                user_id=update.effective_user.id,
-                username=update.effective_user.username,
-            )
+        if update.effective_user.id != self._owner_id:
+            await update.message.reply_text(_UNAUTHORIZED_TEXT)
+            self._log_rejection(update)
             return False
         return True
 
+    def _log_rejection(self, update: Update) -> None:
+        """Log an unauthorized update, at most once per user per window."""
+        user_id = update.effective_user.id
+        now = time.monotonic()
+        last = self._rejections_logged.get(user_id)
+        if last is not None and now - last < _REJECTION_LOG_WINDOW_SECONDS:
+            return
+
+        self._rejections_logged = {
+            uid: seen
+            for uid, seen in self._rejections_logged.items()
+            if now - seen < _REJECTION_LOG_RETENTION_SECONDS
+        }
+        self._rejections_logged[user_id] = now
+        logger.warning(
+            "telegram_unauthorized",
+            user_id=user_id,
+            username=update.effective_user.username,
+        )
+
     # ------------------------------------------------------------------
     # Inline command handlers
     # ------------------------------------------------------------------
@@ -178,7 +337,7 @@ class TelegramAgent:
     async def _handle_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         if not await self._authorize(update):
             return
-        await update.message.reply_text("ElvAgent online.\nType /help for available commands.")
+        await update.message.reply_text(_START_TEXT)
 
     async def _handle_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         if not await self._authorize(update):
@@ -189,9 +348,7 @@ class TelegramAgent:
         """Return status inline (instant, no queue)."""
         if not await self._authorize(update):
             return
-        from src.agents.handlers.status_handler import StatusHandler
-
-        status_text = await StatusHandler(self.state_manager).get_status()
+        status_text = await self._status_handler.get_status()
         await update.message.reply_text(status_text)
 
     async def _handle_new_chat(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -200,9 +357,7 @@ class TelegramAgent:
             return
         chat_id = update.effective_chat.id
         self.memory_store.clear(chat_id)
-        await update.message.reply_text(
-            "Conversation cleared. Starting fresh — what would you like to do?"
-        )
+        await update.message.reply_text(_NEW_CHAT_TEXT)
         logger.info("memory_cleared", chat_id=chat_id)
 
     # ------------------------------------------------------------------
@@ -215,8 +370,10 @@ class TelegramAgent:
             return
         chat_id = update.effective_chat.id
         task_id = await self.task_queue.push("newsletter", {}, chat_id=chat_id, priority=1)
-        await update.message.reply_text(
-            f"Starting newsletter... (task #{task_id})\nI'll reply here when it's done."
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=f"Starting newsletter... (task #{task_id})\nI'll reply here when it's done.",
+            disable_notification=True,
         )
 
     async def _handle_code(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -225,11 +382,9 @@ class TelegramAgent:
             return
         instruction = " ".join(context.args) if context.args else ""
         if not instruction:
-            await update.message.reply_text(
-                "Usage: /code <instruction>\nExample: /code fix the type error in main.py"
-            )
+            await update.message.reply_text(_CODE_USAGE_TEXT)
             return
-        await self._queue_code_task(update, instruction)
+        await self._queue_code_task(update, context, instruction)
 
     async def _handle_remember(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Persist a key/value fact: /remember <key> <value>."""
@@ -237,10 +392,7 @@ class TelegramAgent:
             return
         args = context.args or []
         if len(args) < 2:
-            await update.message.reply_text(
-                "Usage: /remember <key> <value>\n"
-                "Example: /remember default_repo /home/elvern/ElvAgent"
-            )
+            await update.message.reply_text(_REMEMBER_USAGE_TEXT)
             return
         key = args[0]
         value = " ".join(args[1:])
@@ -262,10 +414,12 @@ class TelegramAgent:
         else:
             facts = await self.state_manager.get_all_facts()
             if not facts:
-                await update.message.reply_text("No facts stored.")
+                await update.message.reply_text(_NO_FACTS_TEXT)
             else:
-                lines = [f"• {k} = {v}" for k, v in facts.items()]
-                await update.message.reply_text("\n".join(lines))
+                text = "\n".join(f"• {k} = {v}" for k, v in facts.items())
+                # Telegram rejects messages over 4096 chars — send in order, one chunk each
+                for chunk in _split_message(text):
+                    await update.message.reply_text(chunk)
 
     # ------------------------------------------------------------------
     # Free-text handler — smart routing
@@ -293,7 +447,7 @@ class TelegramAgent:
         # 2. Classify: code task vs. conversational message
         route = await self._classify_message(text)
         if route == "code":
-            await self._queue_code_task(update, text)
+            await self._queue_code_task(update, context, text)
         else:
             await self._handle_conversation(update, text)
 
@@ -378,8 +532,14 @@ class TelegramAgent:
     # Code-task helper
     # ------------------------------------------------------------------
 
-    async def _queue_code_task(self, update: Update, instruction: str) -> None:
-        """Push a code task to the queue and send an acknowledgment."""
+    async def _queue_code_task(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE, instruction: str
+    ) -> None:
+        """Push a code task to the queue and send an acknowledgment.
+
+        The acknowledgment goes out via bot.send_message rather than reply_text —
+        it does not need to quote the user's message.
+        """
         chat_id = update.effective_chat.id
         self.memory_store.add_message(chat_id, "user", instruction)
         prior_context = [m.to_dict() for m in self.memory_store.get_context(chat_id)[:-1]]
@@ -387,11 +547,19 @@ class TelegramAgent:
             "code",
             {
                 "instruction": instruction,
-                "repo": str(settings.pa_working_dir),
+                "repo": self._working_dir,
                 "context": prior_context,
             },
             chat_id=chat_id,
             priority=5,
         )
-        preview = instruction[:80] + ("..." if len(instruction) > 80 else "")
-        await update.message.reply_text(f"Coding task queued (#{task_id}).\nInstruction: {preview}")
+        # Short instructions are used as-is — no slice copy or empty-suffix concat
+        if len(instruction) <= _PREVIEW_CHARS:
+            preview = instruction
+        else:
+            preview = f"{instruction[:_PREVIEW_CHARS]}..."
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=f"Coding task queued (#{task_id}).\nInstruction: {preview}",
+            disable_notification=True,
+        )
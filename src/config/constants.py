@@ -1,7 +1,12 @@
 """
 Application constants and configuration values.
+
+Lookup tables are wrapped in MappingProxyType so they are read-only and can be
+shared without defensive copies.
 """
 
+from types import MappingProxyType
+
 # Content scoring thresholds
 MIN_SIGNIFICANT_ITEMS = 3  # Minimum items to publish newsletter
 MIN_RELEVANCE_SCORE = 5  # Minimum score (1-10) to include item
@@ -15,15 +20,17 @@ MAX_ITEMS_PER_SOURCE = 5  # Maximum items to return per researcher
 PLATFORM_NAMES = ["discord", "twitter", "instagram", "telegram", "markdown"]
 
 # Rate limiting (requests per minute)
-RATE_LIMITS = {
-    "twitter": 50,
-    "instagram": 25,
-    "telegram": 30,
-    "discord": 30,
-    "openai": 50,
-    "anthropic": 50,
-    "github": 80,
-}
+RATE_LIMITS = MappingProxyType(
+    {
+        "twitter": 50,
+        "instagram": 25,
+        "telegram": 30,
+        "discord": 30,
+        "openai": 50,
+        "anthropic": 50,
+        "github": 80,
+    }
+)
 
 # GitHub Agent
 GITHUB_RATE_LIMIT = 80  # req/min (5000/hr GitHub limit, use 80 for headroom)
@@ -41,13 +48,17 @@ RETRY_MIN_WAIT = 2  # seconds
 RETRY_MAX_WAIT = 60  # seconds
 
 # Model costs (per 1K tokens)
-MODEL_COSTS = {
-    "claude-sonnet-4-5-20250929": {"input": 0.003, "output": 0.015},
-    "claude-haiku-3-5-20241022": {"input": 0.00025, "output": 0.00125},
-    "claude-opus-4-5-20251101": {"input": 0.015, "output": 0.075},
-    "gpt-4": {"input": 0.03, "output": 0.06},
-    "dall-e-3": {"per_image": 0.02},  # Rough estimate for standard quality
-}
+MODEL_COSTS = MappingProxyType(
+    {
+        "claude-sonnet-4-5-20250929": MappingProxyType({"input": 0.003, "output": 0.015}),
+        "claude-haiku-4-5-20251001": MappingProxyType({"input": 0.001, "output": 0.005}),
+        "claude-haiku-3-5-20241022": MappingProxyType({"input": 0.00025, "output": 0.00125}),
+        "claude-opus-4-5-20251101": MappingProxyType({"input": 0.015, "output": 0.075}),
+        "gpt-4": MappingProxyType({"input": 0.03, "output": 0.06}),
+        # Rough estimate for standard quality
+        "dall-e-3": MappingProxyType({"per_image": 0.02}),
+    }
+)
 
 # Content categories
 CATEGORIES = [
@@ -60,9 +71,11 @@ CATEGORIES = [
 ]
 
 # Platform-specific limits
-PLATFORM_LIMITS = {
-    "twitter": {"max_chars": 280, "max_thread_length": 25},
-    "discord": {"max_chars": 2000, "max_embeds": 10},
-    "telegram": {"max_chars": 4096},
-    "instagram": {"max_caption_chars": 2200, "video_duration_sec": 5},
-}
+PLATFORM_LIMITS = MappingProxyType(
+    {
+        "twitter": MappingProxyType({"max_chars": 280, "max_thread_length": 25}),
+        "discord": MappingProxyType({"max_chars": 2000, "max_embeds": 10}),
+        "telegram": MappingProxyType({"max_chars": 4096}),
+        "instagram": MappingProxyType({"max_caption_chars": 2200, "video_duration_sec": 5}),
+    }
+)
@@ -3,6 +3,7 @@ Configuration settings for ElvAgent using Pydantic Settings.
 Loads configuration from environment variables with type validation.
 """
 
+from functools import lru_cache
 from pathlib import Path
 
 from pydantic import Field, field_validator
@@ -20,21 +21,20 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        # Build the validator on first instantiation rather than at import time
+        defer_build=True,
     )
 
     # Project paths
-    project_root: Path = Field(default=_PROJECT_ROOT)
+    project_root: Path = _PROJECT_ROOT
 
     # Claude API
-    anthropic_api_key: str | None = Field(
-        default=None, description="Anthropic API key for Claude (required for production)"
-    )
-    anthropic_model: str = Field(
-        default="claude-sonnet-4-5-20250929", description="Default Claude model to use"
-    )
+    anthropic_api_key: str | None = None  # Required for production
+    anthropic_model: str = "claude-sonnet-4-5-20250929"
+    anthropic_summary_model: str = "claude-haiku-4-5-20251001"  # Newsletter summary only
 
     # Social Media - Discord
-    discord_webhook_url: str | None = Field(None, description="Discord webhook URL")
+    discord_webhook_url: str | None = None
 
     # Social Media - Twitter
     twitter_api_key: str | None = None
@@ -51,63 +51,47 @@ class Settings(BaseSettings):
     telegram_chat_id: str | None = None
 
     # Image Generation
-    openai_api_key: str | None = Field(None, description="OpenAI API key for DALL-E")
+    openai_api_key: str | None = None  # DALL-E
 
     # Content Sources
-    crunchbase_api_key: str | None = Field(None, description="Crunchbase API key (optional)")
+    crunchbase_api_key: str | None = None  # Optional
 
     # Database
-    database_path: Path = Field(
-        default_factory=lambda: Path("/home/elvern/ElvAgent/data/state.db"),
-        description="Path to SQLite database",
-    )
+    database_path: Path = Field(default_factory=lambda: Path("/home/elvern/ElvAgent/data/state.db"))
 
     # Cost limits
-    max_daily_cost: float = Field(default=5.0, description="Maximum daily API cost in USD")
+    max_daily_cost: float = 5.0  # USD
+    min_items_for_cycle: int = 1  # Skip filtering/publishing when research finds fewer items
 
     # Content Enhancement
-    enable_content_enhancement: bool = Field(
-        default=True, description="Enable AI content enhancement (adds ~$0.035 per newsletter)"
-    )
-    max_items_per_category: int = Field(
-        default=5, description="Maximum items per category in enhanced mode"
+    enable_content_enhancement: bool = True  # Adds ~$0.035 per newsletter
+    max_items_per_category: int = 5  # Enhanced mode only
+    enhancement_cache_ttl: int = (
+        3600  # Seconds to reuse an identical item set's enhancement (0 = off)
     )
+    force_refresh: bool = False  # Bypass the enhancement cache
 
     # GitHub Agent
-    github_token: str | None = Field(None, description="GitHub PAT (repo + PR write scopes)")
-    github_repo: str = Field("elvern18/ElvAgent", description="owner/repo")
-    github_repo_path: Path = Field(
-        default_factory=lambda: Path("/home/elvern/ElvAgent"),
-        description="Local repo path for CIFixer",
-    )
-    github_poll_interval: int = Field(60, description="Seconds between poll cycles")
-    max_fix_attempts: int = Field(3, description="Circuit breaker: max CIFixer pushes per PR")
-    enable_github_agent: bool = Field(False, description="Enable GitHub monitoring agent")
+    github_token: str | None = None  # PAT with repo + PR write scopes
+    github_repo: str = "elvern18/ElvAgent"  # owner/repo
+    github_repo_path: Path = Field(default_factory=lambda: Path("/home/elvern/ElvAgent"))
+    github_poll_interval: int = 60  # Seconds between poll cycles
+    max_fix_attempts: int = 3  # Circuit breaker: max CIFixer pushes per PR
+    enable_github_agent: bool = False
 
     # PA (Personal Assistant) settings
-    telegram_owner_id: int = Field(
-        default=0,
-        description="Your Telegram user ID — only this user can send commands to the PA bot",
-    )
-    pa_branch_prefix: str = Field(
-        default="pa",
-        description="Git branch prefix for PA coding tasks (e.g. pa/add-feature)",
-    )
-    pa_max_tool_iterations: int = Field(
-        default=30,
-        description="Max tool_use iterations per CodingTool execution",
-    )
-    pa_allowed_commands: list[str] = Field(
-        default=["pytest", "python", "ruff", "mypy", "git", "pip", "ls", "grep", "find", "cat"],
-        description="Shell commands the PA shell tool is permitted to run",
-    )
+    telegram_owner_id: int = 0  # Only this Telegram user can send commands to the PA bot
+    pa_branch_prefix: str = "pa"  # e.g. pa/add-feature
+    pa_max_tool_iterations: int = 30  # Per CodingTool execution
+    pa_allowed_commands: frozenset[str] = frozenset(
+        {"pytest", "python", "ruff", "mypy", "git", "pip", "ls", "grep", "find", "cat"}
+    )  # Shell commands the PA shell tool may run
     pa_working_dir: Path = Field(
-        default_factory=lambda: Path("/home/elvern"),
-        description="Root directory PA file/shell tools are restricted to",
-    )
+        default_factory=lambda: Path("/home/elvern")
+    )  # File/shell tool root
 
     # Logging
-    log_level: str = Field(default="INFO", description="Logging level")
+    log_level: str = "INFO"
 
     @field_validator("database_path", mode="before")
     @classmethod
@@ -166,5 +150,11 @@ class Settings(BaseSettings):
         return True
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings instance, creating it on first call."""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -21,6 +21,14 @@ from src.utils.logger import get_logger
 
 logger = get_logger("content_pipeline")
 
+# Static instructions for the summary call; only the user message varies per newsletter
+_SUMMARY_SYSTEM_PROMPT = (
+    "You are an AI news curator. Generate a brief, engaging summary for today's AI "
+    "newsletter. Generate 2-3 sentences highlighting the most significant developments. "
+    "Be concise and focus on what matters to AI practitioners and researchers. "
+    "Do not use emojis."
+)
+
 
 class ContentPipeline:
     """
@@ -42,14 +50,22 @@ class ContentPipeline:
             if settings.anthropic_api_key
             else None
         )
-
-    async def process(self, items: list[ContentItem], date: str) -> Newsletter:
+        # Summary model and its per-1K-token rates, resolved once per pipeline
+        self.summary_model = settings.anthropic_summary_model
+        costs = MODEL_COSTS.get(self.summary_model, {})
+        self._cost_in = costs.get("input", 0)
+        self._cost_out = costs.get("output", 0)
+
+    async def process(
+        self, items: list[ContentItem], date: str, now: datetime | None = None
+    ) -> Newsletter:
         """
-        Main pipeline: filter → convert → summarize → assemble.
+        Main pipeline: deduplicate → filter + convert → summarize → assemble.
 
         Args:
             items: Raw content items from research
             date: Newsletter date (YYYY-MM-DD-HH)
+            now: Reference time for the time filter (defaults to datetime.now())
 
         Returns:
             Complete Newsletter object
@@ -60,16 +76,9 @@ class ContentPipeline:
         unique_items = await self.deduplicate(items)
         logger.info("deduplication_complete", unique_count=len(unique_items))
 
-        # Stage 2: Relevance filtering
-        relevant_items = self.filter_by_relevance(unique_items)
-        logger.info("relevance_filter_complete", relevant_count=len(relevant_items))
-
-        # Stage 3: Time filtering
-        recent_items = self.filter_by_time(relevant_items)
-        logger.info("time_filter_complete", recent_count=len(recent_items))
-
-        # Stage 4: Convert to NewsletterItem
-        newsletter_items = self.convert_to_newsletter_items(recent_items)
+        # Stages 2-4: Relevance + time filtering and conversion, fused into one pass
+        newsletter_items = self.filter_and_convert(unique_items, now=now or datetime.now())
+        logger.info("filter_complete", kept_count=len(newsletter_items))
 
         # Stage 5: Generate summary
         summary = await self.generate_summary(newsletter_items, date)
@@ -83,7 +92,7 @@ class ContentPipeline:
 
     async def deduplicate(self, items: list[ContentItem]) -> list[ContentItem]:
         """
-        Remove duplicate items using StateManager.
+        Remove duplicate items using a single batched StateManager lookup.
 
         Args:
             items: Content items to deduplicate
@@ -91,22 +100,24 @@ class ContentPipeline:
         Returns:
             List of unique items
         """
+        if not items:
+            return []
+
+        try:
+            duplicates = await self.state_manager.check_duplicates_bulk(
+                [(item.url, item.title) for item in items]
+            )
+        except Exception as e:
+            # Log error but continue (assume not duplicate to be safe)
+            logger.warning("duplicate_check_failed", error=str(e), item_count=len(items))
+            return list(items)
+
         unique_items = []
 
         for item in items:
-            try:
-                is_duplicate = await self.state_manager.check_duplicate(
-                    url=item.url, title=item.title
-                )
-
-                if not is_duplicate:
-                    unique_items.append(item)
-                else:
-                    logger.debug("duplicate_filtered", title=item.title, source=item.source)
-
-            except Exception as e:
-                # Log error but continue (assume not duplicate to be safe)
-                logger.warning("duplicate_check_failed", error=str(e), title=item.title)
+            if StateManager.generate_content_id(item.url, item.title) in duplicates:
+                logger.debug("duplicate_filtered", title=item.title, source=item.source)
+            else:
                 unique_items.append(item)
 
         return unique_items
@@ -123,20 +134,20 @@ class ContentPipeline:
         """
         filtered = [item for item in items if item.relevance_score >= MIN_RELEVANCE_SCORE]
 
-        # Log filtered items
-        for item in items:
-            if item.relevance_score < MIN_RELEVANCE_SCORE:
-                logger.debug(
-                    "low_relevance_filtered",
-                    title=item.title,
-                    score=item.relevance_score,
-                    threshold=MIN_RELEVANCE_SCORE,
-                )
+        if len(filtered) < len(items):
+            logger.debug(
+                "low_relevance_filtered",
+                dropped=len(items) - len(filtered),
+                threshold=MIN_RELEVANCE_SCORE,
+            )
 
         return filtered
 
     def filter_by_time(
-        self, items: list[ContentItem], hours: int = RESEARCH_TIME_WINDOW_HOURS
+        self,
+        items: list[ContentItem],
+        hours: int = RESEARCH_TIME_WINDOW_HOURS,
+        now: datetime | None = None,
     ) -> list[ContentItem]:
         """
         Filter items by publication time window.
@@ -144,25 +155,21 @@ class ContentPipeline:
         Args:
             items: Content items to filter
             hours: Time window in hours (default from constants)
+            now: Reference time (defaults to datetime.now())
 
         Returns:
             Items published within the time window
         """
-        cutoff = datetime.now() - timedelta(hours=hours)
+        cutoff = (now or datetime.now()) - timedelta(hours=hours)
 
         filtered = [item for item in items if item.published_date and item.published_date >= cutoff]
 
-        # Log filtered items
-        for item in items:
-            if not item.published_date or item.published_date < cutoff:
-                logger.debug(
-                    "old_content_filtered",
-                    title=item.title,
-                    published_date=item.published_date.isoformat()
-                    if item.published_date
-                    else "unknown",
-                    cutoff=cutoff.isoformat(),
-                )
+        if len(filtered) < len(items):
+            logger.debug(
+                "old_content_filtered",
+                dropped=len(items) - len(filtered),
+                cutoff=cutoff.isoformat(),
+            )
 
         return filtered
 
@@ -176,28 +183,69 @@ class ContentPipeline:
         Returns:
             NewsletterItem list (1:1 field mapping)
         """
+        convert = self._convert_item
+        return [converted for item in items if (converted := convert(item)) is not None]
+
+    def filter_and_convert(
+        self,
+        items: list[ContentItem],
+        hours: int = RESEARCH_TIME_WINDOW_HOURS,
+        now: datetime | None = None,
+    ) -> list[NewsletterItem]:
+        """
+        Filter by relevance and time window, then convert, in a single pass.
+
+        Same result as filter_by_relevance → filter_by_time → convert_to_newsletter_items
+        without building the intermediate lists; rejections are logged as one count
+        per filter rather than one line per item.
+        The orchestrator pushes the time window into research, so the time check here is
+        a residual safety net for callers that pass unfiltered items.
+
+        Args:
+            items: Content items to filter
+            hours: Time window in hours (default from constants)
+            now: Reference time (defaults to datetime.now())
+
+        Returns:
+            NewsletterItem list for items that pass both filters
+        """
+        cutoff = (now or datetime.now()) - timedelta(hours=hours)
         newsletter_items = []
+        low_relevance = too_old = 0
 
         for item in items:
-            try:
-                newsletter_item = NewsletterItem(
-                    title=item.title,
-                    url=item.url,
-                    summary=item.summary,
-                    category=item.category,
-                    source=item.source,
-                    relevance_score=item.relevance_score,
-                    published_date=item.published_date,
-                    metadata=item.metadata,
-                )
-                newsletter_items.append(newsletter_item)
+            if item.relevance_score < MIN_RELEVANCE_SCORE:
+                low_relevance += 1
+                continue
 
-            except Exception as e:
-                logger.warning("item_conversion_failed", error=str(e), title=item.title)
+            if not item.published_date or item.published_date < cutoff:
+                too_old += 1
                 continue
 
+            newsletter_item = self._convert_item(item)
+            if newsletter_item is not None:
+                newsletter_items.append(newsletter_item)
+
+        logger.debug("items_filtered", low_relevance=low_relevance, too_old=too_old)
         return newsletter_items
 
+    def _convert_item(self, item: ContentItem) -> NewsletterItem | None:
+        """Convert one ContentItem, returning None (and logging) if it fails validation."""
+        try:
+            return NewsletterItem(
+                title=item.title,
+                url=item.url,
+                summary=item.summary,
+                category=item.category,
+                source=item.source,
+                relevance_score=item.relevance_score,
+                published_date=item.published_date,
+                metadata=item.metadata,
+            )
+        except Exception as e:
+            logger.warning("item_conversion_failed", error=str(e), title=item.title)
+            return None
+
     async def generate_summary(self, items: list[NewsletterItem], date: str) -> str:
         """
         Generate newsletter summary using Claude API.
@@ -242,51 +290,36 @@ class ContentPipeline:
         Returns:
             Generated summary text
         """
-        # Build items list for prompt
-        items_text = []
-        for i, item in enumerate(items, 1):
-            items_text.append(
-                f"{i}. **{item.title}** ({item.category})\n"
-                f"   Source: {item.source}\n"
-                f"   Summary: {item.summary}\n"
-            )
-
-        items_list = "\n".join(items_text)
-
-        # Construct prompt
-        prompt = f"""You are an AI news curator. Generate a brief, engaging summary for today's AI newsletter.
-
-Newsletter Date: {date}
-Item Count: {len(items)}
-
-Items:
-{items_list}
-
-Generate 2-3 sentences highlighting the most significant developments. Be concise and focus on what matters to AI practitioners and researchers. Do not use emojis."""
+        # Construct prompt in one join (instructions live in the static system prompt)
+        prompt = f"Newsletter Date: {date}\nItem Count: {len(items)}\n\nItems:\n" + "\n".join(
+            f"{i}. **{item.title}** ({item.category})\n"
+            f"   Source: {item.source}\n"
+            f"   Summary: {item.summary}\n"
+            for i, item in enumerate(items, 1)
+        )
 
-        logger.info("calling_claude_api", model=settings.anthropic_model)
+        logger.info("calling_claude_api", model=self.summary_model)
 
         # Call Claude API
         assert self.client is not None
         message = await self.client.messages.create(
-            model=settings.anthropic_model,
+            model=self.summary_model,
             max_tokens=300,
+            system=_SUMMARY_SYSTEM_PROMPT,
             messages=[{"role": "user", "content": prompt}],
         )
 
-        # Extract summary
-        summary = message.content[0].text.strip()
+        # Extract summary; an empty reply falls back like any other API failure
+        summary = (message.content[0].text or "").strip() if message.content else ""
+        if not summary:
+            raise ValueError("Claude returned an empty summary")
 
         # Track API usage
         input_tokens = message.usage.input_tokens
         output_tokens = message.usage.output_tokens
 
         # Calculate cost
-        model_name = settings.anthropic_model
-        costs = MODEL_COSTS.get(model_name, {"input": 0, "output": 0})
-        estimated_cost = (input_tokens / 1000) * costs["input"] + (output_tokens / 1000) * costs[
-            "output"
-        ]
+        estimated_cost = (input_tokens * self._cost_in + output_tokens * self._cost_out) / 1000
 
         await self.state_manager.track_api_usage(
             api_name="anthropic",
@@ -314,8 +347,9 @@ Generate 2-3 sentences highlighting the most significant developments. Be concis
         if len(items) == 1:
             return f"Today's highlight: {items[0].title} from {items[0].source}."
 
-        categories = list({item.category for item in items})
-        sources = list({item.source for item in items})
+        # dict.fromkeys dedupes in first-seen order, so the summary text is stable
+        categories = dict.fromkeys(item.category for item in items)
+        sources = dict.fromkeys(item.source for item in items)
 
         return (
             f"Today's AI highlights include {len(items)} items "
@@ -7,14 +7,15 @@ Manages:
   - TaskWorker      : processes task queue from Telegram etc. (Phase B)
   - TelegramAgent   : handles incoming Telegram DMs (Phase B)
 
-A crash inside any single agent is caught and logged; the others continue.
+A crash inside any single agent is caught and logged, and that agent is
+restarted with exponential backoff; the others continue.
 Responds to SIGTERM / SIGINT for graceful shutdown.
 """
 
 import asyncio
+import importlib
 import signal
-from collections.abc import Coroutine
-from typing import Any
+from collections.abc import Awaitable, Callable
 
 from src.config.settings import settings
 from src.core.state_manager import StateManager
@@ -22,6 +23,34 @@ from src.utils.logger import get_logger
 
 logger = get_logger("master_agent")
 
+# Restart backoff for crashed agents (seconds)
+_INITIAL_RESTART_DELAY = 1.0
+_MAX_RESTART_DELAY = 60.0
+
+AgentFactory = Callable[[], Awaitable[None]]
+
+# Heavy agent modules (telegram, anthropic, github stacks) imported off the event loop
+_AGENT_MODULES = (
+    "src.agents.newsletter_agent",
+    "src.agents.task_worker",
+    "src.agents.telegram_agent",
+)
+_GITHUB_MODULES = ("src.github.client", "src.github.monitor")
+
+
+def _preload_agent_modules() -> None:
+    """Import agent modules so _build_agent_factories finds them in sys.modules."""
+    modules: tuple[str, ...] = _AGENT_MODULES
+    if settings.github_token and settings.enable_github_agent:
+        modules += _GITHUB_MODULES
+
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            # Reported by _build_agent_factories when it imports the module itself
+            pass
+
 
 class MasterAgent:
     """
@@ -37,43 +66,103 @@ class MasterAgent:
         from src.memory.memory_store import MemoryStore
 
         self.memory_store = MemoryStore()
+        # Set on SIGTERM / SIGINT; agents finish their current cycle and return
+        self._stop = asyncio.Event()
+        # Agents that do not poll the event (e.g. TelegramAgent) register a stop hook
+        self._stop_callbacks: list[Callable[[], None]] = []
+        self._agent_tasks: list[asyncio.Task[None]] = []
 
     async def run_forever(self) -> None:
         """Initialise DB, register signal handlers, then run all agents."""
-        await self.state_manager.init_db()
+        # Overlap agent imports (in a worker thread) with schema creation
+        await asyncio.gather(
+            self.state_manager.init_db(), asyncio.to_thread(_preload_agent_modules)
+        )
         logger.info("master_agent_starting")
 
         loop = asyncio.get_running_loop()
         for sig in (signal.SIGTERM, signal.SIGINT):
             loop.add_signal_handler(sig, self._handle_shutdown_signal)
 
-        coroutines = self._build_agent_coroutines()
-        logger.info("master_agent_started", agents=len(coroutines))
-
-        # return_exceptions=True: one agent crash doesn't cancel the rest
-        results = await asyncio.gather(*coroutines, return_exceptions=True)
+        factories = self._build_agent_factories()
+        logger.info("master_agent_started", agents=len(factories))
 
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error("agent_coroutine_failed", index=i, error=str(result))
+        # Each agent runs under its own supervisor, which absorbs crashes, so one
+        # agent failing never takes down the rest
+        self._agent_tasks = [
+            asyncio.create_task(self._supervise(name, factory), name=name)
+            for name, factory in factories.items()
+        ]
+        await asyncio.gather(*self._agent_tasks)
+        await self.state_manager.close()
 
         logger.info("master_agent_stopped")
 
+    async def _supervise(self, name: str, factory: AgentFactory) -> None:
+        """
+        Run one agent, restarting it with exponential backoff if it crashes.
+
+        Returns when the agent returns normally or shutdown has been requested.
+        Cancellation propagates.
+
+        Args:
+            name: Agent name for logging
+            factory: Zero-argument callable returning the agent's run coroutine
+        """
+        loop = asyncio.get_running_loop()
+        delay = _INITIAL_RESTART_DELAY
+
+        while not self._stop.is_set():
+            started = loop.time()
+            try:
+                await factory()
+                return
+            except Exception as e:
+                # An agent that stayed up past the backoff ceiling starts over at the minimum
+                if loop.time() - started >= _MAX_RESTART_DELAY:
+                    delay = _INITIAL_RESTART_DELAY
+                logger.error(
+                    "agent_crashed",
+                    agent=name,
+                    error=str(e),
+                    error_type=type(e).__name__,
+                    restart_in=delay,
+                )
+                # Back off, but don't hold up a shutdown requested meanwhile
+                try:
+                    await asyncio.wait_for(self._stop.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                delay = min(delay * 2, _MAX_RESTART_DELAY)
+
     def _handle_shutdown_signal(self) -> None:
-        """Cancel all running tasks on SIGTERM / SIGINT."""
+        """
+        Ask every agent to stop on SIGTERM / SIGINT.
+
+        A second signal while agents are still finishing cancels the agent tasks.
+        """
+        if self._stop.is_set():
+            logger.warning("master_agent_forced_shutdown")
+            for task in self._agent_tasks:
+                task.cancel()
+            return
+
         logger.info("master_agent_shutdown_requested")
-        for task in asyncio.all_tasks():
-            task.cancel()
+        self._stop.set()
+        for callback in self._stop_callbacks:
+            callback()
 
-    def _build_agent_coroutines(self) -> list[Coroutine[Any, Any, None]]:
-        """Return the list of agent coroutines to run concurrently."""
-        coroutines: list[Coroutine[Any, Any, None]] = []
+    def _build_agent_factories(self) -> dict[str, AgentFactory]:
+        """Return agent name → factory for each agent to run concurrently."""
+        factories: dict[str, AgentFactory] = {}
 
         # --- Newsletter agent (always on) ---
         from src.agents.newsletter_agent import NewsletterAgent
 
         newsletter_agent = NewsletterAgent(state_manager=self.state_manager)
-        coroutines.append(newsletter_agent.run_forever(interval_seconds=60))
+        factories["newsletter_agent"] = lambda: newsletter_agent.run_forever(
+            interval_seconds=60, stop_event=self._stop
+        )
         logger.info("newsletter_agent_registered")
 
         # --- GitHub monitor (optional) ---
@@ -85,8 +174,8 @@ class MasterAgent:
             github_monitor = GitHubMonitor(
                 state_manager=self.state_manager, github_client=github_client
             )
-            coroutines.append(
-                github_monitor.run_forever(interval_seconds=settings.github_poll_interval)
+            factories["github_monitor"] = lambda: github_monitor.run_forever(
+                interval_seconds=settings.github_poll_interval, stop_event=self._stop
             )
             logger.info("github_monitor_registered", repo=settings.github_repo)
         else:
@@ -102,7 +191,9 @@ class MasterAgent:
             task_worker = TaskWorker(
                 state_manager=self.state_manager, memory_store=self.memory_store
             )
-            coroutines.append(task_worker.run_forever(interval_seconds=5))
+            factories["task_worker"] = lambda: task_worker.run_forever(
+                interval_seconds=5, stop_event=self._stop
+            )
             logger.info("task_worker_registered")
         except ImportError:
             logger.info("task_worker_not_available", note="will be added in Phase B")
@@ -115,7 +206,8 @@ class MasterAgent:
                 telegram_agent = TelegramAgent(
                     state_manager=self.state_manager, memory_store=self.memory_store
                 )
-                coroutines.append(telegram_agent.run_forever())
+                factories["telegram_agent"] = telegram_agent.run_forever
+                self._stop_callbacks.append(telegram_agent.stop)
                 logger.info("telegram_agent_registered")
             else:
                 logger.warning(
@@ -125,4 +217,4 @@ class MasterAgent:
         except ImportError:
             logger.info("telegram_agent_not_available", note="will be added in Phase B")
 
-        return coroutines
+        return factories
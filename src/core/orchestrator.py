@@ -4,23 +4,86 @@ Manages research → filter → enhance → publish → record phases.
 """
 
 import asyncio
-from dataclasses import dataclass
-from datetime import datetime
-
+import hashlib
+from collections.abc import Awaitable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import chain
+from operator import attrgetter
+from typing import TYPE_CHECKING, TypeVar
+
+from src.config.constants import RESEARCH_TIME_WINDOW_HOURS
 from src.config.settings import settings
 from src.core.content_pipeline import ContentPipeline
 from src.core.state_manager import StateManager
 from src.models.enhanced_newsletter import CategoryMessage, EnhancementMetrics
 from src.models.newsletter import Newsletter
 from src.publishing.base import BasePublisher, PublishResult
-from src.publishing.content_enhancer import ContentEnhancer
 from src.research.base import BaseResearcher, ContentItem
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from src.publishing.content_enhancer import ContentEnhancer
+
 logger = get_logger("orchestrator")
 
+T = TypeVar("T")
+
+
+async def _gather(aws: Sequence[Awaitable[T]]) -> list[T]:
+    """
+    asyncio.gather(*aws), minus gather's task and future setup when there are
+    zero or one awaitables. Callers pass adapters that never raise.
+    """
+    if not aws:
+        return []
+    if len(aws) == 1:
+        return [await aws[0]]
+    return list(await asyncio.gather(*aws))
+
+
+async def _safe_research(researcher: BaseResearcher, since: datetime) -> list[ContentItem] | None:
+    """Run one researcher, returning None (and logging) if it fails."""
+    try:
+        items = await researcher.research(since=since)
+    except Exception as e:
+        logger.error(
+            "researcher_failed",
+            source=researcher.source_name,
+            error=str(e),
+            error_type=type(e).__name__,
+        )
+        return None
+
+    logger.info("researcher_success", source=researcher.source_name, items=len(items))
+    return items
+
+
+async def _safe_publish(platform: str, publishing: Awaitable[PublishResult]) -> PublishResult:
+    """Await one publish call, turning a crash into a failed PublishResult."""
+    try:
+        return await publishing
+    except Exception as e:
+        logger.error("publisher_crashed", platform=platform, error=str(e))
+        return PublishResult(platform=platform, success=False, error=str(e))
+
+
+# Positional fields for StateManager.store_content_bulk rows (newsletter_date is appended)
+_item_fields = attrgetter("url", "title", "source", "category", "metadata")
+
+
+def _fmt_hour(dt: datetime) -> str:
+    """Format as the newsletter date key YYYY-MM-DD-HH (strftime without the locale machinery)."""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}-{dt.hour:02d}"
 
-@dataclass
+
+def _enhancement_cache_key(newsletter: Newsletter) -> str:
+    """SHA-256 over the newsletter hour and its sorted item URLs."""
+    material = "\n".join([newsletter.date, *sorted(item.url for item in newsletter.items)])
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+@dataclass(slots=True)
 class CycleResult:
     """Result of a complete newsletter cycle."""
 
@@ -33,11 +96,13 @@ class CycleResult:
     error: str | None = None
     enhancement_enabled: bool = False
     enhancement_metrics: EnhancementMetrics | None = None
+    # Successful platforms; derived from publish_results when not passed in
+    platforms_published: list[str] = field(default_factory=list)
 
-    @property
-    def platforms_published(self) -> list[str]:
-        """Get list of successfully published platforms."""
-        return [result.platform for result in self.publish_results if result.success]
+    def __post_init__(self):
+        """Compute platforms_published once instead of on every access."""
+        if not self.platforms_published:
+            self.platforms_published = [r.platform for r in self.publish_results if r.success]
 
 
 class Orchestrator:
@@ -71,8 +136,18 @@ class Orchestrator:
         self.state_manager = state_manager
         self.researchers = researchers
         self.publishers = publishers
+        # Publisher capabilities and names are fixed for the orchestrator's lifetime
+        self._publish_enhanced = tuple(getattr(p, "publish_enhanced", None) for p in publishers)
+        self._platform_names = tuple(p.platform_name for p in publishers)
         self.pipeline = pipeline
-        self.enhancer = ContentEnhancer() if settings.enable_content_enhancement else None
+        self.enhancer: ContentEnhancer | None = None
+        if settings.enable_content_enhancement:
+            # Imported here so runs with enhancement disabled never load the enhancer stack
+            from src.publishing import content_enhancer
+
+            self.enhancer = content_enhancer.ContentEnhancer()
+        # Background usage-tracking writes; drained before run_cycle reads cost totals
+        self._pending_usage: set[asyncio.Task] = set()
 
     async def run_cycle(self, mode: str = "test") -> CycleResult:
         """
@@ -84,14 +159,18 @@ class Orchestrator:
         Returns:
             CycleResult with success status and details
         """
-        logger.info("cycle_start", mode=mode, researchers=len(self.researchers))
+        log = logger.bind(mode=mode)
+        log.info("cycle_start", researchers=len(self.researchers))
+
+        # One reference time for the research window and the newsletter date
+        now = datetime.now()
 
         try:
             # Phase 1: Research
-            items = await self.research_phase()
+            items = await self.research_phase(now=now)
 
             if len(items) == 0:
-                logger.warning("no_items_found", skipping_cycle=True)
+                log.warning("no_items_found", skipping_cycle=True)
                 return CycleResult(
                     success=True,
                     newsletter=None,
@@ -102,8 +181,20 @@ class Orchestrator:
                     error="No items found",
                 )
 
+            if len(items) < settings.min_items_for_cycle:
+                log.info("below_min_items", count=len(items))
+                return CycleResult(
+                    success=True,
+                    newsletter=None,
+                    item_count=len(items),
+                    filtered_count=0,
+                    publish_results=[],
+                    total_cost=0.0,
+                    error="Below minimum item threshold",
+                )
+
             # Phase 2: Filter and assemble
-            newsletter = await self.filter_phase(items)
+            newsletter = await self.filter_phase(items, now=now)
 
             # Phase 3: Enhancement (optional)
             enhancement_metrics = None
@@ -115,25 +206,32 @@ class Orchestrator:
 
             # Phase 4: Publish (skip in test mode)
             publish_results = []
+            platforms_published: list[str] = []
             if mode == "production":
                 publish_results = await self.publish_phase(content_to_publish)
+                platforms_published = [r.platform for r in publish_results if r.success]
 
                 # Phase 5: Record (only if at least one platform succeeded)
-                if any(result.success for result in publish_results):
-                    await self.record_phase(newsletter, publish_results, enhancement_metrics)
+                if platforms_published:
+                    await self.record_phase(
+                        newsletter,
+                        publish_results,
+                        enhancement_metrics,
+                        platforms_published=platforms_published,
+                    )
                 else:
-                    logger.error("all_platforms_failed", skipping_record=True)
+                    log.error("all_platforms_failed", skipping_record=True)
 
-            # Calculate total cost
+            # Calculate total cost (once this cycle's usage writes have landed)
+            await self._drain_usage()
             metrics = await self.state_manager.get_metrics()
             total_cost = metrics.get("total_cost", 0.0)
 
-            logger.info(
+            log.info(
                 "cycle_complete",
-                mode=mode,
                 items=len(items),
                 filtered=newsletter.item_count,
-                published_platforms=len([r for r in publish_results if r.success]),
+                published_platforms=len(platforms_published),
                 cost=f"${total_cost:.4f}",
             )
 
@@ -146,10 +244,11 @@ class Orchestrator:
                 total_cost=total_cost,
                 enhancement_enabled=bool(enhancement_metrics),
                 enhancement_metrics=enhancement_metrics,
+                platforms_published=platforms_published,
             )
 
         except Exception as e:
-            logger.error("cycle_failed", error=str(e), error_type=type(e).__name__)
+            log.error("cycle_failed", error=str(e), error_type=type(e).__name__)
 
             return CycleResult(
                 success=False,
@@ -161,10 +260,30 @@ class Orchestrator:
                 error=str(e),
             )
 
-    async def research_phase(self) -> list[ContentItem]:
+    async def aclose(self) -> None:
+        """
+        Wait for background usage-tracking writes to finish.
+
+        Call before the event loop shuts down (e.g. at the end of a one-shot run),
+        otherwise writes left pending by a failed cycle are cancelled with the loop.
+        """
+        await self._drain_usage()
+
+    async def _drain_usage(self) -> None:
+        """Wait for background usage tracking; failures are logged, never raised."""
+        if not self._pending_usage:
+            return
+        for result in await asyncio.gather(*self._pending_usage, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.warning("usage_tracking_failed", error=str(result))
+
+    async def research_phase(self, now: datetime | None = None) -> list[ContentItem]:
         """
         Execute research phase with all researchers in parallel.
 
+        Args:
+            now: Reference time for the research window (defaults to datetime.now())
+
         Returns:
             Combined list of ContentItem objects from all sources
 
@@ -173,46 +292,48 @@ class Orchestrator:
         """
         logger.info("research_phase_start", researcher_count=len(self.researchers))
 
-        # Run all researchers in parallel with asyncio.gather
-        tasks = [researcher.research() for researcher in self.researchers]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Identical researchers hit the same endpoint and return the same items,
+        # so only the first of each is called
+        unique: dict[tuple, BaseResearcher] = {}
+        for researcher in self.researchers:
+            unique.setdefault(researcher.cache_key(), researcher)
+        researchers = list(unique.values())
 
-        # Collect successful results
-        all_items: list[ContentItem] = []
-        failed_count = 0
+        if len(researchers) < len(self.researchers):
+            logger.info(
+                "duplicate_researchers_skipped",
+                skipped=len(self.researchers) - len(researchers),
+            )
 
-        for i, result in enumerate(results):
-            researcher = self.researchers[i]
+        # Push the pipeline's time window down so stale items are dropped while parsing
+        since = (now or datetime.now()) - timedelta(hours=RESEARCH_TIME_WINDOW_HOURS)
 
-            if isinstance(result, Exception):
-                # Research failed, log and continue
-                logger.error(
-                    "researcher_failed",
-                    source=researcher.source_name,
-                    error=str(result),
-                    error_type=type(result).__name__,
-                )
-                failed_count += 1
-            elif isinstance(result, list):
-                # Research succeeded
-                all_items.extend(result)
-                logger.info("researcher_success", source=researcher.source_name, items=len(result))
+        # Run all researchers in parallel (a lone researcher is awaited directly);
+        # failures come back as None and are already logged
+        results = await _gather([_safe_research(researcher, since) for researcher in researchers])
+
+        successes = [result for result in results if result is not None]
+        all_items = list(chain.from_iterable(successes))
+        failed_count = len(results) - len(successes)
 
         logger.info(
             "research_phase_complete",
             total_items=len(all_items),
-            successful_sources=len(self.researchers) - failed_count,
+            successful_sources=len(successes),
             failed_sources=failed_count,
         )
 
         return all_items
 
-    async def filter_phase(self, items: list[ContentItem]) -> Newsletter:
+    async def filter_phase(
+        self, items: list[ContentItem], now: datetime | None = None
+    ) -> Newsletter:
         """
         Execute filter phase through ContentPipeline.
 
         Args:
             items: Raw content items from research
+            now: Cycle reference time for the newsletter date (defaults to datetime.now())
 
         Returns:
             Assembled Newsletter object
@@ -220,11 +341,11 @@ class Orchestrator:
         logger.info("filter_phase_start", input_count=len(items))
 
         # Generate newsletter date (YYYY-MM-DD-HH)
-        now = datetime.now()
-        newsletter_date = now.strftime("%Y-%m-%d-%H")
+        now = now or datetime.now()
+        newsletter_date = _fmt_hour(now)
 
         # Process through pipeline
-        newsletter = await self.pipeline.process(items, newsletter_date)
+        newsletter = await self.pipeline.process(items, newsletter_date, now=now)
 
         logger.info(
             "filter_phase_complete", output_count=newsletter.item_count, date=newsletter_date
@@ -246,30 +367,138 @@ class Orchestrator:
         """
         logger.info("enhance_phase_start", item_count=newsletter.item_count)
 
-        assert self.enhancer is not None
+        # Reuse the enhancement of an identical item set (e.g. a rerun within the hour)
+        use_cache = settings.enhancement_cache_ttl > 0 and not settings.force_refresh
+        cache_key = _enhancement_cache_key(newsletter)
+        if use_cache:
+            cached = await self._load_cached_enhancement(cache_key)
+            if cached is not None:
+                return cached
+
+        # Items enhanced in an earlier cycle keep their headline and takeaway
+        cached_items = await self._load_cached_items(newsletter) if use_cache else {}
+
+        if self.enhancer is None:
+            raise RuntimeError("Content enhancement is disabled")
         category_messages, metrics = await self.enhancer.enhance_newsletter(
             items=newsletter.items,
             date=newsletter.date,
             max_items_per_category=settings.max_items_per_category,
+            cached=cached_items,
         )
 
         logger.info(
             "enhance_phase_complete",
             categories=len(category_messages),
             ai_enhanced=metrics.ai_enhanced,
+            cache_hits=metrics.cache_hits,
             cost=f"${metrics.total_cost:.4f}",
         )
 
-        # Track cost in StateManager
-        await self.state_manager.track_api_usage(
-            api_name="content_enhancement",
-            request_count=metrics.total_items,
-            token_count=0,
-            estimated_cost=metrics.total_cost,
+        # Track cost in StateManager without holding up publishing
+        task = asyncio.create_task(
+            self.state_manager.track_api_usage(
+                api_name="content_enhancement",
+                request_count=metrics.total_items,
+                token_count=0,
+                estimated_cost=metrics.total_cost,
+            )
         )
+        self._pending_usage.add(task)
+        task.add_done_callback(self._pending_usage.discard)
+
+        if use_cache:
+            await self._store_cached_enhancement(cache_key, category_messages, metrics)
+            await self._store_cached_items(category_messages, cached_items)
+
+        return category_messages, metrics
+
+    async def _load_cached_items(self, newsletter: Newsletter) -> dict[str, tuple[str, str]]:
+        """
+        Look up per-item enhancements, keyed by item URL for the enhancer.
+
+        Returns an empty mapping (everything goes to the LLM) on lookup error.
+        """
+        ids = {
+            StateManager.generate_content_id(item.url, item.title): item.url
+            for item in newsletter.items
+        }
+        try:
+            found = await self.state_manager.get_enhanced_items(list(ids))
+        except Exception as e:
+            logger.warning("enhanced_items_lookup_failed", error=str(e))
+            return {}
+        return {ids[content_id]: pair for content_id, pair in found.items()}
+
+    async def _store_cached_items(
+        self, category_messages: list[CategoryMessage], cached_items: dict[str, tuple[str, str]]
+    ) -> None:
+        """Store newly AI-enhanced items; template fallbacks are retried next cycle."""
+        rows = [
+            (
+                StateManager.generate_content_id(item.url, item.original_item.title),
+                item.viral_headline,
+                item.takeaway,
+            )
+            for message in category_messages
+            for item in message.items
+            if item.enhancement_method == "ai" and item.url not in cached_items
+        ]
+        try:
+            await self.state_manager.store_enhanced_items(rows)
+        except Exception as e:
+            logger.warning("enhanced_items_store_failed", error=str(e))
+
+    async def _load_cached_enhancement(
+        self, cache_key: str
+    ) -> tuple[list[CategoryMessage], EnhancementMetrics] | None:
+        """
+        Look up a cached enhancement, returning None on a miss or lookup error.
 
+        The returned metrics carry no cost or time, since nothing was spent.
+        """
+        try:
+            payload = await self.state_manager.get_cached_enhancement(
+                cache_key, max_age_seconds=settings.enhancement_cache_ttl
+            )
+            if payload is None:
+                return None
+            category_messages = [CategoryMessage.from_dict(m) for m in payload["messages"]]
+            stored = payload["metrics"]
+            metrics = EnhancementMetrics(
+                total_items=stored["total_items"],
+                ai_enhanced=stored["ai_enhanced"],
+                template_fallback=stored["template_fallback"],
+            )
+        except Exception as e:
+            logger.warning("enhancement_cache_lookup_failed", error=str(e))
+            return None
+
+        logger.info(
+            "enhancement_cache_hit",
+            categories=len(category_messages),
+            saved_cost=f"${stored['total_cost']:.4f}",
+        )
         return category_messages, metrics
 
+    async def _store_cached_enhancement(
+        self,
+        cache_key: str,
+        category_messages: list[CategoryMessage],
+        metrics: EnhancementMetrics,
+    ) -> None:
+        """Store enhancement output for reuse; failures are logged, never raised."""
+        try:
+            await self.state_manager.store_cached_enhancement(
+                cache_key,
+                {
+                    "messages": [message.to_dict() for message in category_messages],
+                    "metrics": metrics.to_dict(),
+                },
+            )
+        except Exception as e:
+            logger.warning("enhancement_cache_store_failed", error=str(e))
+
     async def publish_phase(
         self, content: Newsletter | list[CategoryMessage]
     ) -> list[PublishResult]:
@@ -283,13 +512,13 @@ class Orchestrator:
             List of PublishResult (partial failures OK)
 
         Note:
-            Uses asyncio.gather with return_exceptions=True to allow partial success.
+            Each publisher is wrapped so a crash becomes a failed PublishResult,
+            allowing partial success.
         """
-        # Detect content type
-        is_enhanced = (
-            isinstance(content, list)
-            and len(content) > 0
-            and isinstance(content[0], CategoryMessage)
+        # Detect content type and build the standard-format fallback once
+        is_enhanced = isinstance(content, list) and bool(content)
+        fallback = (
+            content if isinstance(content, Newsletter) else self._category_to_newsletter(content)
         )
 
         logger.info(
@@ -300,51 +529,28 @@ class Orchestrator:
             logger.warning("no_publishers_configured", skipping_publish=True)
             return []
 
-        # Publish to all platforms in parallel
+        # Publish to all platforms in parallel; crashes become failed PublishResults
         tasks = []
-        for publisher in self.publishers:
-            if is_enhanced and hasattr(publisher, "publish_enhanced"):
+        for publisher, platform, publish_enhanced in zip(
+            self.publishers, self._platform_names, self._publish_enhanced, strict=True
+        ):
+            if is_enhanced and publish_enhanced is not None:
                 # Use enhanced publishing if available
-                tasks.append(publisher.publish_enhanced(content))
+                tasks.append(_safe_publish(platform, publish_enhanced(content)))
             else:
                 # Fallback to standard publishing
-                newsletter = (
-                    content
-                    if isinstance(content, Newsletter)
-                    else self._category_to_newsletter(content)
-                )
-                tasks.append(publisher.publish_newsletter(newsletter))
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+                tasks.append(_safe_publish(platform, publisher.publish_newsletter(fallback)))
 
-        # Convert exceptions to PublishResult
-        publish_results = []
-        for i, result in enumerate(results):
-            publisher = self.publishers[i]
-
-            if isinstance(result, Exception):
-                # Publishing crashed
-                publish_results.append(
-                    PublishResult(
-                        platform=publisher.platform_name, success=False, error=str(result)
-                    )
-                )
-                logger.error(
-                    "publisher_crashed", platform=publisher.platform_name, error=str(result)
-                )
-            elif isinstance(result, PublishResult):
-                # Got PublishResult
-                publish_results.append(result)
+        publish_results = await _gather(tasks)
 
         # Log summary
-        successful = sum(1 for r in publish_results if r.success)
-        failed = len(publish_results) - successful
+        platforms = [r.platform for r in publish_results if r.success]
 
         logger.info(
             "publish_phase_complete",
-            successful=successful,
-            failed=failed,
-            platforms=[r.platform for r in publish_results if r.success],
+            successful=len(platforms),
+            failed=len(publish_results) - len(platforms),
+            platforms=platforms,
         )
 
         return publish_results
@@ -359,15 +565,15 @@ class Orchestrator:
         Returns:
             Newsletter object
         """
-        all_items = []
-        for msg in category_messages:
-            all_items.extend([item.original_item for item in msg.items])
+        all_items = list(
+            chain.from_iterable(
+                (item.original_item for item in msg.items) for msg in category_messages
+            )
+        )
 
-        date = datetime.now().strftime("%Y-%m-%d-%H")
-        if category_messages and category_messages[0].items:
-            pub_date = category_messages[0].items[0].original_item.published_date
-            if pub_date is not None:
-                date = pub_date.strftime("%Y-%m-%d-%H")
+        # Date from the first item's publication time, else the current hour
+        pub_date = all_items[0].published_date if all_items else None
+        date = _fmt_hour(pub_date or datetime.now())
 
         return Newsletter(
             date=date,
@@ -381,6 +587,7 @@ class Orchestrator:
         newsletter: Newsletter,
         publish_results: list[PublishResult],
         enhancement_metrics: EnhancementMetrics | None = None,
+        platforms_published: list[str] | None = None,
     ):
         """
         Record newsletter and items to database.
@@ -389,6 +596,7 @@ class Orchestrator:
             newsletter: Published newsletter
             publish_results: Publishing results from all platforms
             enhancement_metrics: Optional enhancement metrics
+            platforms_published: Successful platforms, if the caller already has them
 
         Note:
             Logs errors but doesn't crash if database write fails.
@@ -405,41 +613,29 @@ class Orchestrator:
 
         try:
             # Get successful platforms
-            platforms_published = [result.platform for result in publish_results if result.success]
-
-            # Create newsletter record
-            newsletter_id = await self.state_manager.create_newsletter_record(
-                newsletter_date=newsletter.date,
-                item_count=newsletter.item_count,
-                platforms_published=platforms_published,
-                skip_reason=None,
+            if platforms_published is None:
+                platforms_published = [r.platform for r in publish_results if r.success]
+
+            # The newsletter record and the item rows are independent; only the
+            # publishing log needs newsletter_id, so overlap the first two
+            newsletter_id, _ = await asyncio.gather(
+                self.state_manager.create_newsletter_record(
+                    newsletter_date=newsletter.date,
+                    item_count=newsletter.item_count,
+                    platforms_published=platforms_published,
+                    skip_reason=None,
+                ),
+                self._store_items(newsletter),
             )
 
-            # Store each item
-            for item in newsletter.items:
-                try:
-                    await self.state_manager.store_content(
-                        {
-                            "url": item.url,
-                            "title": item.title,
-                            "source": item.source,
-                            "category": item.category,
-                            "newsletter_date": newsletter.date,
-                            "metadata": item.metadata,
-                        }
-                    )
-                except Exception as e:
-                    logger.warning("item_storage_failed", title=item.title, error=str(e))
-
-            # Log publishing attempts
-            for result in publish_results:
-                await self.state_manager.log_publishing_attempt(
-                    newsletter_id=newsletter_id,
-                    platform=result.platform,
-                    status="success" if result.success else "failed",
-                    error_message=result.error,
-                    attempt_count=1,
-                )
+            # Log publishing attempts in one write
+            await self.state_manager.log_publishing_attempts_bulk(
+                newsletter_id,
+                [
+                    (result.platform, "success" if result.success else "failed", result.error, 1)
+                    for result in publish_results
+                ],
+            )
 
             logger.info(
                 "record_phase_complete",
@@ -450,3 +646,35 @@ class Orchestrator:
         except Exception as e:
             logger.error("record_phase_failed", error=str(e), error_type=type(e).__name__)
             # Don't re-raise - recording failure shouldn't crash the cycle
+
+    async def _store_items(self, newsletter: Newsletter) -> None:
+        """
+        Store newsletter items in one transaction, falling back to per-item writes.
+
+        Args:
+            newsletter: Published newsletter
+
+        Note:
+            Never raises; failures are logged per item.
+        """
+        date = newsletter.date
+        rows = [(*_item_fields(item), date) for item in newsletter.items]
+        try:
+            await self.state_manager.store_content_bulk(rows)
+        except Exception as batch_error:
+            # One bad row rolls back the batch; retry per item so the rest are kept
+            logger.warning("bulk_item_storage_failed", error=str(batch_error), items=len(rows))
+            for url, title, source, category, metadata, _ in rows:
+                try:
+                    await self.state_manager.store_content(
+                        {
+                            "url": url,
+                            "title": title,
+                            "source": source,
+                            "category": category,
+                            "newsletter_date": date,
+                            "metadata": metadata,
+                        }
+                    )
+                except Exception as e:
+                    logger.warning("item_storage_failed", title=title, error=str(e))
@@ -3,8 +3,11 @@ State management using SQLite database.
 Handles content tracking, deduplication, metrics, and publishing logs.
 """
 
+import asyncio
 import hashlib
 import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import date
 from pathlib import Path
 from typing import Any
@@ -14,8 +17,202 @@ import aiosqlite
 from src.config.settings import settings
 from src.utils.logger import get_logger
 
+try:
+    import orjson  # faster encoding of item metadata
+except ImportError:
+    orjson = None
+
 logger = get_logger("state_manager")
 
+# SQLite builds before 3.32 cap bound parameters at 999 per statement
+_MAX_SQL_PARAMS = 500
+
+# Applied once per connection. WAL + synchronous=NORMAL turns each commit into a
+# log append instead of an fsync; journal_mode=WAL also persists in the file, so
+# TaskQueue's connection to the same file reads concurrently with our writes.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",  # KiB, i.e. ~64 MB
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+    # Checkpoints truncate the -wal file back to this size instead of leaving it at its peak
+    "PRAGMA journal_size_limit=67108864",
+)
+
+
+# Tables keyed by their text column(s). WITHOUT ROWID stores each as a
+# single btree instead of a rowid table plus a unique index on the key.
+_CONTENT_FINGERPRINTS_SQL = """
+    CREATE TABLE IF NOT EXISTS content_fingerprints (
+        content_hash TEXT PRIMARY KEY,
+        first_seen   TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        source       TEXT
+    ) WITHOUT ROWID
+"""
+
+_AGENT_FACTS_SQL = """
+    CREATE TABLE IF NOT EXISTS agent_facts (
+        key        TEXT PRIMARY KEY,
+        value      TEXT NOT NULL,
+        source     TEXT NOT NULL DEFAULT 'user',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) WITHOUT ROWID
+"""
+
+_API_METRICS_SQL = """
+    CREATE TABLE IF NOT EXISTS api_metrics (
+        date           TEXT NOT NULL,
+        api_name       TEXT NOT NULL,
+        request_count  INTEGER DEFAULT 0,
+        token_count    INTEGER DEFAULT 0,
+        estimated_cost REAL DEFAULT 0.0,
+        PRIMARY KEY (date, api_name)
+    ) WITHOUT ROWID
+"""
+
+
+# Bump whenever _SCHEMA_SQL changes; init_db skips the script for databases whose
+# PRAGMA user_version already matches.
+_SCHEMA_VERSION = 5
+
+# Whole schema, idempotent, applied in one executescript round trip
+_SCHEMA_SQL = f"""
+BEGIN;
+
+-- Published items table
+CREATE TABLE IF NOT EXISTS published_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_id TEXT UNIQUE NOT NULL,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT,
+    published_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    newsletter_date TEXT,
+    category TEXT,
+    metadata JSON
+);
+-- UNIQUE(content_id) already indexes content_id; a second copy only slows inserts
+DROP INDEX IF EXISTS idx_content_id;
+CREATE INDEX IF NOT EXISTS idx_published_at ON published_items(published_at);
+
+-- Newsletters table
+CREATE TABLE IF NOT EXISTS newsletters (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT UNIQUE NOT NULL,
+    item_count INTEGER,
+    platforms_published JSON,
+    skip_reason TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+-- MAX(created_at) in minutes_since_last_newsletter reads one index entry
+CREATE INDEX IF NOT EXISTS idx_newsletters_created_at ON newsletters(created_at);
+
+-- Publishing logs table
+CREATE TABLE IF NOT EXISTS publishing_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    newsletter_id INTEGER,
+    platform TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error_message TEXT,
+    attempt_count INTEGER DEFAULT 1,
+    published_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (newsletter_id) REFERENCES newsletters(id)
+);
+
+-- API metrics table (one row per day and API; track_api_usage upserts on the key)
+{_API_METRICS_SQL};
+
+-- Content fingerprints table (pure lookup by hash, so one btree suffices)
+{_CONTENT_FINGERPRINTS_SQL};
+
+-- GitHub agent events table
+CREATE TABLE IF NOT EXISTS github_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pr_number INTEGER NOT NULL,
+    head_sha TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    action_taken TEXT,
+    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(pr_number, head_sha, event_type)
+);
+-- Covers count_fix_attempts and get_fix_history, so neither reads table rows;
+-- it supersedes the pr_number-only index. is_github_event_processed is already
+-- covered by the UNIQUE(pr_number, head_sha, event_type) index.
+CREATE INDEX IF NOT EXISTS idx_github_events_pr_action
+ON github_events(pr_number, action_taken, processed_at, head_sha);
+DROP INDEX IF EXISTS idx_github_events_pr;
+
+-- PA task queue table
+CREATE TABLE IF NOT EXISTS task_queue (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_type   TEXT NOT NULL,
+    payload     TEXT NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'pending',
+    priority    INTEGER NOT NULL DEFAULT 5,
+    chat_id     INTEGER,
+    result      TEXT,
+    error       TEXT,
+    created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    clarify_deadline TEXT
+);
+-- Partial indexes: polling only looks at live tasks, so finished
+-- ('done'/'failed') rows never enter (or bloat) these indexes
+CREATE INDEX IF NOT EXISTS idx_task_queue_pending
+ON task_queue(priority, created_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_task_queue_waiting
+ON task_queue(chat_id, created_at) WHERE status = 'waiting_clarification';
+DROP INDEX IF EXISTS idx_task_queue_status;
+
+-- PA agent facts table (persistent key/value memory)
+{_AGENT_FACTS_SQL};
+
+-- Last handled Telegram update (single row). Kept out of agent_facts so that
+-- /recall never lists it and /remember cannot overwrite it
+CREATE TABLE IF NOT EXISTS telegram_state (
+    id             INTEGER PRIMARY KEY CHECK (id = 1),
+    last_update_id INTEGER NOT NULL,
+    updated_at     TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Enhancement output keyed by newsletter item set (see Orchestrator.enhance_phase)
+CREATE TABLE IF NOT EXISTS enhancement_cache (
+    cache_key  TEXT PRIMARY KEY,
+    payload    TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Per-item AI headline/takeaway, keyed by content id
+CREATE TABLE IF NOT EXISTS enhanced_items (
+    content_id     TEXT PRIMARY KEY,
+    viral_headline TEXT NOT NULL,
+    takeaway       TEXT NOT NULL,
+    created_at     TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMIT;
+"""
+
+
+def _encode_metadata(metadata: dict[str, Any] | None) -> str | None:
+    """Serialize item metadata for storage; empty metadata is stored as NULL."""
+    if not metadata:
+        return None
+    if orjson is not None:
+        return orjson.dumps(metadata).decode()
+    return json.dumps(metadata)
+
+
+async def connect_db(db_path: Path) -> aiosqlite.Connection:
+    """Open a long-lived connection to the state database, tuned with _PRAGMAS."""
+    db = await aiosqlite.connect(db_path)
+    for pragma in _PRAGMAS:
+        await db.execute(pragma)
+    return db
+
 
 class StateManager:
     """Manage application state in SQLite database."""
@@ -29,139 +226,160 @@ class StateManager:
         """
         self.db_path = db_path or settings.database_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Fingerprints are never deleted, so a hash seen once stays a duplicate
+        # and later checks for it can skip the database entirely
+        self._known_fingerprints: set[str] = set()
+        # One connection for the manager's lifetime, opened on first use (see _conn)
+        self._db: aiosqlite.Connection | None = None
+        self._connect_lock = asyncio.Lock()
+        # Set by close(); later queries raise instead of quietly reconnecting
+        self._closed = False
+        # Write transactions share that connection, so they must not interleave
+        self._write_lock = asyncio.Lock()
+        # Mirror of agent_facts: loaded on first use, kept in step by set_fact
+        self._facts: dict[str, str] | None = None
+
+    async def _conn(self) -> aiosqlite.Connection:
+        """
+        Return the shared connection, opening it on first use.
+
+        Raises:
+            RuntimeError: If close() has already been called
+        """
+        if self._closed:
+            raise RuntimeError("StateManager is closed")
+        if self._db is None:
+            async with self._connect_lock:
+                if self._db is None:
+                    self._db = await connect_db(self.db_path)
+        return self._db
+
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Run one write transaction on the shared connection.
+
+        Commits when the block exits normally and rolls back if it raises.
+        """
+        db = await self._conn()
+        async with self._write_lock:
+            try:
+                yield db
+            except BaseException:
+                await db.rollback()
+                raise
+            await db.commit()
+
+    async def close(self) -> None:
+        """Close the shared connection; the manager cannot be used afterwards."""
+        self._closed = True
+        if self._db is not None:
+            db, self._db = self._db, None
+            # Refresh planner statistics for the tables this connection's queries used
+            await db.execute("PRAGMA optimize")
+            await db.close()
 
     async def init_db(self):
-        """Initialize database schema."""
+        """Initialize database schema (skipped when it is already at _SCHEMA_VERSION)."""
         logger.info("initializing_database", db_path=str(self.db_path))
 
-        async with aiosqlite.connect(self.db_path) as db:
-            # Published items table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS published_items (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content_id TEXT UNIQUE NOT NULL,
-                    source TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    url TEXT,
-                    published_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    newsletter_date TEXT,
-                    category TEXT,
-                    metadata JSON
-                )
-            """)
-
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_content_id
-                ON published_items(content_id)
-            """)
-
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_published_at
-                ON published_items(published_at)
-            """)
-
-            # Newsletters table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS newsletters (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT UNIQUE NOT NULL,
-                    item_count INTEGER,
-                    platforms_published JSON,
-                    skip_reason TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Publishing logs table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS publishing_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    newsletter_id INTEGER,
-                    platform TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    error_message TEXT,
-                    attempt_count INTEGER DEFAULT 1,
-                    published_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (newsletter_id) REFERENCES newsletters(id)
+        async with self._transaction() as db:
+            async with db.execute("PRAGMA user_version") as cursor:
+                row = await cursor.fetchone()
+            version = row[0] if row else 0
+
+            if version < _SCHEMA_VERSION:
+                await db.executescript(_SCHEMA_SQL)
+                await self._rebuild_without_rowid(
+                    db,
+                    "content_fingerprints",
+                    _CONTENT_FINGERPRINTS_SQL,
+                    "content_hash, first_seen, source",
                 )
-            """)
-
-            # API metrics table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS api_metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT NOT NULL,
-                    api_name TEXT NOT NULL,
-                    request_count INTEGER DEFAULT 0,
-                    token_count INTEGER DEFAULT 0,
-                    estimated_cost REAL DEFAULT 0.0,
-                    UNIQUE(date, api_name)
+                await self._rebuild_without_rowid(
+                    db,
+                    "agent_facts",
+                    _AGENT_FACTS_SQL,
+                    "key, value, source, created_at, updated_at",
                 )
-            """)
-
-            # Content fingerprints table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS content_fingerprints (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content_hash TEXT UNIQUE NOT NULL,
-                    first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    source TEXT
+                await self._rebuild_without_rowid(
+                    db,
+                    "api_metrics",
+                    _API_METRICS_SQL,
+                    "date, api_name, request_count, token_count, estimated_cost",
                 )
-            """)
-
-            # GitHub agent events table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS github_events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    pr_number INTEGER NOT NULL,
-                    head_sha TEXT NOT NULL,
-                    event_type TEXT NOT NULL,
-                    action_taken TEXT,
-                    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(pr_number, head_sha, event_type)
+                await self._migrate_clarify_deadline(db)
+                await db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+                logger.info(
+                    "database_schema_applied", from_version=version, to_version=_SCHEMA_VERSION
                 )
-            """)
-
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_github_events_pr ON github_events(pr_number)
-            """)
-
-            # PA task queue table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS task_queue (
-                    id          INTEGER PRIMARY KEY AUTOINCREMENT,
-                    task_type   TEXT NOT NULL,
-                    payload     TEXT NOT NULL,
-                    status      TEXT NOT NULL DEFAULT 'pending',
-                    priority    INTEGER NOT NULL DEFAULT 5,
-                    chat_id     INTEGER,
-                    result      TEXT,
-                    error       TEXT,
-                    created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_task_queue_status
-                ON task_queue(status, priority, created_at)
-            """)
-
-            # PA agent facts table (persistent key/value memory)
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS agent_facts (
-                    id         INTEGER PRIMARY KEY AUTOINCREMENT,
-                    key        TEXT UNIQUE NOT NULL,
-                    value      TEXT NOT NULL,
-                    source     TEXT NOT NULL DEFAULT 'user',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
 
-            await db.commit()
+        # Warm the fingerprint set so repeat content is answered without a query
+        db = await self._conn()
+        async with db.execute("SELECT content_hash FROM content_fingerprints") as cursor:
+            self._known_fingerprints.update(row[0] for row in await cursor.fetchall())
 
-        logger.info("database_initialized", db_path=str(self.db_path))
+        logger.info(
+            "database_initialized",
+            db_path=str(self.db_path),
+            known_fingerprints=len(self._known_fingerprints),
+        )
+
+    @staticmethod
+    async def _migrate_clarify_deadline(db: aiosqlite.Connection) -> None:
+        """
+        Give task_queue its clarify_deadline column and index.
+
+        Databases created before the column held the deadline in the JSON
+        payload; it is copied over so paused tasks still expire.
+        """
+        async with db.execute("PRAGMA table_info(task_queue)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        if "clarify_deadline" not in columns:
+            await db.execute("ALTER TABLE task_queue ADD COLUMN clarify_deadline TEXT")
+            await db.execute(
+                """
+                UPDATE task_queue
+                SET clarify_deadline = json_extract(payload, '$._clarify_deadline')
+                WHERE status = 'waiting_clarification'
+                """
+            )
+        # Lets expire_stale_clarifications seek straight to the overdue tasks
+        await db.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_task_queue_deadline
+            ON task_queue(clarify_deadline) WHERE status = 'waiting_clarification'
+            """
+        )
+
+    @staticmethod
+    async def _rebuild_without_rowid(
+        db: aiosqlite.Connection, table: str, create_sql: str, columns: str
+    ) -> None:
+        """
+        Migrate a table created by an older schema (rowid + UNIQUE key) to WITHOUT ROWID.
+
+        Args:
+            db: Connection inside init_db's transaction
+            table: Table name
+            create_sql: The table's current CREATE TABLE IF NOT EXISTS statement
+            columns: Comma-separated columns to copy over
+        """
+        async with db.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None or "WITHOUT ROWID" in row[0].upper():
+            return
+
+        # One savepoint, so a failure part-way leaves the old table untouched
+        await db.execute("SAVEPOINT rebuild_without_rowid")
+        await db.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+        await db.execute(create_sql)
+        await db.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_old")
+        await db.execute(f"DROP TABLE {table}_old")
+        await db.execute("RELEASE rebuild_without_rowid")
+        logger.info("table_rebuilt_without_rowid", table=table)
 
     @staticmethod
     def generate_content_id(url: str, title: str) -> str:
@@ -191,20 +409,55 @@ class StateManager:
             True if duplicate exists, False otherwise
         """
         content_id = self.generate_content_id(url, title)
+        if content_id in self._known_fingerprints:
+            return True
 
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                "SELECT 1 FROM content_fingerprints WHERE content_hash = ?", (content_id,)
-            )
+        db = await self._conn()
+        async with db.execute(
+            "SELECT 1 FROM content_fingerprints WHERE content_hash = ?", (content_id,)
+        ) as cursor:
             result = await cursor.fetchone()
 
         is_duplicate = result is not None
 
         if is_duplicate:
+            self._known_fingerprints.add(content_id)
             logger.debug("duplicate_content_found", content_id=content_id, title=title)
 
         return is_duplicate
 
+    async def check_duplicates_bulk(self, pairs: list[tuple[str, str]]) -> set[str]:
+        """
+        Check many (url, title) pairs for duplicates in one round trip.
+
+        Args:
+            pairs: (url, title) tuples to check
+
+        Returns:
+            Content IDs (see generate_content_id) that already exist
+        """
+        requested = {self.generate_content_id(url, title) for url, title in pairs}
+        duplicates = requested & self._known_fingerprints
+        content_ids = list(requested - duplicates)
+        if not content_ids:
+            return duplicates
+
+        db = await self._conn()
+        # Chunk to stay under SQLite's bound-parameter limit
+        for start in range(0, len(content_ids), _MAX_SQL_PARAMS):
+            chunk = content_ids[start : start + _MAX_SQL_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            async with db.execute(
+                f"SELECT content_hash FROM content_fingerprints WHERE content_hash IN ({placeholders})",
+                chunk,
+            ) as cursor:
+                duplicates.update(row[0] for row in await cursor.fetchall())
+
+        self._known_fingerprints.update(duplicates)
+        logger.debug("bulk_duplicate_check", checked=len(content_ids), duplicates=len(duplicates))
+
+        return duplicates
+
     async def store_fingerprint(self, url: str, title: str, source: str):
         """
         Store content fingerprint to prevent future duplicates.
@@ -216,20 +469,22 @@ class StateManager:
         """
         content_hash = self.generate_content_id(url, title)
 
-        async with aiosqlite.connect(self.db_path) as db:
-            try:
-                await db.execute(
-                    """
-                    INSERT INTO content_fingerprints (content_hash, source)
-                    VALUES (?, ?)
-                    """,
-                    (content_hash, source),
-                )
-                await db.commit()
-                logger.debug("fingerprint_stored", content_hash=content_hash, source=source)
-            except aiosqlite.IntegrityError:
-                # Already exists, ignore
-                pass
+        async with self._transaction() as db:
+            await self._insert_fingerprint(db, content_hash, source)
+
+        self._known_fingerprints.add(content_hash)
+
+    @staticmethod
+    async def _insert_fingerprint(db: aiosqlite.Connection, content_hash: str, source: str):
+        """Insert a fingerprint inside the caller's transaction; existing hashes are kept."""
+        await db.execute(
+            """
+            INSERT OR IGNORE INTO content_fingerprints (content_hash, source)
+            VALUES (?, ?)
+            """,
+            (content_hash, source),
+        )
+        logger.debug("fingerprint_stored", content_hash=content_hash, source=source)
 
     async def store_content(self, item: dict[str, Any]) -> int:
         """
@@ -249,12 +504,13 @@ class StateManager:
         """
         content_id = self.generate_content_id(item["url"], item["title"])
 
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
+        async with self._transaction() as db:
+            async with db.execute(
                 """
                 INSERT INTO published_items
                 (content_id, source, title, url, newsletter_date, category, metadata)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
+                RETURNING id
                 """,
                 (
                     content_id,
@@ -263,14 +519,17 @@ class StateManager:
                     item["url"],
                     item.get("newsletter_date"),
                     item.get("category"),
-                    json.dumps(item.get("metadata", {})),
+                    _encode_metadata(item.get("metadata")),
                 ),
-            )
-            await db.commit()
-            row_id = cursor.lastrowid
+            ) as cursor:
+                row = await cursor.fetchone()
+            if row is None:
+                raise RuntimeError("INSERT ... RETURNING yielded no published_items row")
+            row_id = row[0]
+            # Same transaction, so the item and its fingerprint land together or not at all
+            await self._insert_fingerprint(db, content_id, item["source"])
 
-        # Also store fingerprint
-        await self.store_fingerprint(item["url"], item["title"], item["source"])
+        self._known_fingerprints.add(content_id)
 
         logger.info(
             "content_stored", content_id=content_id, title=item["title"], source=item["source"]
@@ -278,6 +537,50 @@ class StateManager:
 
         return row_id
 
+    async def store_content_bulk(
+        self, rows: list[tuple[str, str, str, str | None, dict[str, Any] | None, str | None]]
+    ) -> int:
+        """
+        Store many published content items (and their fingerprints) in one transaction.
+
+        Args:
+            rows: (url, title, source, category, metadata, newsletter_date) tuples
+
+        Returns:
+            Number of items stored
+
+        Raises:
+            aiosqlite.IntegrityError: If any item was already stored; nothing is committed
+        """
+        if not rows:
+            return 0
+
+        content_ids = [self.generate_content_id(row[0], row[1]) for row in rows]
+
+        async with self._transaction() as db:
+            await db.executemany(
+                """
+                INSERT INTO published_items
+                (content_id, url, title, source, category, metadata, newsletter_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (content_id, url, title, source, category, _encode_metadata(metadata), date)
+                    for content_id, (url, title, source, category, metadata, date) in zip(
+                        content_ids, rows, strict=True
+                    )
+                ],
+            )
+            await db.executemany(
+                "INSERT OR IGNORE INTO content_fingerprints (content_hash, source) VALUES (?, ?)",
+                [(content_id, row[2]) for content_id, row in zip(content_ids, rows, strict=True)],
+            )
+
+        self._known_fingerprints.update(content_ids)
+        logger.info("content_stored_bulk", count=len(rows))
+
+        return len(rows)
+
     async def create_newsletter_record(
         self,
         newsletter_date: str,
@@ -297,17 +600,20 @@ class StateManager:
         Returns:
             ID of inserted row
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
+        async with self._transaction() as db:
+            async with db.execute(
                 """
                 INSERT INTO newsletters
                 (date, item_count, platforms_published, skip_reason)
                 VALUES (?, ?, ?, ?)
+                RETURNING id
                 """,
                 (newsletter_date, item_count, json.dumps(platforms_published), skip_reason),
-            )
-            await db.commit()
-            newsletter_id = cursor.lastrowid
+            ) as cursor:
+                row = await cursor.fetchone()
+            if row is None:
+                raise RuntimeError("INSERT ... RETURNING yielded no newsletters row")
+            newsletter_id = row[0]
 
         logger.info(
             "newsletter_record_created",
@@ -336,7 +642,7 @@ class StateManager:
             error_message: Error message if failed
             attempt_count: Attempt number
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._transaction() as db:
             await db.execute(
                 """
                 INSERT INTO publishing_logs
@@ -345,7 +651,6 @@ class StateManager:
                 """,
                 (newsletter_id, platform, status, error_message, attempt_count),
             )
-            await db.commit()
 
         logger.info(
             "publishing_logged",
@@ -355,6 +660,36 @@ class StateManager:
             attempt=attempt_count,
         )
 
+    async def log_publishing_attempts_bulk(
+        self, newsletter_id: int, attempts: list[tuple[str, str, str | None, int]]
+    ) -> None:
+        """
+        Log several publishing attempts for one newsletter in one transaction.
+
+        Args:
+            newsletter_id: Newsletter ID
+            attempts: (platform, status, error_message, attempt_count) tuples,
+                same meaning as the log_publishing_attempt() arguments
+        """
+        if not attempts:
+            return
+
+        async with self._transaction() as db:
+            await db.executemany(
+                """
+                INSERT INTO publishing_logs
+                (newsletter_id, platform, status, error_message, attempt_count)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [(newsletter_id, *attempt) for attempt in attempts],
+            )
+
+        logger.info(
+            "publishing_logged_bulk",
+            newsletter_id=newsletter_id,
+            platforms=[attempt[0] for attempt in attempts],
+        )
+
     async def track_api_usage(
         self,
         api_name: str,
@@ -373,7 +708,7 @@ class StateManager:
         """
         today = str(date.today())
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._transaction() as db:
             # Try to update existing record
             await db.execute(
                 """
@@ -386,7 +721,6 @@ class StateManager:
                 """,
                 (today, api_name, request_count, token_count, estimated_cost),
             )
-            await db.commit()
 
         logger.debug(
             "api_usage_tracked",
@@ -409,15 +743,15 @@ class StateManager:
         if target_date is None:
             target_date = str(date.today())
 
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                """
-                SELECT api_name, request_count, token_count, estimated_cost
-                FROM api_metrics
-                WHERE date = ?
-                """,
-                (target_date,),
-            )
+        db = await self._conn()
+        async with db.execute(
+            """
+            SELECT api_name, request_count, token_count, estimated_cost
+            FROM api_metrics
+            WHERE date = ?
+            """,
+            (target_date,),
+        ) as cursor:
             rows = await cursor.fetchall()
 
         metrics: dict[str, Any] = {}
@@ -448,25 +782,22 @@ class StateManager:
             event_type: Event type (e.g., 'needs_description', 'ci_failure', 'needs_review')
             action_taken: Action that was taken (e.g., 'description_generated', 'ruff_fix_pushed')
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            try:
-                await db.execute(
-                    """
-                    INSERT INTO github_events (pr_number, head_sha, event_type, action_taken)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (pr_number, head_sha, event_type, action_taken),
-                )
-                await db.commit()
-                logger.debug(
-                    "github_event_recorded",
-                    pr_number=pr_number,
-                    event_type=event_type,
-                    action_taken=action_taken,
-                )
-            except aiosqlite.IntegrityError:
-                # Already recorded (UNIQUE constraint), ignore
-                pass
+        async with self._transaction() as db:
+            # Already recorded (UNIQUE constraint) rows are skipped
+            cursor = await db.execute(
+                """
+                INSERT OR IGNORE INTO github_events (pr_number, head_sha, event_type, action_taken)
+                VALUES (?, ?, ?, ?)
+                """,
+                (pr_number, head_sha, event_type, action_taken),
+            )
+        if cursor.rowcount:
+            logger.debug(
+                "github_event_recorded",
+                pr_number=pr_number,
+                event_type=event_type,
+                action_taken=action_taken,
+            )
 
     async def is_github_event_processed(
         self,
@@ -485,14 +816,14 @@ class StateManager:
         Returns:
             True if already processed, False otherwise
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                """
-                SELECT 1 FROM github_events
-                WHERE pr_number = ? AND head_sha = ? AND event_type = ?
-                """,
-                (pr_number, head_sha, event_type),
-            )
+        db = await self._conn()
+        async with db.execute(
+            """
+            SELECT 1 FROM github_events
+            WHERE pr_number = ? AND head_sha = ? AND event_type = ?
+            """,
+            (pr_number, head_sha, event_type),
+        ) as cursor:
             result = await cursor.fetchone()
         return result is not None
 
@@ -506,15 +837,15 @@ class StateManager:
         Returns:
             Number of fix attempts (ruff_fix_pushed or ai_fix_pushed)
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                """
-                SELECT COUNT(*) FROM github_events
-                WHERE pr_number = ?
-                AND action_taken IN ('ruff_fix_pushed', 'ai_fix_pushed')
-                """,
-                (pr_number,),
-            )
+        db = await self._conn()
+        async with db.execute(
+            """
+            SELECT COUNT(*) FROM github_events
+            WHERE pr_number = ?
+            AND action_taken IN ('ruff_fix_pushed', 'ai_fix_pushed')
+            """,
+            (pr_number,),
+        ) as cursor:
             result = await cursor.fetchone()
         return result[0] if result else 0
 
@@ -531,20 +862,22 @@ class StateManager:
         Returns:
             List of dicts with keys: head_sha, action_taken, processed_at
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute(
-                """
-                SELECT head_sha, action_taken, processed_at
-                FROM github_events
-                WHERE pr_number = ?
-                AND action_taken IN ('ruff_fix_pushed', 'ai_fix_pushed')
-                ORDER BY processed_at ASC
-                """,
-                (pr_number,),
-            )
+        db = await self._conn()
+        async with db.execute(
+            """
+            SELECT head_sha, action_taken, processed_at
+            FROM github_events
+            WHERE pr_number = ?
+            AND action_taken IN ('ruff_fix_pushed', 'ai_fix_pushed')
+            ORDER BY processed_at ASC
+            """,
+            (pr_number,),
+        ) as cursor:
             rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        return [
+            {"head_sha": head_sha, "action_taken": action_taken, "processed_at": processed_at}
+            for head_sha, action_taken, processed_at in rows
+        ]
 
     async def minutes_since_last_newsletter(self) -> float:
         """
@@ -556,13 +889,13 @@ class StateManager:
             Minutes since last newsletter, or a large value (999_999) if none
             has ever been published (triggers first run immediately).
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                """
-                SELECT (julianday('now') - julianday(MAX(created_at))) * 24 * 60
-                FROM newsletters
-                """
-            )
+        db = await self._conn()
+        async with db.execute(
+            """
+            SELECT (julianday('now') - julianday(MAX(created_at))) * 24 * 60
+            FROM newsletters
+            """
+        ) as cursor:
             row = await cursor.fetchone()
 
         if row is None or row[0] is None:
@@ -570,6 +903,136 @@ class StateManager:
 
         return float(row[0])
 
+    # ------------------------------------------------------------------
+    # Enhancement cache
+    # ------------------------------------------------------------------
+
+    async def get_cached_enhancement(
+        self, cache_key: str, max_age_seconds: int
+    ) -> dict[str, Any] | None:
+        """
+        Fetch a cached enhancement payload if it is younger than max_age_seconds.
+
+        Args:
+            cache_key: Key computed from the newsletter item set
+            max_age_seconds: Entries older than this are ignored
+
+        Returns:
+            Decoded payload, or None on a miss
+        """
+        db = await self._conn()
+        async with db.execute(
+            """
+            SELECT payload FROM enhancement_cache
+            WHERE cache_key = ?
+              AND created_at >= datetime('now', ?)
+            """,
+            (cache_key, f"-{max_age_seconds} seconds"),
+        ) as cursor:
+            row = await cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def store_cached_enhancement(self, cache_key: str, payload: dict[str, Any]) -> None:
+        """
+        Store (or refresh) an enhancement payload.
+
+        Args:
+            cache_key: Key computed from the newsletter item set
+            payload: JSON-serializable enhancement output
+        """
+        async with self._transaction() as db:
+            await db.execute(
+                """
+                INSERT INTO enhancement_cache (cache_key, payload, created_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    payload = excluded.payload,
+                    created_at = CURRENT_TIMESTAMP
+                """,
+                (cache_key, json.dumps(payload)),
+            )
+        logger.debug("enhancement_cached", cache_key=cache_key)
+
+    async def get_enhanced_items(self, content_ids: list[str]) -> dict[str, tuple[str, str]]:
+        """
+        Fetch cached per-item enhancements.
+
+        Args:
+            content_ids: Content ids (see generate_content_id) to look up
+
+        Returns:
+            content_id -> (viral_headline, takeaway) for the ids that are cached
+        """
+        found: dict[str, tuple[str, str]] = {}
+        if not content_ids:
+            return found
+
+        db = await self._conn()
+        # Chunk to stay under SQLite's bound-parameter limit
+        for start in range(0, len(content_ids), _MAX_SQL_PARAMS):
+            chunk = content_ids[start : start + _MAX_SQL_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            async with db.execute(
+                "SELECT content_id, viral_headline, takeaway FROM enhanced_items "
+                f"WHERE content_id IN ({placeholders})",
+                chunk,
+            ) as cursor:
+                found.update((row[0], (row[1], row[2])) for row in await cursor.fetchall())
+
+        return found
+
+    async def store_enhanced_items(self, rows: list[tuple[str, str, str]]) -> None:
+        """
+        Store (or refresh) per-item enhancements in one transaction.
+
+        Args:
+            rows: (content_id, viral_headline, takeaway) tuples
+        """
+        if not rows:
+            return
+
+        async with self._transaction() as db:
+            await db.executemany(
+                """
+                INSERT OR REPLACE INTO enhanced_items (content_id, viral_headline, takeaway)
+                VALUES (?, ?, ?)
+                """,
+                rows,
+            )
+        logger.debug("enhanced_items_stored", count=len(rows))
+
+    # ------------------------------------------------------------------
+    # Telegram polling state
+    # ------------------------------------------------------------------
+
+    async def get_telegram_update_offset(self) -> int | None:
+        """Return the id of the last handled Telegram update, or None if none is stored."""
+        db = await self._conn()
+        async with db.execute("SELECT last_update_id FROM telegram_state WHERE id = 1") as cursor:
+            row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def set_telegram_update_offset(self, update_id: int) -> None:
+        """
+        Record a handled Telegram update id.
+
+        The stored offset only moves forward, so an older update that finishes
+        after a newer one does not rewind it.
+
+        Args:
+            update_id: Telegram update_id that was just handled
+        """
+        async with self._transaction() as db:
+            await db.execute(
+                """
+                INSERT INTO telegram_state (id, last_update_id) VALUES (1, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    last_update_id = MAX(last_update_id, excluded.last_update_id),
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                (update_id,),
+            )
+
     # ------------------------------------------------------------------
     # PA memory helpers
     # ------------------------------------------------------------------
@@ -583,7 +1046,7 @@ class StateManager:
             value: Fact value
             source: Who set it — 'user', 'agent', or 'system'
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._transaction() as db:
             await db.execute(
                 """
                 INSERT INTO agent_facts (key, value, source, updated_at)
@@ -595,7 +1058,8 @@ class StateManager:
                 """,
                 (key, value, source),
             )
-            await db.commit()
+        if self._facts is not None:
+            self._facts[key] = value
         logger.debug("fact_set", key=key, source=source)
 
     async def get_fact(self, key: str) -> str | None:
@@ -608,15 +1072,24 @@ class StateManager:
         Returns:
             Fact value, or None if not found
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute("SELECT value FROM agent_facts WHERE key = ?", (key,))
-            row = await cursor.fetchone()
-        return row[0] if row else None
+        facts = self._facts if self._facts is not None else await self.refresh_facts()
+        return facts.get(key)
 
     async def get_all_facts(self) -> dict[str, str]:
         """Return all agent facts as a key → value dict."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute("SELECT key, value FROM agent_facts ORDER BY key")
-            rows = await cursor.fetchall()
-        return {row["key"]: row["value"] for row in rows}
+        facts = self._facts if self._facts is not None else await self.refresh_facts()
+        return dict(sorted(facts.items()))
+
+    async def refresh_facts(self) -> dict[str, str]:
+        """
+        Reload the in-memory fact mirror from the database.
+
+        Only needed when another process may have written agent_facts.
+
+        Returns:
+            The reloaded key → value dict
+        """
+        db = await self._conn()
+        async with db.execute("SELECT key, value FROM agent_facts") as cursor:
+            self._facts = {row[0]: row[1] for row in await cursor.fetchall()}
+        return self._facts
@@ -16,9 +16,18 @@ picks it up on the next poll.
 
 Tasks whose deadline has passed are expired by expire_stale_clarifications(),
 which is called at the top of every TaskWorker poll cycle.
+
+In-process wake-up
+------------------
+SQLite stays the source of truth, but every push also wakes any consumer in
+the same process that is blocked in wait_for_push(), so TaskWorker claims a
+new task immediately instead of waiting out its poll interval.
 """
 
+import asyncio
 import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -27,16 +36,63 @@ from typing import Any
 import aiosqlite
 
 from src.config.settings import settings
+from src.core.state_manager import connect_db
 from src.utils.logger import get_logger
 
+try:
+    import orjson  # faster encoding of task payloads and results
+except ImportError:
+    orjson = None
+
 logger = get_logger("task_queue")
 
 VALID_TASK_TYPES = frozenset({"code", "newsletter", "status", "shell"})
 VALID_STATUSES = frozenset({"pending", "in_progress", "waiting_clarification", "done", "failed"})
 
+# Priority bounds: 1 = highest, 10 = lowest. pop() reads the first entry of the
+# partial index idx_task_queue_pending (priority, created_at), so no sort is needed.
+MIN_PRIORITY = 1
+MAX_PRIORITY = 10
+
 # How long to wait for a user clarification reply before giving up.
 CLARIFICATION_TIMEOUT_MINUTES = 10
 
+# Futures of in-process consumers currently blocked in TaskQueue.wait_for_push().
+# Module-level because producers and consumers each hold their own TaskQueue.
+_push_waiters: set[asyncio.Future[None]] = set()
+
+
+def _notify_push() -> None:
+    """Wake every consumer blocked in TaskQueue.wait_for_push()."""
+    for waiter in _push_waiters:
+        if not waiter.done():
+            waiter.set_result(None)
+
+
+def _dumps(value: dict[str, Any]) -> str:
+    """Encode a payload or result as JSON text for the task_queue columns."""
+    if orjson is not None:
+        # Non-string keys are stringified, as json.dumps does
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
+def _loads(text: str) -> dict[str, Any]:
+    """Decode a task_queue payload or result column."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _validate_task(task_type: str, priority: int) -> None:
+    """Raise ValueError for an unknown task type or out-of-range priority."""
+    if task_type not in VALID_TASK_TYPES:
+        raise ValueError(f"Unknown task_type {task_type!r}. Valid: {VALID_TASK_TYPES}")
+    if not MIN_PRIORITY <= priority <= MAX_PRIORITY:
+        raise ValueError(
+            f"Priority {priority!r} out of range. Valid: {MIN_PRIORITY}-{MAX_PRIORITY}"
+        )
+
 
 @dataclass
 class Task:
@@ -65,6 +121,43 @@ class TaskQueue:
 
     def __init__(self, db_path: Path | None = None):
         self.db_path = db_path or settings.database_path
+        # One connection for the queue's lifetime, opened on first use (see _conn)
+        self._db: aiosqlite.Connection | None = None
+        self._connect_lock = asyncio.Lock()
+        # Write transactions share that connection, so they must not interleave
+        self._write_lock = asyncio.Lock()
+
+    async def _conn(self) -> aiosqlite.Connection:
+        """Return the shared connection, opening it on first use."""
+        if self._db is None:
+            async with self._connect_lock:
+                if self._db is None:
+                    db = await connect_db(self.db_path)
+                    db.row_factory = aiosqlite.Row
+                    self._db = db
+        return self._db
+
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Run one write transaction on the shared connection.
+
+        Commits when the block exits normally and rolls back if it raises.
+        """
+        db = await self._conn()
+        async with self._write_lock:
+            try:
+                yield db
+            except BaseException:
+                await db.rollback()
+                raise
+            await db.commit()
+
+    async def close(self) -> None:
+        """Close the shared connection (a later call reopens it)."""
+        if self._db is not None:
+            db, self._db = self._db, None
+            await db.close()
 
     # ------------------------------------------------------------------
     # Core operations
@@ -89,23 +182,56 @@ class TaskQueue:
         Returns:
             Assigned task ID
         """
-        if task_type not in VALID_TASK_TYPES:
-            raise ValueError(f"Unknown task_type {task_type!r}. Valid: {VALID_TASK_TYPES}")
+        _validate_task(task_type, priority)
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._transaction() as db:
             cursor = await db.execute(
                 """
                 INSERT INTO task_queue (task_type, payload, chat_id, priority)
                 VALUES (?, ?, ?, ?)
                 """,
-                (task_type, json.dumps(payload), chat_id, priority),
+                (task_type, _dumps(payload), chat_id, priority),
             )
-            await db.commit()
             task_id = cursor.lastrowid
 
+        _notify_push()
         logger.info("task_queued", task_id=task_id, task_type=task_type, priority=priority)
         return task_id
 
+    async def push_many(
+        self, tasks: list[tuple[str, dict[str, Any], int | None, int]]
+    ) -> list[int]:
+        """
+        Add several tasks to the queue in a single transaction.
+
+        Args:
+            tasks: (task_type, payload, chat_id, priority) tuples, as for push()
+
+        Returns:
+            Assigned task IDs, in the same order as *tasks*
+        """
+        for task_type, _, _, priority in tasks:
+            _validate_task(task_type, priority)
+
+        if not tasks:
+            return []
+
+        task_ids: list[int] = []
+        async with self._transaction() as db:
+            for task_type, payload, chat_id, priority in tasks:
+                cursor = await db.execute(
+                    """
+                    INSERT INTO task_queue (task_type, payload, chat_id, priority)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (task_type, _dumps(payload), chat_id, priority),
+                )
+                task_ids.append(cursor.lastrowid)
+
+        _notify_push()
+        logger.info("tasks_queued", task_ids=task_ids)
+        return task_ids
+
     async def pop(self, task_type: str | None = None) -> Task | None:
         """
         Claim the highest-priority pending task and mark it in_progress.
@@ -116,48 +242,47 @@ class TaskQueue:
         Returns:
             Task instance, or None if the queue is empty
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-
+        # Select and claim in one statement, so no other pop can take the row in between
+        async with self._transaction() as db:
             if task_type:
-                cursor = await db.execute(
+                claim = db.execute(
                     """
-                    SELECT * FROM task_queue
-                    WHERE status = 'pending' AND task_type = ?
-                    ORDER BY priority ASC, created_at ASC
-                    LIMIT 1
+                    UPDATE task_queue
+                    SET status = 'in_progress', updated_at = CURRENT_TIMESTAMP
+                    WHERE id = (
+                        SELECT id FROM task_queue
+                        WHERE status = 'pending' AND task_type = ?
+                        ORDER BY priority ASC, created_at ASC
+                        LIMIT 1
+                    )
+                    RETURNING id, task_type, payload, priority, chat_id
                     """,
                     (task_type,),
                 )
             else:
-                cursor = await db.execute(
+                claim = db.execute(
                     """
-                    SELECT * FROM task_queue
-                    WHERE status = 'pending'
-                    ORDER BY priority ASC, created_at ASC
-                    LIMIT 1
+                    UPDATE task_queue
+                    SET status = 'in_progress', updated_at = CURRENT_TIMESTAMP
+                    WHERE id = (
+                        SELECT id FROM task_queue
+                        WHERE status = 'pending'
+                        ORDER BY priority ASC, created_at ASC
+                        LIMIT 1
+                    )
+                    RETURNING id, task_type, payload, priority, chat_id
                     """
                 )
+            async with claim as cursor:
+                row = await cursor.fetchone()
 
-            row = await cursor.fetchone()
-            if not row:
-                return None
-
-            # Claim atomically before releasing the connection
-            await db.execute(
-                """
-                UPDATE task_queue
-                SET status = 'in_progress', updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-                """,
-                (row["id"],),
-            )
-            await db.commit()
+        if not row:
+            return None
 
         task = Task(
             id=row["id"],
             task_type=row["task_type"],
-            payload=json.loads(row["payload"]),
+            payload=_loads(row["payload"]),
             status="in_progress",
             priority=row["priority"],
             chat_id=row["chat_id"],
@@ -184,7 +309,7 @@ class TaskQueue:
         if status not in VALID_STATUSES:
             raise ValueError(f"Unknown status {status!r}. Valid: {VALID_STATUSES}")
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._transaction() as db:
             await db.execute(
                 """
                 UPDATE task_queue
@@ -193,20 +318,18 @@ class TaskQueue:
                 """,
                 (
                     status,
-                    json.dumps(result) if result is not None else None,
+                    _dumps(result) if result is not None else None,
                     error,
                     task_id,
                 ),
             )
-            await db.commit()
 
         logger.info("task_updated", task_id=task_id, status=status)
 
     async def get(self, task_id: int) -> Task | None:
         """Fetch a single task by ID."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute("SELECT * FROM task_queue WHERE id = ?", (task_id,))
+        db = await self._conn()
+        async with db.execute("SELECT * FROM task_queue WHERE id = ?", (task_id,)) as cursor:
             row = await cursor.fetchone()
 
         if not row:
@@ -215,18 +338,40 @@ class TaskQueue:
         return Task(
             id=row["id"],
             task_type=row["task_type"],
-            payload=json.loads(row["payload"]),
+            payload=_loads(row["payload"]),
             status=row["status"],
             priority=row["priority"],
             chat_id=row["chat_id"],
-            result=json.loads(row["result"]) if row["result"] else None,
+            result=_loads(row["result"]) if row["result"] else None,
             error=row["error"],
         )
 
+    async def wait_for_push(self, timeout: float) -> bool:
+        """
+        Block until a task is pushed in this process, or *timeout* seconds pass.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if woken by a push, False on timeout
+        """
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        _push_waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            _push_waiters.discard(waiter)
+
     async def depth(self, status: str = "pending") -> int:
         """Return the number of tasks with the given status."""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute("SELECT COUNT(*) FROM task_queue WHERE status = ?", (status,))
+        db = await self._conn()
+        async with db.execute(
+            "SELECT COUNT(*) FROM task_queue WHERE status = ?", (status,)
+        ) as cursor:
             row = await cursor.fetchone()
         return row[0] if row else 0
 
@@ -237,7 +382,7 @@ class TaskQueue:
     async def await_clarification(self, task_id: int) -> None:
         """Pause a task, waiting for the user to answer clarifying questions.
 
-        Stores a deadline in the task payload so that
+        Stores a deadline in the clarify_deadline column so that
         expire_stale_clarifications() can time out the task if the user
         does not respond within CLARIFICATION_TIMEOUT_MINUTES.
         """
@@ -245,39 +390,32 @@ class TaskQueue:
             datetime.utcnow() + timedelta(minutes=CLARIFICATION_TIMEOUT_MINUTES)
         ).isoformat()
 
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute("SELECT payload FROM task_queue WHERE id = ?", (task_id,))
-            row = await cursor.fetchone()
-            if row:
-                payload = json.loads(row[0])
-                payload["_clarify_deadline"] = deadline
-                await db.execute(
-                    """
-                    UPDATE task_queue
-                    SET status = 'waiting_clarification',
-                        payload = ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                    """,
-                    (json.dumps(payload), task_id),
-                )
-                await db.commit()
+        async with self._transaction() as db:
+            await db.execute(
+                """
+                UPDATE task_queue
+                SET status = 'waiting_clarification',
+                    clarify_deadline = ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+                """,
+                (deadline, task_id),
+            )
 
         logger.info("task_awaiting_clarification", task_id=task_id, deadline=deadline)
 
     async def find_waiting_clarification(self, chat_id: int) -> Task | None:
         """Return the most-recent waiting_clarification task for *chat_id*, or None."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute(
-                """
-                SELECT * FROM task_queue
-                WHERE status = 'waiting_clarification' AND chat_id = ?
-                ORDER BY created_at DESC
-                LIMIT 1
-                """,
-                (chat_id,),
-            )
+        db = await self._conn()
+        async with db.execute(
+            """
+            SELECT * FROM task_queue
+            WHERE status = 'waiting_clarification' AND chat_id = ?
+            ORDER BY created_at DESC
+            LIMIT 1
+            """,
+            (chat_id,),
+        ) as cursor:
             row = await cursor.fetchone()
 
         if not row:
@@ -286,7 +424,7 @@ class TaskQueue:
         return Task(
             id=row["id"],
             task_type=row["task_type"],
-            payload=json.loads(row["payload"]),
+            payload=_loads(row["payload"]),
             status=row["status"],
             priority=row["priority"],
             chat_id=row["chat_id"],
@@ -298,25 +436,27 @@ class TaskQueue:
         CodeHandler reads ``payload["clarify_answer"]`` and skips the
         clarification phase when it finds a value there.
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._transaction() as db:
             cursor = await db.execute("SELECT payload FROM task_queue WHERE id = ?", (task_id,))
             row = await cursor.fetchone()
             if row:
-                payload = json.loads(row[0])
+                payload = _loads(row[0])
                 payload["clarify_answer"] = answer
+                # Left in the payload by versions that kept the deadline there
                 payload.pop("_clarify_deadline", None)
                 await db.execute(
                     """
                     UPDATE task_queue
                     SET status = 'pending',
                         payload = ?,
+                        clarify_deadline = NULL,
                         updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
                     """,
-                    (json.dumps(payload), task_id),
+                    (_dumps(payload), task_id),
                 )
-                await db.commit()
 
+        _notify_push()
         logger.info("task_clarification_resumed", task_id=task_id)
 
     async def expire_stale_clarifications(self) -> list[tuple[int, int | None]]:
@@ -329,33 +469,20 @@ class TaskQueue:
             can send the user a "timed out" message.
         """
         now_iso = datetime.utcnow().isoformat()
-        expired: list[tuple[int, int | None]] = []
 
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute(
-                "SELECT id, chat_id, payload FROM task_queue WHERE status = 'waiting_clarification'"
-            )
-            rows = await cursor.fetchall()
-
-            for row in rows:
-                payload = json.loads(row["payload"])
-                deadline = payload.get("_clarify_deadline")
-                if deadline and deadline < now_iso:
-                    await db.execute(
-                        """
-                        UPDATE task_queue
-                        SET status = 'failed',
-                            error = 'Timed out waiting for clarification',
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE id = ?
-                        """,
-                        (row["id"],),
-                    )
-                    expired.append((row["id"], row["chat_id"]))
-
-            if expired:
-                await db.commit()
+        async with self._transaction() as db:
+            async with db.execute(
+                """
+                UPDATE task_queue
+                SET status = 'failed',
+                    error = 'Timed out waiting for clarification',
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'waiting_clarification' AND clarify_deadline < ?
+                RETURNING id, chat_id
+                """,
+                (now_iso,),
+            ) as cursor:
+                expired = [(row["id"], row["chat_id"]) for row in await cursor.fetchall()]
 
         for task_id, _ in expired:
             logger.info("task_clarification_expired", task_id=task_id)
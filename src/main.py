@@ -6,6 +6,7 @@ Main entry point for the application.
 
 import argparse
 import asyncio
+import importlib.util
 import sys
 from pathlib import Path
 
@@ -27,6 +28,19 @@ from src.utils.logger import configure_logging, get_logger
 logger = get_logger("main")
 
 
+def _install_eager_task_factory() -> None:
+    """
+    Start new tasks eagerly (Python 3.12+), a no-op on older interpreters.
+
+    Coroutines gathered by the orchestrator that finish without suspending
+    (disabled sources, no-op publishers) then complete at creation time
+    instead of costing an extra event-loop hop.
+    """
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        asyncio.get_running_loop().set_task_factory(eager_task_factory)
+
+
 async def run_test_cycle():
     """Run a single test cycle without publishing."""
     logger.info("test_cycle_start", mode="test")
@@ -85,6 +99,8 @@ async def run_test_cycle():
     else:
         logger.info("test_cycle_complete", mode="test", result="No items found")
 
+    await state_manager.close()
+
 
 async def run_production_cycle():
     """Run a full production cycle with publishing."""
@@ -133,6 +149,10 @@ async def run_production_cycle():
     else:
         logger.error("production_cycle_failed", error=result.error)
 
+    # Let background usage tracking finish before the loop shuts down
+    await orchestrator.aclose()
+    await state_manager.close()
+
 
 async def run_pa_mode():
     """Run ElvAgent as a fully autonomous Personal Assistant.
@@ -172,6 +192,7 @@ async def run_github_monitor(max_cycles: int = 0):
         interval_seconds=settings.github_poll_interval,
         max_cycles=max_cycles,
     )
+    await state_manager.close()
 
 
 async def main():
@@ -210,6 +231,10 @@ async def main():
     # Ensure directories exist
     settings.ensure_directories()
 
+    # Only the one-shot newsletter cycles; long-running agents keep default task scheduling
+    if args.mode in ("test", "production"):
+        _install_eager_task_factory()
+
     try:
         if args.mode == "test":
             await run_test_cycle()
@@ -232,4 +257,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # libuv-based event loop when installed; uvloop is not available on Windows
+    if importlib.util.find_spec("uvloop") is not None:
+        import uvloop
+
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
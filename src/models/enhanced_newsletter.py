@@ -58,7 +58,7 @@ class EnhancedNewsletterItem:
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary representation."""
         return {
-            "original_item": self.original_item.to_dict(),
+            "original_item": self.original_item.model_dump(mode="json"),
             "viral_headline": self.viral_headline,
             "takeaway": self.takeaway,
             "engagement_metrics": self.engagement_metrics,
@@ -66,6 +66,18 @@ class EnhancedNewsletterItem:
             "enhancement_cost": self.enhancement_cost,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "EnhancedNewsletterItem":
+        """Create from dictionary representation."""
+        return cls(
+            original_item=NewsletterItem.model_validate(data["original_item"]),
+            viral_headline=data["viral_headline"],
+            takeaway=data["takeaway"],
+            engagement_metrics=data.get("engagement_metrics", {}),
+            enhancement_method=data.get("enhancement_method", "ai"),
+            enhancement_cost=data.get("enhancement_cost", 0.0),
+        )
+
 
 @dataclass
 class CategoryMessage:
@@ -82,6 +94,27 @@ class CategoryMessage:
         """Calculate item count."""
         self.item_count = len(self.items)
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {
+            "category": self.category,
+            "emoji": self.emoji,
+            "title": self.title,
+            "items": [item.to_dict() for item in self.items],
+            "formatted_text": self.formatted_text,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CategoryMessage":
+        """Create from dictionary representation."""
+        return cls(
+            category=data["category"],
+            emoji=data["emoji"],
+            title=data["title"],
+            items=[EnhancedNewsletterItem.from_dict(item) for item in data["items"]],
+            formatted_text=data["formatted_text"],
+        )
+
 
 @dataclass
 class EnhancementMetrics:
@@ -92,6 +125,8 @@ class EnhancementMetrics:
     template_fallback: int = 0
     total_cost: float = 0.0
     total_time_seconds: float = 0.0
+    cache_hits: int = 0  # AI enhancements reused from a previous cycle (counted in ai_enhanced)
+    cache_misses: int = 0  # Items sent to the LLM
 
     @property
     def success_rate(self) -> float:
@@ -115,6 +150,8 @@ class EnhancementMetrics:
             "template_fallback": self.template_fallback,
             "total_cost": self.total_cost,
             "total_time_seconds": self.total_time_seconds,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
             "success_rate": self.success_rate,
             "avg_time_per_item": self.avg_time_per_item,
         }
@@ -55,7 +55,11 @@ class ContentEnhancer:
         logger.info("content_enhancer_initialized")
 
     async def enhance_newsletter(
-        self, items: list[NewsletterItem], date: str, max_items_per_category: int = 5
+        self,
+        items: list[NewsletterItem],
+        date: str,
+        max_items_per_category: int = 5,
+        cached: dict[str, tuple[str, str]] | None = None,
     ) -> tuple[list[CategoryMessage], EnhancementMetrics]:
         """
         Enhance newsletter items and format category messages.
@@ -64,6 +68,8 @@ class ContentEnhancer:
             items: List of NewsletterItem objects to enhance
             date: Newsletter date (e.g., "2026-02-17")
             max_items_per_category: Maximum items per category (default: 5)
+            cached: Earlier AI (headline, takeaway) pairs keyed by item URL; these
+                items skip the LLM calls
 
         Returns:
             Tuple of (list of CategoryMessage objects, EnhancementMetrics)
@@ -79,13 +85,22 @@ class ContentEnhancer:
         metrics = EnhancementMetrics(total_items=len(items))
         start_time = time.time()
 
-        # Step 1: Enhance each item sequentially
+        # Step 1: Enhance each item sequentially, reusing cached enhancements
+        cached = cached or {}
         enhanced_items = []
         for idx, item in enumerate(items, 1):
+            hit = cached.get(item.url)
+            if hit is not None:
+                enhanced_items.append(self._enhance_from_cache(item, *hit))
+                metrics.ai_enhanced += 1
+                metrics.cache_hits += 1
+                continue
+
             logger.debug("enhancing_item", item_num=idx, total=len(items), title=item.title[:50])
 
             enhanced_item = await self._enhance_single_item(item, metrics)
             enhanced_items.append(enhanced_item)
+            metrics.cache_misses += 1
 
         # Step 2: Group by category and take top items
         grouped_items = self._group_by_category(enhanced_items, max_items_per_category)
@@ -114,6 +129,7 @@ class ContentEnhancer:
             total_items=metrics.total_items,
             ai_enhanced=metrics.ai_enhanced,
             template_fallback=metrics.template_fallback,
+            cache_hits=metrics.cache_hits,
             success_rate=f"{metrics.success_rate:.1f}%",
             total_cost=f"${metrics.total_cost:.4f}",
             total_time=f"{metrics.total_time_seconds:.2f}s",
@@ -198,6 +214,29 @@ class ContentEnhancer:
             enhancement_cost=cost1 + cost2,
         )
 
+    def _enhance_from_cache(
+        self, item: NewsletterItem, headline: str, takeaway: str
+    ) -> EnhancedNewsletterItem:
+        """
+        Rebuild an AI enhancement from a cached headline and takeaway (no AI calls).
+
+        Args:
+            item: NewsletterItem being enhanced
+            headline: Cached AI headline
+            takeaway: Cached AI takeaway
+
+        Returns:
+            EnhancedNewsletterItem marked as AI-enhanced, at no cost
+        """
+        return EnhancedNewsletterItem(
+            original_item=item,
+            viral_headline=headline,
+            takeaway=takeaway,
+            engagement_metrics=self.engagement_enricher.enrich_metrics(item),
+            enhancement_method="ai",
+            enhancement_cost=0.0,
+        )
+
     def _enhance_with_template(self, item: NewsletterItem) -> EnhancedNewsletterItem:
         """
         Enhance item using templates (fallback, no AI calls).
@@ -7,7 +7,11 @@ from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from typing import Any
 
-from src.config.constants import MAX_ITEMS_PER_SOURCE, RESEARCH_TIME_WINDOW_HOURS
+from src.config.constants import (
+    MAX_ITEMS_PER_SOURCE,
+    MIN_RELEVANCE_SCORE,
+    RESEARCH_TIME_WINDOW_HOURS,
+)
 from src.utils.logger import get_logger
 
 logger = get_logger("researcher")
@@ -92,17 +96,27 @@ class BaseResearcher(ABC):
     4. Return top N items
     """
 
-    def __init__(self, source_name: str, max_items: int = MAX_ITEMS_PER_SOURCE):
+    def __init__(
+        self,
+        source_name: str,
+        max_items: int = MAX_ITEMS_PER_SOURCE,
+        min_score: int = MIN_RELEVANCE_SCORE,
+    ):
         """
         Initialize base researcher.
 
         Args:
             source_name: Name of the content source
             max_items: Maximum items to return
+            min_score: Items scoring below this are dropped during fetch (matches the
+                pipeline threshold, so they never reach it)
         """
         self.source_name = source_name
         self.max_items = max_items
+        self.min_score = min_score
         self.logger = get_logger(f"researcher.{source_name}")
+        # Caller-supplied lower bound on published_date, applied while parsing
+        self.since: datetime | None = None
 
     @abstractmethod
     async def fetch_content(self) -> list[ContentItem]:
@@ -130,15 +144,34 @@ class BaseResearcher(ABC):
         """
         pass
 
-    async def research(self) -> list[ContentItem]:
+    def cache_key(self) -> tuple[Any, ...]:
+        """
+        Identify the upstream request this researcher makes.
+
+        Two researchers with equal keys fetch the same endpoint with the same
+        parameters, so a single research() call serves both. Subclasses whose
+        endpoint depends on instance state should extend the key.
+
+        Returns:
+            Hashable tuple of (class, source, max_items, min_score)
+        """
+        return (type(self).__name__, self.source_name, self.max_items, self.min_score)
+
+    async def research(self, since: datetime | None = None) -> list[ContentItem]:
         """
         Main research method.
         Fetches content, scores relevance, and returns top items.
 
+        Args:
+            since: Optional publication cutoff. Older items are dropped while parsing,
+                so they are never scored or allowed to take a top-N slot.
+
         Returns:
             List of top ContentItem objects sorted by relevance
         """
         self.logger.info("starting_research", source=self.source_name)
+        # Scoped to this call; reset in finally so it never narrows a later one
+        self.since = since
 
         try:
             # Fetch all content
@@ -167,12 +200,18 @@ class BaseResearcher(ABC):
             )
             raise
 
+        finally:
+            self.since = None
+
     def is_within_time_window(
         self, published_date: datetime, hours: int = RESEARCH_TIME_WINDOW_HOURS
     ) -> bool:
         """
         Check if content is within the research time window.
 
+        The window is narrowed to ``self.since`` when the caller passed a later
+        cutoff to research().
+
         Args:
             published_date: When content was published
             hours: Time window in hours
@@ -181,6 +220,8 @@ class BaseResearcher(ABC):
             True if within window, False otherwise
         """
         cutoff = datetime.now() - timedelta(hours=hours)
+        if self.since is not None and self.since > cutoff:
+            cutoff = self.since
         return published_date >= cutoff
 
     def normalize_url(self, url: str) -> str:
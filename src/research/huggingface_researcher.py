@@ -53,7 +53,7 @@ class HuggingFaceResearcher(BaseResearcher):
                     relevance_score = self.score_relevance(item_data)
 
                     # Skip low-relevance items
-                    if relevance_score < 5:
+                    if relevance_score < self.min_score:
                         continue
 
                     # Create ContentItem
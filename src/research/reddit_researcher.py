@@ -55,7 +55,7 @@ class RedditResearcher(BaseResearcher):
                     relevance_score = self.score_relevance(item_data)
 
                     # Skip low-relevance items (filters out memes/jokes)
-                    if relevance_score < 5:
+                    if relevance_score < self.min_score:
                         continue
 
                     # Determine category from flair
@@ -55,7 +55,7 @@ class TechCrunchResearcher(BaseResearcher):
                     relevance_score = self.score_relevance(item_data)
 
                     # Skip low-relevance items
-                    if relevance_score < 5:
+                    if relevance_score < self.min_score:
                         continue
 
                     # Detect category from content
@@ -99,7 +99,7 @@ _CLAUDE_TOOLS: list[dict] = [
         "name": "run_shell",
         "description": (
             "Run an allowed shell command in the repository directory. "
-            f"Allowed commands: {settings.pa_allowed_commands}"
+            f"Allowed commands: {', '.join(sorted(settings.pa_allowed_commands))}"
         ),
         "input_schema": {
             "type": "object",
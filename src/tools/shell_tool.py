@@ -86,7 +86,7 @@ class ShellTool:
         if command not in settings.pa_allowed_commands:
             raise PermissionError(
                 f"Command {command!r} is not in the allowed list. "
-                f"Allowed: {settings.pa_allowed_commands}"
+                f"Allowed: {', '.join(sorted(settings.pa_allowed_commands))}"
             )
         argv = [command, *(args or [])]
         cwd_str = cwd or str(settings.pa_working_dir)
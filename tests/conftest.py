@@ -44,7 +44,7 @@ async def state_manager(temp_dir):
     manager = StateManager(db_path=db_path)
     await manager.init_db()
     yield manager
-    # Cleanup happens automatically with temp_dir
+    await manager.close()
 
 
 @pytest.fixture
@@ -32,6 +32,7 @@ async def temp_database():
     yield state_manager
 
     # Cleanup
+    await state_manager.close()
     db_path.unlink(missing_ok=True)
 
 
@@ -98,6 +98,29 @@ async def test_enhance_newsletter_all_ai_success(
         assert msg.item_count == len(msg.items)
 
 
+@pytest.mark.asyncio
+async def test_enhance_newsletter_reuses_cached_items(
+    content_enhancer, sample_newsletter_items, mock_enhancers
+):
+    """Test that cached items skip the AI calls and cost nothing."""
+    cached_item = sample_newsletter_items[0]
+    cached = {cached_item.url: ("cached headline", "cached takeaway")}
+
+    category_messages, metrics = await content_enhancer.enhance_newsletter(
+        items=sample_newsletter_items, date="2026-02-17", cached=cached
+    )
+
+    assert metrics.cache_hits == 1
+    assert metrics.cache_misses == 2
+    assert metrics.ai_enhanced == 3
+    enhanced = {item.url: item for msg in category_messages for item in msg.items}
+    reused = enhanced[cached_item.url]
+    assert reused.viral_headline == "cached headline"
+    assert reused.takeaway == "cached takeaway"
+    assert reused.enhancement_method == "ai"
+    assert reused.enhancement_cost == 0.0
+
+
 @pytest.mark.asyncio
 async def test_enhance_newsletter_partial_failure(
     content_enhancer, sample_newsletter_items, monkeypatch
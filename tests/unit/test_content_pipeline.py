@@ -8,8 +8,10 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.config.constants import MIN_RELEVANCE_SCORE, RESEARCH_TIME_WINDOW_HOURS
-from src.core.content_pipeline import ContentPipeline
+from src.config.constants import MIN_RELEVANCE_SCORE, MODEL_COSTS, RESEARCH_TIME_WINDOW_HOURS
+from src.config.settings import settings
+from src.core.content_pipeline import _SUMMARY_SYSTEM_PROMPT, ContentPipeline
+from src.core.state_manager import StateManager
 from src.models.newsletter import NewsletterItem
 from src.research.base import ContentItem
 
@@ -19,6 +21,7 @@ def mock_state_manager():
     """Create mock StateManager."""
     manager = MagicMock()
     manager.check_duplicate = AsyncMock(return_value=False)
+    manager.check_duplicates_bulk = AsyncMock(return_value=set())
     manager.track_api_usage = AsyncMock()
     return manager
 
@@ -99,13 +102,19 @@ class TestDeduplication:
         ]
 
         # Mock: first item is unique, second is duplicate
-        mock_state_manager.check_duplicate.side_effect = [False, True]
+        mock_state_manager.check_duplicates_bulk.return_value = {
+            StateManager.generate_content_id("https://example.com/2", "Duplicate Item")
+        }
 
         result = await pipeline.deduplicate(items)
 
         assert len(result) == 1
         assert result[0].title == "Unique Item"
-        assert mock_state_manager.check_duplicate.call_count == 2
+        # One batched lookup instead of a round trip per item
+        mock_state_manager.check_duplicates_bulk.assert_awaited_once_with(
+            [("https://example.com/1", "Unique Item"), ("https://example.com/2", "Duplicate Item")]
+        )
+        mock_state_manager.check_duplicate.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_deduplicate_continues_on_error(self, pipeline, mock_state_manager):
@@ -121,8 +130,8 @@ class TestDeduplication:
             ),
         ]
 
-        # Mock: check_duplicate raises exception
-        mock_state_manager.check_duplicate.side_effect = Exception("Database error")
+        # Mock: bulk check raises exception
+        mock_state_manager.check_duplicates_bulk.side_effect = Exception("Database error")
 
         result = await pipeline.deduplicate(items)
 
@@ -130,6 +139,12 @@ class TestDeduplication:
         assert len(result) == 1
         assert result[0].title == "Item 1"
 
+    @pytest.mark.asyncio
+    async def test_deduplicate_empty_skips_lookup(self, pipeline, mock_state_manager):
+        """Test that an empty batch never touches the database."""
+        assert await pipeline.deduplicate([]) == []
+        mock_state_manager.check_duplicates_bulk.assert_not_called()
+
 
 class TestRelevanceFiltering:
     """Test relevance score filtering."""
@@ -193,6 +208,25 @@ class TestTimeFiltering:
         assert len(result) == 1
         assert result[0].title == "Very Recent"
 
+    def test_filter_by_time_uses_reference_now(self, pipeline):
+        """Test that the cutoff is taken from the supplied reference time."""
+        published = datetime(2026, 2, 15, 10, 0)
+        items = [
+            ContentItem(
+                title="Fixed Date",
+                url="https://example.com/1",
+                source="arxiv",
+                category="research",
+                relevance_score=7,
+                summary="Test",
+                published_date=published,
+            ),
+        ]
+
+        assert pipeline.filter_by_time(items, hours=1, now=published + timedelta(minutes=30))
+        assert not pipeline.filter_by_time(items, hours=1, now=published + timedelta(hours=2))
+        assert not pipeline.filter_and_convert(items, hours=1, now=published + timedelta(hours=2))
+
     def test_filter_by_time_none_published_date(self, pipeline):
         """Test filtering when published_date is None."""
         # Note: ContentItem sets published_date to datetime.now() if None
@@ -284,6 +318,33 @@ class TestConversion:
             assert len(result) == 1
 
 
+class TestFilterAndConvert:
+    """Test the fused filter + conversion pass."""
+
+    def test_matches_separate_stages(self, pipeline, sample_content_items):
+        """Test that the fused pass keeps the same items as the three stages."""
+        staged = pipeline.convert_to_newsletter_items(
+            pipeline.filter_by_time(pipeline.filter_by_relevance(sample_content_items))
+        )
+
+        fused = pipeline.filter_and_convert(sample_content_items)
+
+        assert [item.title for item in fused] == [item.title for item in staged]
+        assert [item.title for item in fused] == ["Novel LLM Architecture", "Another Good Paper"]
+        assert all(isinstance(item, NewsletterItem) for item in fused)
+
+    def test_empty_list(self, pipeline):
+        """Test fused pass on empty input."""
+        assert pipeline.filter_and_convert([]) == []
+
+    def test_logs_rejection_counts_once(self, pipeline, sample_content_items):
+        """Test that rejections are logged as one line of counts, not one per item."""
+        with patch("src.core.content_pipeline.logger") as mock_logger:
+            pipeline.filter_and_convert(sample_content_items)
+
+        mock_logger.debug.assert_called_once_with("items_filtered", low_relevance=1, too_old=1)
+
+
 class TestSummaryGeneration:
     """Test newsletter summary generation."""
 
@@ -315,12 +376,24 @@ class TestSummaryGeneration:
 
         result = await pipeline.generate_summary(items, "2026-02-15-10")
 
-        # Verify Claude was called
+        # Verify Claude was called with the lightweight summary model
         assert mock_client.messages.create.called
+        call_kwargs = mock_client.messages.create.call_args.kwargs
+        assert call_kwargs["model"] == settings.anthropic_summary_model
         assert "Today's AI highlights" in result
 
-        # Verify API usage was tracked
-        assert mock_state_manager.track_api_usage.called
+        # Instructions are a static system prompt; only the item list varies
+        assert call_kwargs["system"] == _SUMMARY_SYSTEM_PROMPT
+        user_prompt = call_kwargs["messages"][0]["content"]
+        assert "Newsletter Date: 2026-02-15-10" in user_prompt
+        assert "**Test Paper** (research)" in user_prompt
+
+        # Verify API usage was tracked at the summary model's rates
+        costs = MODEL_COSTS[settings.anthropic_summary_model]
+        expected_cost = (500 * costs["input"] + 50 * costs["output"]) / 1000
+        usage = mock_state_manager.track_api_usage.call_args.kwargs
+        assert usage["token_count"] == 550
+        assert usage["estimated_cost"] == pytest.approx(expected_cost)
 
     @pytest.mark.asyncio
     async def test_generate_summary_warning_for_low_count(self, pipeline):
@@ -368,6 +441,51 @@ class TestSummaryGeneration:
         # Should use fallback
         assert "highlight" in result.lower()
 
+    @pytest.mark.asyncio
+    async def test_generate_summary_fallback_on_empty_response(self, pipeline):
+        """Test fallback summary when Claude returns no content blocks."""
+        items = [
+            NewsletterItem(
+                title="Test Paper",
+                url="https://example.com/1",
+                source="arxiv",
+                category="research",
+                relevance_score=8,
+                summary="Test",
+            ),
+        ]
+
+        mock_message = MagicMock()
+        mock_message.content = []
+        mock_client = AsyncMock()
+        mock_client.messages.create = AsyncMock(return_value=mock_message)
+        pipeline.client = mock_client
+
+        result = await pipeline.generate_summary(items, "2026-02-15-10")
+
+        assert "Today's highlight: Test Paper from arxiv." in result
+
+    def test_fallback_summary_lists_categories_in_first_seen_order(self, pipeline):
+        """Test that the fallback summary is deterministic."""
+        items = [
+            NewsletterItem(
+                title=f"Item {i}",
+                url=f"https://example.com/{i}",
+                source=source,
+                category=category,
+                relevance_score=8,
+                summary="Test",
+            )
+            for i, (category, source) in enumerate(
+                [("research", "arxiv"), ("product", "techcrunch"), ("research", "huggingface")]
+            )
+        ]
+
+        assert pipeline._generate_fallback_summary(items) == (
+            "Today's AI highlights include 3 items across 2 categories "
+            "(research, product) from arxiv, techcrunch, huggingface."
+        )
+
     @pytest.mark.asyncio
     async def test_generate_summary_empty_items(self, pipeline):
         """Test summary generation with no items."""
@@ -0,0 +1,123 @@
+"""
+Unit tests for MasterAgent supervision.
+
+Agents are replaced with small async factories so no real sub-agents start.
+"""
+
+import asyncio
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core.master_agent import (
+    _AGENT_MODULES,
+    _INITIAL_RESTART_DELAY,
+    _MAX_RESTART_DELAY,
+    MasterAgent,
+    _preload_agent_modules,
+)
+
+
+def _make_master() -> MasterAgent:
+    # Skip __init__: supervision does not touch the state or memory stores
+    master = MasterAgent.__new__(MasterAgent)
+    master._stop = asyncio.Event()
+    master._stop_callbacks = []
+    master._agent_tasks = []
+    return master
+
+
+def _record_backoff(delays: list[float]):
+    """Stand-in for asyncio.wait_for that records the backoff and times out."""
+
+    async def fake_wait_for(awaitable, timeout):
+        awaitable.close()
+        delays.append(timeout)
+        raise asyncio.TimeoutError
+
+    return fake_wait_for
+
+
+class TestSupervise:
+    async def test_returns_when_agent_finishes(self):
+        factory = AsyncMock(return_value=None)
+
+        await _make_master()._supervise("agent", factory)
+
+        factory.assert_awaited_once()
+
+    async def test_restarts_crashed_agent_with_backoff(self):
+        factory = AsyncMock(side_effect=[RuntimeError("boom"), RuntimeError("boom"), None])
+        delays: list[float] = []
+
+        with patch("src.core.master_agent.asyncio.wait_for", new=_record_backoff(delays)):
+            await _make_master()._supervise("agent", factory)
+
+        assert factory.await_count == 3
+        assert delays == [_INITIAL_RESTART_DELAY, _INITIAL_RESTART_DELAY * 2]
+
+    async def test_backoff_is_capped(self):
+        crashes = [RuntimeError("boom")] * 10
+        factory = AsyncMock(side_effect=[*crashes, None])
+        delays: list[float] = []
+
+        with patch("src.core.master_agent.asyncio.wait_for", new=_record_backoff(delays)):
+            await _make_master()._supervise("agent", factory)
+
+        assert max(delays) == _MAX_RESTART_DELAY
+
+    async def test_cancellation_is_not_swallowed(self):
+        factory = AsyncMock(side_effect=asyncio.CancelledError)
+
+        with pytest.raises(asyncio.CancelledError):
+            await _make_master()._supervise("agent", factory)
+
+    async def test_no_restart_after_shutdown(self):
+        master = _make_master()
+
+        async def crash_during_shutdown():
+            master._stop.set()
+            raise RuntimeError("boom")
+
+        factory = AsyncMock(side_effect=crash_during_shutdown)
+
+        await asyncio.wait_for(master._supervise("agent", factory), timeout=1)
+
+        factory.assert_awaited_once()
+
+
+class TestShutdownSignal:
+    def test_first_signal_sets_stop_and_runs_callbacks(self):
+        master = _make_master()
+        callback = MagicMock()
+        task = MagicMock()
+        master._stop_callbacks.append(callback)
+        master._agent_tasks.append(task)
+
+        master._handle_shutdown_signal()
+
+        assert master._stop.is_set()
+        callback.assert_called_once()
+        task.cancel.assert_not_called()
+
+    def test_second_signal_cancels_agent_tasks(self):
+        master = _make_master()
+        task = MagicMock()
+        master._agent_tasks.append(task)
+
+        master._handle_shutdown_signal()
+        master._handle_shutdown_signal()
+
+        task.cancel.assert_called_once()
+
+
+class TestPreloadAgentModules:
+    def test_imports_agent_modules(self):
+        _preload_agent_modules()
+
+        assert all(module in sys.modules for module in _AGENT_MODULES)
+
+    def test_missing_module_is_ignored(self):
+        with patch("src.core.master_agent._AGENT_MODULES", ("src.agents.does_not_exist",)):
+            _preload_agent_modules()
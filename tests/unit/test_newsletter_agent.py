@@ -6,13 +6,18 @@ Mocks StateManager and Orchestrator so no real API calls are made.
 
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiosqlite
+
 from src.agents.newsletter_agent import (
     NEWSLETTER_INTERVAL_MINUTES,
     NewsletterAgent,
     NewsletterEvent,
 )
-from src.core.orchestrator import CycleResult
+from src.core.orchestrator import CycleResult, Orchestrator
+from src.core.state_manager import StateManager
+from src.models.newsletter import Newsletter, NewsletterItem
 from src.publishing.base import PublishResult
+from src.research.base import ContentItem
 
 
 def _make_state_manager(minutes_since: float) -> MagicMock:
@@ -97,6 +102,7 @@ class TestAct:
         mock_result = _make_cycle_result(success=True)
         mock_orchestrator = MagicMock()
         mock_orchestrator.run_cycle = AsyncMock(return_value=mock_result)
+        mock_orchestrator.aclose = AsyncMock()
 
         with (
             patch.object(agent, "_build_orchestrator", return_value=mock_orchestrator),
@@ -109,6 +115,66 @@ class TestAct:
         assert len(results) == 1
         assert results[0].success is True
         mock_orchestrator.run_cycle.assert_awaited_once_with(mode="production")
+        mock_orchestrator.aclose.assert_awaited_once()
+
+    async def test_publishing_rows_survive_shutdown_after_act(self, tmp_path):
+        sm = StateManager(db_path=tmp_path / "state.db")
+        await sm.init_db()
+        agent = NewsletterAgent(state_manager=sm)
+
+        item = ContentItem(
+            title="Paper 1",
+            url="https://arxiv.org/1",
+            source="arxiv",
+            category="research",
+            relevance_score=8,
+            summary="Test 1",
+        )
+        researcher = MagicMock(source_name="arxiv", research=AsyncMock(return_value=[item]))
+        publisher = MagicMock(spec=["platform_name", "publish_newsletter"])
+        publisher.platform_name = "markdown"
+        publisher.publish_newsletter = AsyncMock(
+            return_value=PublishResult(platform="markdown", success=True)
+        )
+        pipeline = MagicMock()
+        pipeline.process = AsyncMock(
+            return_value=Newsletter(
+                date="2026-02-15-10",
+                items=[
+                    NewsletterItem(
+                        title=item.title,
+                        url=item.url,
+                        source=item.source,
+                        category=item.category,
+                        relevance_score=item.relevance_score,
+                        summary=item.summary,
+                    )
+                ],
+                summary="Highlights",
+                item_count=1,
+            )
+        )
+        orchestrator = Orchestrator(
+            state_manager=sm, researchers=[researcher], publishers=[publisher], pipeline=pipeline
+        )
+        orchestrator.enhancer = None
+
+        with (
+            patch.object(agent, "_build_orchestrator", return_value=orchestrator),
+            patch("src.agents.newsletter_agent.settings") as mock_settings,
+        ):
+            mock_settings.validate_production_config.return_value = True
+            await agent.act([NewsletterEvent(triggered_by="schedule", minutes_since_last=60.0)])
+        # What MasterAgent does once its agents return on SIGTERM
+        await sm.close()
+
+        async with aiosqlite.connect(sm.db_path) as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM newsletters")
+            assert (await cursor.fetchone())[0] == 1
+            cursor = await db.execute("SELECT COUNT(*) FROM published_items")
+            assert (await cursor.fetchone())[0] == 1
+            cursor = await db.execute("SELECT COUNT(*) FROM content_fingerprints")
+            assert (await cursor.fetchone())[0] == 1
 
     async def test_skips_cycle_when_config_invalid(self):
         sm = _make_state_manager(60.0)
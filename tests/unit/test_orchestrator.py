@@ -3,11 +3,17 @@ Unit tests for Orchestrator.
 Tests phase coordination and error handling.
 """
 
-from unittest.mock import AsyncMock, MagicMock
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from src.config.constants import RESEARCH_TIME_WINDOW_HOURS
+from src.config.settings import settings
 from src.core.orchestrator import CycleResult, Orchestrator
+from src.core.state_manager import StateManager
+from src.models.enhanced_newsletter import EnhancementMetrics
 from src.models.newsletter import Newsletter, NewsletterItem
 from src.publishing.base import PublishResult
 from src.research.base import ContentItem
@@ -20,9 +26,15 @@ def mock_state_manager():
     manager.init_db = AsyncMock()
     manager.create_newsletter_record = AsyncMock(return_value=123)
     manager.store_content = AsyncMock()
+    manager.store_content_bulk = AsyncMock()
     manager.log_publishing_attempt = AsyncMock()
+    manager.log_publishing_attempts_bulk = AsyncMock()
     manager.get_metrics = AsyncMock(return_value={"total_cost": 0.015})
     manager.track_api_usage = AsyncMock()
+    manager.get_cached_enhancement = AsyncMock(return_value=None)
+    manager.store_cached_enhancement = AsyncMock()
+    manager.get_enhanced_items = AsyncMock(return_value={})
+    manager.store_enhanced_items = AsyncMock()
     return manager
 
 
@@ -148,6 +160,17 @@ class TestResearchPhase:
         for researcher in mock_researchers:
             researcher.research.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_research_phase_pushes_down_time_cutoff(self, orchestrator, mock_researchers):
+        """Test that researchers receive the pipeline's time window as a cutoff."""
+        before = datetime.now() - timedelta(hours=RESEARCH_TIME_WINDOW_HOURS)
+
+        await orchestrator.research_phase()
+
+        for researcher in mock_researchers:
+            since = researcher.research.call_args.kwargs["since"]
+            assert before <= since <= datetime.now()
+
     @pytest.mark.asyncio
     async def test_research_phase_handles_failures(self, orchestrator, mock_researchers):
         """Test that research continues if one researcher fails."""
@@ -171,6 +194,54 @@ class TestResearchPhase:
 
         assert len(items) == 0
 
+    @pytest.mark.asyncio
+    async def test_research_phase_calls_identical_researchers_once(
+        self, orchestrator, mock_researchers
+    ):
+        """Test that researchers with the same cache key share one call."""
+        duplicate = MagicMock()
+        duplicate.source_name = "arxiv"
+        duplicate.research = AsyncMock(return_value=[])
+        duplicate.cache_key.return_value = mock_researchers[0].cache_key()
+        orchestrator.researchers = [*mock_researchers, duplicate]
+
+        items = await orchestrator.research_phase()
+
+        duplicate.research.assert_not_called()
+        mock_researchers[0].research.assert_awaited_once()
+        assert len(items) == 3
+
+    @pytest.mark.asyncio
+    async def test_research_phase_single_researcher_failure(
+        self, mock_state_manager, mock_researchers, mock_publishers, mock_pipeline
+    ):
+        """Test that a lone failing researcher is contained like in the parallel path."""
+        mock_researchers[0].research.side_effect = Exception("ArXiv down")
+        orchestrator = Orchestrator(
+            state_manager=mock_state_manager,
+            researchers=mock_researchers[:1],
+            publishers=mock_publishers,
+            pipeline=mock_pipeline,
+        )
+
+        items = await orchestrator.research_phase()
+
+        assert items == []
+
+    @pytest.mark.asyncio
+    async def test_research_phase_no_researchers(
+        self, mock_state_manager, mock_publishers, mock_pipeline
+    ):
+        """Test research with no researchers configured."""
+        orchestrator = Orchestrator(
+            state_manager=mock_state_manager,
+            researchers=[],
+            publishers=mock_publishers,
+            pipeline=mock_pipeline,
+        )
+
+        assert await orchestrator.research_phase() == []
+
 
 class TestFilterPhase:
     """Test filter phase execution."""
@@ -198,6 +269,153 @@ class TestFilterPhase:
         assert newsletter.item_count >= 0
         assert newsletter.date  # Should have a date
 
+    @pytest.mark.asyncio
+    async def test_filter_phase_uses_cycle_time(self, orchestrator, mock_pipeline):
+        """Test that the newsletter date and pipeline cutoff come from the given time."""
+        now = datetime(2026, 3, 7, 9, 30)
+
+        await orchestrator.filter_phase([], now=now)
+
+        mock_pipeline.process.assert_called_once_with([], "2026-03-07-09", now=now)
+
+
+class TestEnhancePhase:
+    """Test enhancement phase caching."""
+
+    @pytest.fixture
+    def enhancer(self, orchestrator, sample_category_messages):
+        enhancer = MagicMock()
+        enhancer.enhance_newsletter = AsyncMock(
+            return_value=(
+                sample_category_messages,
+                EnhancementMetrics(total_items=3, ai_enhanced=3, total_cost=0.03),
+            )
+        )
+        orchestrator.enhancer = enhancer
+        return enhancer
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_enhances_and_stores(
+        self, orchestrator, enhancer, mock_state_manager, sample_newsletter
+    ):
+        """Test that a miss calls the enhancer and caches its output."""
+        messages, metrics = await orchestrator.enhance_phase(sample_newsletter)
+
+        enhancer.enhance_newsletter.assert_awaited_once()
+        mock_state_manager.store_cached_enhancement.assert_awaited_once()
+        assert metrics.total_cost == 0.03
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_enhancer(
+        self, orchestrator, enhancer, mock_state_manager, sample_newsletter
+    ):
+        """Test that a hit rebuilds the stored messages without calling the enhancer."""
+        expected, _ = await orchestrator.enhance_phase(sample_newsletter)
+        payload = mock_state_manager.store_cached_enhancement.call_args.args[1]
+        mock_state_manager.get_cached_enhancement.return_value = payload
+        enhancer.enhance_newsletter.reset_mock()
+        mock_state_manager.track_api_usage.reset_mock()
+
+        messages, metrics = await orchestrator.enhance_phase(sample_newsletter)
+
+        enhancer.enhance_newsletter.assert_not_called()
+        mock_state_manager.track_api_usage.assert_not_called()
+        assert [m.formatted_text for m in messages] == [m.formatted_text for m in expected]
+        assert [i.url for i in messages[0].items] == [i.url for i in expected[0].items]
+        assert metrics.ai_enhanced == 3
+        assert metrics.total_cost == 0.0
+
+    @pytest.mark.asyncio
+    async def test_cached_items_passed_to_enhancer(
+        self, orchestrator, enhancer, mock_state_manager, sample_newsletter
+    ):
+        """Test that per-item cache hits reach the enhancer keyed by URL."""
+        item = sample_newsletter.items[0]
+        content_id = StateManager.generate_content_id(item.url, item.title)
+        mock_state_manager.get_enhanced_items.return_value = {content_id: ("h", "t")}
+
+        await orchestrator.enhance_phase(sample_newsletter)
+
+        kwargs = enhancer.enhance_newsletter.call_args.kwargs
+        assert kwargs["cached"] == {item.url: ("h", "t")}
+
+    @pytest.mark.asyncio
+    async def test_fresh_ai_items_are_stored(
+        self, orchestrator, enhancer, mock_state_manager, sample_newsletter
+    ):
+        """Test that newly AI-enhanced items are written to the per-item cache."""
+        messages, _ = await orchestrator.enhance_phase(sample_newsletter)
+
+        rows = mock_state_manager.store_enhanced_items.call_args.args[0]
+        expected = [
+            StateManager.generate_content_id(item.url, item.original_item.title)
+            for message in messages
+            for item in message.items
+            if item.enhancement_method == "ai"
+        ]
+        assert [row[0] for row in rows] == expected
+
+    @pytest.mark.asyncio
+    async def test_cost_tracking_does_not_block(
+        self, orchestrator, enhancer, mock_state_manager, sample_newsletter
+    ):
+        """Test that enhance_phase returns before the usage write completes."""
+        release = asyncio.Event()
+
+        async def slow_track(**kwargs):
+            await release.wait()
+
+        mock_state_manager.track_api_usage.side_effect = slow_track
+
+        await orchestrator.enhance_phase(sample_newsletter)
+
+        assert len(orchestrator._pending_usage) == 1
+        release.set()
+        await orchestrator.aclose()
+        assert not orchestrator._pending_usage
+
+    @pytest.mark.asyncio
+    async def test_cost_tracking_failure_is_logged_not_raised(
+        self, orchestrator, enhancer, mock_state_manager, sample_newsletter
+    ):
+        """Test that a failed usage write does not surface from aclose."""
+        mock_state_manager.track_api_usage.side_effect = Exception("db locked")
+
+        await orchestrator.enhance_phase(sample_newsletter)
+        await orchestrator.aclose()
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_bypasses_cache(
+        self, orchestrator, enhancer, mock_state_manager, sample_newsletter, monkeypatch
+    ):
+        """Test that force_refresh neither reads nor writes the cache."""
+        monkeypatch.setattr(settings, "force_refresh", True)
+
+        await orchestrator.enhance_phase(sample_newsletter)
+
+        mock_state_manager.get_cached_enhancement.assert_not_called()
+        mock_state_manager.store_cached_enhancement.assert_not_called()
+        enhancer.enhance_newsletter.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cache_lookup_failure_falls_through(
+        self, orchestrator, enhancer, mock_state_manager, sample_newsletter
+    ):
+        """Test that a broken cache lookup still enhances normally."""
+        mock_state_manager.get_cached_enhancement.side_effect = Exception("db locked")
+
+        await orchestrator.enhance_phase(sample_newsletter)
+
+        enhancer.enhance_newsletter.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_without_enhancer_raises(self, orchestrator, sample_newsletter):
+        """Test that a miss with enhancement disabled fails loudly."""
+        orchestrator.enhancer = None
+
+        with pytest.raises(RuntimeError, match="enhancement is disabled"):
+            await orchestrator.enhance_phase(sample_newsletter)
+
 
 class TestPublishPhase:
     """Test publish phase execution."""
@@ -249,6 +467,59 @@ class TestPublishPhase:
         assert results[0].error == "Network error"
         assert results[1].success is True
 
+    @pytest.mark.asyncio
+    async def test_publish_phase_converts_enhanced_content_once(
+        self, mock_state_manager, mock_publishers, mock_pipeline, sample_category_messages
+    ):
+        """Test that publishers without enhanced support share one converted newsletter."""
+        for publisher in mock_publishers:
+            del publisher.publish_enhanced
+        orchestrator = Orchestrator(
+            state_manager=mock_state_manager,
+            researchers=[],
+            publishers=mock_publishers,
+            pipeline=mock_pipeline,
+        )
+
+        with patch.object(
+            orchestrator, "_category_to_newsletter", wraps=orchestrator._category_to_newsletter
+        ) as convert:
+            await orchestrator.publish_phase(sample_category_messages)
+
+        convert.assert_called_once_with(sample_category_messages)
+        sent = [p.publish_newsletter.call_args.args[0] for p in mock_publishers]
+        assert sent[0] is sent[1]
+
+    @pytest.mark.asyncio
+    async def test_publish_phase_routes_enhanced_content_by_capability(
+        self, mock_state_manager, mock_publishers, mock_pipeline, sample_category_messages
+    ):
+        """Test that only publishers with publish_enhanced receive CategoryMessages."""
+        del mock_publishers[1].publish_enhanced
+        orchestrator = Orchestrator(
+            state_manager=mock_state_manager,
+            researchers=[],
+            publishers=mock_publishers,
+            pipeline=mock_pipeline,
+        )
+
+        await orchestrator.publish_phase(sample_category_messages)
+
+        mock_publishers[0].publish_enhanced.assert_awaited_once_with(sample_category_messages)
+        mock_publishers[0].publish_newsletter.assert_not_called()
+        mock_publishers[1].publish_newsletter.assert_awaited_once()
+
+    def test_category_to_newsletter_flattens_in_order(self, orchestrator, sample_category_messages):
+        """Test that category items are flattened in order and dated by the first item."""
+        expected = [item.original_item for msg in sample_category_messages for item in msg.items]
+        expected[0].published_date = datetime(2026, 3, 7, 9, 30)
+
+        newsletter = orchestrator._category_to_newsletter(sample_category_messages)
+
+        assert newsletter.items == expected
+        assert newsletter.item_count == len(expected)
+        assert newsletter.date == "2026-03-07-09"
+
     @pytest.mark.asyncio
     async def test_publish_phase_no_publishers(self, mock_state_manager, mock_pipeline):
         """Test publishing with no publishers configured."""
@@ -266,6 +537,27 @@ class TestPublishPhase:
         # Should return empty list
         assert results == []
 
+    @pytest.mark.asyncio
+    async def test_publish_phase_single_publisher_crash(
+        self, mock_state_manager, mock_publishers, mock_pipeline
+    ):
+        """Test that a lone crashing publisher still yields a failed PublishResult."""
+        mock_publishers[0].publish_newsletter.side_effect = Exception("Network error")
+        orchestrator = Orchestrator(
+            state_manager=mock_state_manager,
+            researchers=[],
+            publishers=mock_publishers[:1],
+            pipeline=mock_pipeline,
+        )
+        newsletter = Newsletter(date="2026-02-15-10", items=[], summary="Test", item_count=0)
+
+        results = await orchestrator.publish_phase(newsletter)
+
+        assert len(results) == 1
+        assert results[0].platform == "discord"
+        assert results[0].success is False
+        assert results[0].error == "Network error"
+
 
 class TestRecordPhase:
     """Test record phase execution."""
@@ -299,11 +591,18 @@ class TestRecordPhase:
         # Verify newsletter record created
         mock_state_manager.create_newsletter_record.assert_called_once()
 
-        # Verify items stored
-        assert mock_state_manager.store_content.call_count == 1
+        # Verify items stored in a single batch
+        mock_state_manager.store_content_bulk.assert_awaited_once()
+        rows = mock_state_manager.store_content_bulk.call_args.args[0]
+        assert rows == [
+            ("https://arxiv.org/1", "Paper 1", "arxiv", "research", {}, "2026-02-15-10")
+        ]
+        mock_state_manager.store_content.assert_not_called()
 
-        # Verify publishing attempts logged
-        assert mock_state_manager.log_publishing_attempt.call_count == 2
+        # Verify publishing attempts logged in one call
+        mock_state_manager.log_publishing_attempts_bulk.assert_awaited_once_with(
+            123, [("discord", "success", None, 1), ("markdown", "success", None, 1)]
+        )
 
     @pytest.mark.asyncio
     async def test_record_phase_continues_on_item_error(self, orchestrator, mock_state_manager):
@@ -332,7 +631,8 @@ class TestRecordPhase:
             item_count=2,
         )
 
-        # Make first item storage fail
+        # Batch fails, then first item storage fails on the per-item retry
+        mock_state_manager.store_content_bulk.side_effect = Exception("UNIQUE constraint failed")
         mock_state_manager.store_content.side_effect = [
             Exception("Database error"),
             None,  # Second succeeds
@@ -345,6 +645,9 @@ class TestRecordPhase:
 
         # Should have attempted both
         assert mock_state_manager.store_content.call_count == 2
+        retried = mock_state_manager.store_content.call_args.args[0]
+        assert retried["url"] == "https://arxiv.org/2"
+        assert retried["newsletter_date"] == "2026-02-15-10"
 
     @pytest.mark.asyncio
     async def test_record_phase_handles_failure(self, orchestrator, mock_state_manager):
@@ -394,6 +697,41 @@ class TestRunCycle:
         # Should record
         mock_state_manager.create_newsletter_record.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_run_cycle_reads_cost_after_usage_tracking(
+        self, orchestrator, mock_state_manager
+    ):
+        """Test that total cost is read only after background usage writes land."""
+        calls = []
+
+        async def track(**kwargs):
+            await asyncio.sleep(0)
+            calls.append(kwargs["api_name"])
+
+        async def get_metrics():
+            calls.append("get_metrics")
+            return {"total_cost": 0.0}
+
+        mock_state_manager.track_api_usage.side_effect = track
+        mock_state_manager.get_metrics.side_effect = get_metrics
+        orchestrator.enhancer = MagicMock()
+        orchestrator.enhancer.enhance_newsletter = AsyncMock(
+            return_value=([], EnhancementMetrics(total_items=1))
+        )
+
+        await orchestrator.run_cycle(mode="test")
+
+        assert calls.index("content_enhancement") < calls.index("get_metrics")
+
+    @pytest.mark.asyncio
+    async def test_run_cycle_records_before_returning(self, orchestrator, mock_state_manager):
+        """Test that the database record has landed by the time run_cycle returns."""
+        result = await orchestrator.run_cycle(mode="production")
+
+        assert result.success is True
+        mock_state_manager.create_newsletter_record.assert_awaited_once()
+        mock_state_manager.log_publishing_attempts_bulk.assert_awaited()
+
     @pytest.mark.asyncio
     async def test_run_cycle_no_items_found(self, orchestrator, mock_researchers):
         """Test cycle when no items are found."""
@@ -409,6 +747,20 @@ class TestRunCycle:
         assert result.item_count == 0
         assert result.error == "No items found"
 
+    @pytest.mark.asyncio
+    async def test_run_cycle_below_min_items(self, orchestrator, monkeypatch):
+        """Test that a thin research batch skips filtering entirely."""
+        monkeypatch.setattr(settings, "min_items_for_cycle", 1000)
+        orchestrator.filter_phase = AsyncMock()
+
+        result = await orchestrator.run_cycle(mode="test")
+
+        assert result.success is True
+        assert result.newsletter is None
+        assert result.item_count > 0
+        assert result.error == "Below minimum item threshold"
+        orchestrator.filter_phase.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_run_cycle_handles_errors(self, orchestrator, mock_researchers):
         """Test that cycle handles errors gracefully."""
@@ -460,3 +812,17 @@ class TestCycleResult:
 
         # Should only include successful platforms
         assert result.platforms_published == ["discord", "markdown"]
+
+    def test_has_no_instance_dict(self):
+        """Test that CycleResult uses slots."""
+        result = CycleResult(
+            success=True,
+            newsletter=None,
+            item_count=0,
+            filtered_count=0,
+            publish_results=[],
+            total_cost=0.0,
+        )
+
+        assert not hasattr(result, "__dict__")
+        assert result.platforms_published == []
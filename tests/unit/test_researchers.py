@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import httpx
 import pytest
 
+from src.config.constants import MIN_RELEVANCE_SCORE
 from src.research.huggingface_researcher import HuggingFaceResearcher
 from src.research.techcrunch_researcher import TechCrunchResearcher
 from src.research.venturebeat_researcher import VentureBeatResearcher
@@ -196,6 +197,42 @@ class TestHuggingFaceResearcher:
             items = await r.fetch_content()
         assert len(items) == 0
 
+    @pytest.mark.asyncio
+    async def test_fetch_content_honours_min_score(self):
+        r = HuggingFaceResearcher()
+        assert r.min_score == MIN_RELEVANCE_SCORE
+        r.min_score = 11  # Above the 1-10 scale, so nothing can pass
+        papers = [_make_hf_paper(title="LLM transformer paper", num_comments=15)]
+        mock_client, _ = _httpx_mock(response_data=papers)
+        with patch("httpx.AsyncClient", return_value=mock_client):
+            items = await r.fetch_content()
+        assert items == []
+
+    @pytest.mark.asyncio
+    async def test_research_since_narrows_time_window(self):
+        r = HuggingFaceResearcher()
+        two_days_ago = (datetime.now() - timedelta(days=2)).isoformat() + "Z"
+        papers = [
+            _make_hf_paper(title="Fresh LLM paper", num_comments=15),
+            _make_hf_paper(title="Older LLM paper", paper_id="0002", published_at=two_days_ago),
+        ]
+        mock_client, _ = _httpx_mock(response_data=papers)
+        with patch("httpx.AsyncClient", return_value=mock_client):
+            items = await r.research(since=datetime.now() - timedelta(hours=24))
+        # The 2-day-old paper is inside HF's own 7-day window but not the caller's cutoff
+        assert [item.title for item in items] == ["Fresh LLM paper"]
+
+        # The cutoff applies to that call only
+        assert r.since is None
+        with patch("httpx.AsyncClient", return_value=mock_client):
+            items = await r.research()
+        assert [item.title for item in items] == ["Fresh LLM paper", "Older LLM paper"]
+
+    def test_cache_key_matches_identical_config(self):
+        assert HuggingFaceResearcher().cache_key() == HuggingFaceResearcher().cache_key()
+        assert HuggingFaceResearcher().cache_key() != HuggingFaceResearcher(max_items=3).cache_key()
+        assert HuggingFaceResearcher().cache_key() != TechCrunchResearcher().cache_key()
+
     @pytest.mark.asyncio
     async def test_fetch_content_http_error(self):
         r = HuggingFaceResearcher()
@@ -0,0 +1,40 @@
+"""
+Unit tests for the settings module.
+"""
+
+from pathlib import Path
+
+import src.config.settings as settings_module
+from src.config.settings import Settings, get_settings
+
+
+class TestGetSettings:
+    def test_returns_settings_instance(self):
+        assert isinstance(get_settings(), Settings)
+
+    def test_is_cached(self):
+        assert get_settings() is get_settings()
+
+    def test_module_global_is_cached_instance(self):
+        assert settings_module.settings is get_settings()
+
+
+class TestAllowedCommands:
+    def test_default_is_frozenset(self):
+        assert isinstance(Settings().pa_allowed_commands, frozenset)
+        assert "pytest" in Settings().pa_allowed_commands
+
+    def test_list_input_is_frozen_and_deduplicated(self):
+        s = Settings(pa_allowed_commands=["git", "git", "ls"])
+        assert s.pa_allowed_commands == frozenset({"git", "ls"})
+
+
+class TestSingleSettingsModule:
+    def test_only_one_settings_module_exists(self):
+        config_dir = Path(settings_module.__file__).parent
+        assert list(config_dir.glob("settings*.py")) == [Path(settings_module.__file__)]
+
+
+class TestDeferredBuild:
+    def test_schema_build_is_deferred(self):
+        assert Settings.model_config.get("defer_build") is True
@@ -30,6 +30,161 @@ async def test_init_db(state_manager):
         assert table in table_names, f"Table {table} not created"
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_connection_is_reused(state_manager):
+    """Test that calls share one connection and fail loudly once it is closed."""
+    conn = await state_manager._conn()
+    await state_manager.check_duplicate(url="https://example.com", title="Title")
+    assert await state_manager._conn() is conn
+
+    await state_manager.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        await state_manager.set_fact("key", "value")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_connection_uses_wal(state_manager):
+    """Test that the shared connection is tuned at connect time."""
+    db = await state_manager._conn()
+
+    async with db.execute("PRAGMA journal_mode") as cursor:
+        assert (await cursor.fetchone())[0] == "wal"
+    async with db.execute("PRAGMA synchronous") as cursor:
+        assert (await cursor.fetchone())[0] == 1  # NORMAL
+    async with db.execute("PRAGMA journal_size_limit") as cursor:
+        assert (await cursor.fetchone())[0] == 64 * 1024 * 1024
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_init_db_migrates_key_value_tables_to_without_rowid(temp_dir):
+    """Test that rowid-era fingerprint, fact and metrics tables are rebuilt with their rows kept."""
+    import aiosqlite
+
+    from src.core.state_manager import StateManager
+
+    db_path = temp_dir / "old.db"
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute(
+            "CREATE TABLE content_fingerprints (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "content_hash TEXT UNIQUE NOT NULL, first_seen TIMESTAMP, source TEXT)"
+        )
+        await db.execute(
+            "CREATE TABLE agent_facts (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "key TEXT UNIQUE NOT NULL, value TEXT NOT NULL, source TEXT NOT NULL DEFAULT 'user', "
+            "created_at TIMESTAMP, updated_at TIMESTAMP)"
+        )
+        await db.execute(
+            "INSERT INTO content_fingerprints (content_hash, source) VALUES ('h', 's')"
+        )
+        await db.execute(
+            "CREATE TABLE api_metrics (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "date TEXT NOT NULL, api_name TEXT NOT NULL, request_count INTEGER DEFAULT 0, "
+            "token_count INTEGER DEFAULT 0, estimated_cost REAL DEFAULT 0.0, "
+            "UNIQUE(date, api_name))"
+        )
+        await db.execute("INSERT INTO agent_facts (key, value) VALUES ('k', 'v')")
+        await db.execute(
+            "INSERT INTO api_metrics (date, api_name, request_count, token_count, estimated_cost) "
+            "VALUES ('2026-01-01', 'claude', 2, 100, 0.5)"
+        )
+        await db.commit()
+
+    manager = StateManager(db_path=db_path)
+    await manager.init_db()
+    await manager.init_db()  # already migrated: a no-op
+
+    assert "h" in manager._known_fingerprints
+    assert await manager.get_fact("k") == "v"
+    db = await manager._conn()
+    async with db.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND sql LIKE '%WITHOUT ROWID%'"
+    ) as cursor:
+        rebuilt = {row[0] for row in await cursor.fetchall()}
+    assert {"content_fingerprints", "agent_facts", "api_metrics"} <= rebuilt
+    metrics = await manager.get_metrics("2026-01-01")
+    assert metrics["claude"]["requests"] == 2
+    await manager.close()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_init_db_moves_clarify_deadline_out_of_payload(temp_dir):
+    """Test that a pre-column task_queue gets clarify_deadline filled from the payload."""
+    import aiosqlite
+
+    from src.core.state_manager import StateManager
+
+    db_path = temp_dir / "old.db"
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute(
+            "CREATE TABLE task_queue (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "task_type TEXT NOT NULL, payload TEXT NOT NULL, "
+            "status TEXT NOT NULL DEFAULT 'pending', priority INTEGER NOT NULL DEFAULT 5, "
+            "chat_id INTEGER, result TEXT, error TEXT, created_at TIMESTAMP, updated_at TIMESTAMP)"
+        )
+        await db.execute(
+            "INSERT INTO task_queue (task_type, payload, status) VALUES "
+            "('code', '{\"_clarify_deadline\": \"2026-01-01T00:00:00\"}', "
+            "'waiting_clarification')"
+        )
+        await db.commit()
+
+    manager = StateManager(db_path=db_path)
+    await manager.init_db()
+
+    db = await manager._conn()
+    async with db.execute("SELECT clarify_deadline FROM task_queue") as cursor:
+        assert (await cursor.fetchone())[0] == "2026-01-01T00:00:00"
+    await manager.close()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_facts_are_served_from_memory(state_manager):
+    """Test that facts are cached write-through and refresh_facts picks up outside writes."""
+    import aiosqlite
+
+    await state_manager.set_fact("b", "2")
+    await state_manager.set_fact("a", "1")
+    assert await state_manager.get_all_facts() == {"a": "1", "b": "2"}
+
+    async with aiosqlite.connect(state_manager.db_path) as db:
+        await db.execute("UPDATE agent_facts SET value = 'changed' WHERE key = 'a'")
+        await db.commit()
+
+    assert await state_manager.get_fact("a") == "1"
+    await state_manager.refresh_facts()
+    assert await state_manager.get_fact("a") == "changed"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_init_db_skips_schema_at_current_version(state_manager):
+    """Test that init_db records the schema version and skips the script once it matches."""
+    import aiosqlite
+
+    from src.core.state_manager import _SCHEMA_VERSION, StateManager
+
+    async with aiosqlite.connect(state_manager.db_path) as db:
+        cursor = await db.execute("PRAGMA user_version")
+        assert (await cursor.fetchone())[0] == _SCHEMA_VERSION
+        await db.execute("DROP INDEX idx_newsletters_created_at")
+        await db.commit()
+
+    fresh = StateManager(db_path=state_manager.db_path)
+    await fresh.init_db()
+
+    db = await fresh._conn()
+    async with db.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'idx_newsletters_created_at'"
+    ) as cursor:
+        assert await cursor.fetchone() is None
+    await fresh.close()
+
+
 @pytest.mark.unit
 def test_generate_content_id(state_manager):
     """Test content ID generation."""
@@ -80,6 +235,74 @@ async def test_check_duplicate_exists(state_manager):
     assert is_dup is True
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_check_duplicates_bulk(state_manager):
+    """Test batched duplicate check returns only stored content IDs."""
+    await state_manager.store_fingerprint(
+        url="https://example.com/existing", title="Existing Article", source="test"
+    )
+
+    duplicates = await state_manager.check_duplicates_bulk(
+        [
+            ("https://example.com/existing", "Existing Article"),
+            ("https://example.com/new", "New Article"),
+        ]
+    )
+
+    assert duplicates == {
+        state_manager.generate_content_id("https://example.com/existing", "Existing Article")
+    }
+    assert await state_manager.check_duplicates_bulk([]) == set()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_known_fingerprints_skip_database(state_manager):
+    """Test that confirmed duplicates are answered from memory."""
+    import aiosqlite
+
+    await state_manager.store_fingerprint(
+        url="https://example.com/cached", title="Cached Article", source="test"
+    )
+
+    # Remove the row behind the cache's back; the cached answer must still hold
+    async with aiosqlite.connect(state_manager.db_path) as db:
+        await db.execute("DELETE FROM content_fingerprints")
+        await db.commit()
+
+    assert await state_manager.check_duplicate(
+        url="https://example.com/cached", title="Cached Article"
+    )
+    duplicates = await state_manager.check_duplicates_bulk(
+        [("https://example.com/cached", "Cached Article"), ("https://example.com/new", "New")]
+    )
+    assert duplicates == {
+        state_manager.generate_content_id("https://example.com/cached", "Cached Article")
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_init_db_loads_known_fingerprints(state_manager):
+    """Test that a new manager on an existing database starts with its fingerprints."""
+    import aiosqlite
+
+    from src.core.state_manager import StateManager
+
+    await state_manager.store_fingerprint(
+        url="https://example.com/old", title="Old Article", source="test"
+    )
+    fresh = StateManager(db_path=state_manager.db_path)
+    await fresh.init_db()
+    async with aiosqlite.connect(state_manager.db_path) as db:
+        await db.execute("DELETE FROM content_fingerprints")
+        await db.commit()
+
+    assert await fresh.check_duplicate(url="https://example.com/old", title="Old Article")
+    await fresh.close()
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_store_content(state_manager):
@@ -102,6 +325,118 @@ async def test_store_content(state_manager):
     assert is_dup is True
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_empty_metadata_is_stored_as_null(state_manager):
+    """Test that metadata is JSON when present and NULL when empty."""
+    import json
+
+    import aiosqlite
+
+    await state_manager.store_content(
+        {"url": "https://a", "title": "A", "source": "s", "metadata": {"k": 1}}
+    )
+    await state_manager.store_content_bulk([("https://b", "B", "s", None, {}, None)])
+
+    async with aiosqlite.connect(state_manager.db_path) as db:
+        cursor = await db.execute("SELECT url, metadata FROM published_items ORDER BY url")
+        rows = await cursor.fetchall()
+
+    assert json.loads(rows[0][1]) == {"k": 1}
+    assert rows[1] == ("https://b", None)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_store_content_is_atomic(state_manager):
+    """Test that a failed item insert does not leave its fingerprint behind."""
+    import aiosqlite
+
+    item = {"url": "https://arxiv.org/abs/1", "title": "Stored", "source": "arxiv"}
+    await state_manager.store_content(item)
+    async with aiosqlite.connect(state_manager.db_path) as db:
+        await db.execute("DELETE FROM content_fingerprints")
+        await db.commit()
+
+    with pytest.raises(aiosqlite.IntegrityError):
+        await state_manager.store_content(item)
+
+    async with aiosqlite.connect(state_manager.db_path) as db:
+        cursor = await db.execute("SELECT COUNT(*) FROM content_fingerprints")
+        assert (await cursor.fetchone())[0] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_store_content_bulk(state_manager):
+    """Test storing several items in one call."""
+    rows = [
+        (f"https://arxiv.org/abs/2024.{i}", f"Paper {i}", "arxiv", "research", {}, "2026-02-15-10")
+        for i in range(3)
+    ]
+
+    assert await state_manager.store_content_bulk(rows) == 3
+    assert await state_manager.store_content_bulk([]) == 0
+
+    for url, title, *_ in rows:
+        assert await state_manager.check_duplicate(url=url, title=title)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_store_content_bulk_is_atomic(state_manager):
+    """Test that a duplicate row rolls back the whole batch."""
+    import aiosqlite
+
+    stored = {"url": "https://arxiv.org/abs/1", "title": "Stored", "source": "arxiv"}
+    await state_manager.store_content(stored)
+    fresh = ("https://arxiv.org/abs/2", "Fresh", "arxiv", None, None, None)
+    duplicate = (stored["url"], stored["title"], "arxiv", None, None, None)
+
+    with pytest.raises(aiosqlite.IntegrityError):
+        await state_manager.store_content_bulk([fresh, duplicate])
+
+    assert not await state_manager.check_duplicate(url=fresh[0], title=fresh[1])
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_enhancement_cache_roundtrip(state_manager):
+    """Test storing and reading back a cached enhancement payload."""
+    payload = {"messages": [], "metrics": {"total_items": 0}}
+
+    assert await state_manager.get_cached_enhancement("key", max_age_seconds=60) is None
+
+    await state_manager.store_cached_enhancement("key", payload)
+
+    assert await state_manager.get_cached_enhancement("key", max_age_seconds=60) == payload
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_enhancement_cache_expires(state_manager):
+    """Test that entries older than max_age_seconds are ignored."""
+    import aiosqlite
+
+    await state_manager.store_cached_enhancement("key", {"messages": []})
+    async with aiosqlite.connect(state_manager.db_path) as db:
+        await db.execute("UPDATE enhancement_cache SET created_at = datetime('now', '-2 hours')")
+        await db.commit()
+
+    assert await state_manager.get_cached_enhancement("key", max_age_seconds=3600) is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_enhanced_items_roundtrip(state_manager):
+    """Test storing and bulk-reading per-item enhancements."""
+    await state_manager.store_enhanced_items([("id-1", "headline", "takeaway")])
+
+    found = await state_manager.get_enhanced_items(["id-1", "id-2"])
+
+    assert found == {"id-1": ("headline", "takeaway")}
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_create_newsletter_record(state_manager):
@@ -116,6 +451,24 @@ async def test_create_newsletter_record(state_manager):
     assert newsletter_id > 0
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_minutes_since_last_newsletter(state_manager):
+    """Test the no-newsletter sentinel, a fresh record, and the index-only MAX lookup."""
+    assert await state_manager.minutes_since_last_newsletter() == 999_999.0
+
+    await state_manager.create_newsletter_record(
+        newsletter_date="2026-02-15-10", item_count=5, platforms_published=["discord"]
+    )
+
+    assert await state_manager.minutes_since_last_newsletter() < 1
+
+    db = await state_manager._conn()
+    async with db.execute("EXPLAIN QUERY PLAN SELECT MAX(created_at) FROM newsletters") as cursor:
+        plan = " ".join(row[-1] for row in await cursor.fetchall())
+    assert "idx_newsletters_created_at" in plan
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_log_publishing_attempt(state_manager):
@@ -137,6 +490,88 @@ async def test_log_publishing_attempt(state_manager):
     # Should complete without error
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_log_publishing_attempts_bulk(state_manager):
+    """Test logging several publishing attempts at once."""
+    import aiosqlite
+
+    newsletter_id = await state_manager.create_newsletter_record(
+        newsletter_date="2026-02-15-10", item_count=5, platforms_published=["discord"]
+    )
+
+    await state_manager.log_publishing_attempts_bulk(
+        newsletter_id,
+        [("discord", "success", None, 1), ("twitter", "failed", "rate limited", 1)],
+    )
+    await state_manager.log_publishing_attempts_bulk(newsletter_id, [])
+
+    async with aiosqlite.connect(state_manager.db_path) as db:
+        cursor = await db.execute(
+            "SELECT platform, status, error_message FROM publishing_logs "
+            "WHERE newsletter_id = ? ORDER BY id",
+            (newsletter_id,),
+        )
+        rows = await cursor.fetchall()
+
+    assert rows == [("discord", "success", None), ("twitter", "failed", "rate limited")]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_count_fix_attempts_uses_covering_index(state_manager):
+    """Test the fix-attempt count and that it is answered from the index alone."""
+    await state_manager.record_github_event(1, "sha1", "ci_failure", "ruff_fix_pushed")
+    await state_manager.record_github_event(1, "sha2", "ci_failure", "ai_fix_pushed")
+    await state_manager.record_github_event(1, "sha3", "needs_review", "review_posted")
+    await state_manager.record_github_event(2, "sha4", "ci_failure", "ruff_fix_pushed")
+
+    assert await state_manager.count_fix_attempts(1) == 2
+
+    db = await state_manager._conn()
+    async with db.execute(
+        "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM github_events "
+        "WHERE pr_number = ? AND action_taken IN ('ruff_fix_pushed', 'ai_fix_pushed')",
+        (1,),
+    ) as cursor:
+        plan = " ".join(row[-1] for row in await cursor.fetchall())
+    assert "COVERING INDEX idx_github_events_pr_action" in plan
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_record_github_event_ignores_repeats(state_manager):
+    """Test that recording the same event twice keeps the first row and does not raise."""
+    await state_manager.record_github_event(1, "sha1", "ci_failure", "ruff_fix_pushed")
+    await state_manager.record_github_event(1, "sha1", "ci_failure", "ai_fix_pushed")
+
+    assert await state_manager.is_github_event_processed(1, "sha1", "ci_failure")
+    history = await state_manager.get_fix_history(1)
+    assert [h["action_taken"] for h in history] == ["ruff_fix_pushed"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_fix_history_uses_covering_index(state_manager):
+    """Test fix history contents and that it is answered from the index alone."""
+    await state_manager.record_github_event(1, "sha1", "ci_failure", "ruff_fix_pushed")
+    await state_manager.record_github_event(1, "sha2", "needs_review", "review_posted")
+
+    history = await state_manager.get_fix_history(1)
+
+    assert [(h["head_sha"], h["action_taken"]) for h in history] == [("sha1", "ruff_fix_pushed")]
+
+    db = await state_manager._conn()
+    async with db.execute(
+        "EXPLAIN QUERY PLAN SELECT head_sha, action_taken, processed_at FROM github_events "
+        "WHERE pr_number = ? AND action_taken IN ('ruff_fix_pushed', 'ai_fix_pushed') "
+        "ORDER BY processed_at ASC",
+        (1,),
+    ) as cursor:
+        plan = " ".join(row[-1] for row in await cursor.fetchall())
+    assert "COVERING INDEX idx_github_events_pr_action" in plan
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_track_api_usage(state_manager):
@@ -161,3 +596,34 @@ async def test_get_metrics_empty(state_manager):
 
     assert isinstance(metrics, dict)
     assert metrics.get("total_cost", 0) == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_published_items_has_single_content_id_index(state_manager):
+    """Test that content_id lookups use the UNIQUE autoindex and no duplicate remains."""
+    import aiosqlite
+
+    async with aiosqlite.connect(state_manager.db_path) as db:
+        cursor = await db.execute("SELECT name FROM pragma_index_list('published_items')")
+        names = {row[0] for row in await cursor.fetchall()}
+        cursor = await db.execute(
+            "EXPLAIN QUERY PLAN SELECT 1 FROM published_items WHERE content_id = ?", ("x",)
+        )
+        plan = " ".join(row[-1] for row in await cursor.fetchall())
+
+    assert "idx_content_id" not in names
+    assert "sqlite_autoindex_published_items_1" in plan
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_telegram_update_offset_only_moves_forward(state_manager):
+    """Test that the stored update offset never rewinds and stays out of the facts."""
+    assert await state_manager.get_telegram_update_offset() is None
+
+    await state_manager.set_telegram_update_offset(10)
+    await state_manager.set_telegram_update_offset(7)
+
+    assert await state_manager.get_telegram_update_offset() == 10
+    assert await state_manager.get_all_facts() == {}
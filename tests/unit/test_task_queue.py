@@ -4,13 +4,21 @@ Unit tests for TaskQueue.
 Uses a temporary in-memory SQLite database (not the production state.db).
 """
 
+import asyncio
 from datetime import datetime, timedelta
 
+import aiosqlite
 import pytest
 import pytest_asyncio
 
 from src.core.state_manager import StateManager
-from src.core.task_queue import VALID_STATUSES, VALID_TASK_TYPES, TaskQueue
+from src.core.task_queue import (
+    MAX_PRIORITY,
+    MIN_PRIORITY,
+    VALID_STATUSES,
+    VALID_TASK_TYPES,
+    TaskQueue,
+)
 
 
 @pytest_asyncio.fixture
@@ -19,13 +27,26 @@ async def db_path(tmp_path):
     path = tmp_path / "test_state.db"
     sm = StateManager(db_path=path)
     await sm.init_db()
+    await sm.close()
     return path
 
 
 @pytest_asyncio.fixture
 async def queue(db_path):
     """TaskQueue backed by the temporary database."""
-    return TaskQueue(db_path=db_path)
+    q = TaskQueue(db_path=db_path)
+    yield q
+    await q.close()
+
+
+async def _backdate_deadline(db_path, task_id):
+    """Move a waiting task's clarification deadline into the past."""
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute(
+            "UPDATE task_queue SET clarify_deadline = ? WHERE id = ?",
+            ((datetime.utcnow() - timedelta(minutes=1)).isoformat(), task_id),
+        )
+        await db.commit()
 
 
 # ---------------------------------------------------------------------------
@@ -43,6 +64,14 @@ class TestPush:
         id2 = await queue.push("newsletter", {})
         assert id2 > id1
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    async def test_payload_round_trips(self, queue, monkeypatch, use_orjson):
+        if not use_orjson:
+            monkeypatch.setattr("src.core.task_queue.orjson", None)
+        task_id = await queue.push("code", {"instruction": "ünïcode", "n": [1, 2.5], 3: None})
+        task = await queue.get(task_id)
+        assert task.payload == {"instruction": "ünïcode", "n": [1, 2.5], "3": None}
+
     async def test_rejects_unknown_task_type(self, queue):
         with pytest.raises(ValueError, match="Unknown task_type"):
             await queue.push("unknown_type", {})
@@ -57,12 +86,76 @@ class TestPush:
         task = await queue.get(task_id)
         assert task.chat_id == 42
 
+    async def test_rejects_out_of_range_priority(self, queue):
+        with pytest.raises(ValueError, match="Priority"):
+            await queue.push("status", {}, priority=0)
+        with pytest.raises(ValueError, match="Priority"):
+            await queue.push("status", {}, priority=11)
+
+    async def test_accepts_priority_bounds(self, queue):
+        assert await queue.push("status", {}, priority=MIN_PRIORITY) > 0
+        assert await queue.push("status", {}, priority=MAX_PRIORITY) > 0
+
     async def test_default_priority_is_five(self, queue):
         task_id = await queue.push("status", {})
         task = await queue.get(task_id)
         assert task.priority == 5
 
 
+# ---------------------------------------------------------------------------
+# push_many
+# ---------------------------------------------------------------------------
+
+
+class TestPushMany:
+    async def test_returns_ids_in_order(self, queue):
+        ids = await queue.push_many([("status", {}, None, 5), ("newsletter", {}, 7, 1)])
+        assert len(ids) == 2
+        assert ids[1] > ids[0]
+
+    async def test_stores_all_fields(self, queue):
+        [task_id] = await queue.push_many([("code", {"instruction": "x"}, 42, 3)])
+        task = await queue.get(task_id)
+        assert task.task_type == "code"
+        assert task.payload == {"instruction": "x"}
+        assert task.chat_id == 42
+        assert task.priority == 3
+
+    async def test_empty_batch_returns_empty_list(self, queue):
+        assert await queue.push_many([]) == []
+
+    async def test_rejects_batch_with_unknown_task_type(self, queue):
+        with pytest.raises(ValueError, match="Unknown task_type"):
+            await queue.push_many([("status", {}, None, 5), ("bogus", {}, None, 5)])
+        assert await queue.depth("pending") == 0
+
+
+# ---------------------------------------------------------------------------
+# wait_for_push
+# ---------------------------------------------------------------------------
+
+
+class TestWaitForPush:
+    async def test_times_out_without_push(self, queue):
+        assert await queue.wait_for_push(0.01) is False
+
+    async def test_woken_by_push_from_another_instance(self, queue, db_path):
+        waiter = asyncio.create_task(queue.wait_for_push(5))
+        await asyncio.sleep(0)
+        producer = TaskQueue(db_path=db_path)
+        await producer.push("status", {})
+        await producer.close()
+        assert await asyncio.wait_for(waiter, timeout=1) is True
+
+    async def test_woken_by_resume_with_answer(self, queue):
+        task_id = await queue.push("code", {})
+        await queue.await_clarification(task_id)
+        waiter = asyncio.create_task(queue.wait_for_push(5))
+        await asyncio.sleep(0)
+        await queue.resume_with_answer(task_id, "yes")
+        assert await asyncio.wait_for(waiter, timeout=1) is True
+
+
 # ---------------------------------------------------------------------------
 # pop
 # ---------------------------------------------------------------------------
@@ -103,6 +196,37 @@ class TestPop:
         await queue.push("newsletter", {})
         assert await queue.pop(task_type="code") is None
 
+    async def test_pop_query_is_served_by_index_without_sort(self, db_path):
+        async with aiosqlite.connect(db_path) as db:
+            cursor = await db.execute(
+                """
+                EXPLAIN QUERY PLAN
+                UPDATE task_queue
+                SET status = 'in_progress', updated_at = CURRENT_TIMESTAMP
+                WHERE id = (
+                    SELECT id FROM task_queue
+                    WHERE status = 'pending'
+                    ORDER BY priority ASC, created_at ASC
+                    LIMIT 1
+                )
+                RETURNING id, task_type, payload, priority, chat_id
+                """
+            )
+            plan = " ".join(row[-1] for row in await cursor.fetchall())
+        assert "USING INDEX idx_task_queue_pending" in plan
+        assert "TEMP B-TREE" not in plan
+
+    async def test_concurrent_pops_claim_distinct_tasks(self, queue, db_path):
+        await queue.push("status", {"n": 1})
+        await queue.push("status", {"n": 2})
+        other = TaskQueue(db_path=db_path)
+        try:
+            first, second = await asyncio.gather(queue.pop(), other.pop())
+        finally:
+            await other.close()
+        assert {first.id, second.id} == {1, 2}
+        assert await queue.pop() is None
+
     async def test_fifo_within_same_priority(self, queue):
         id1 = await queue.push("status", {"n": 1}, priority=5)
         id2 = await queue.push("status", {"n": 2}, priority=5)
@@ -176,12 +300,16 @@ class TestClarificationHelpers:
         task = await queue.get(task_id)
         assert task.status == "waiting_clarification"
 
-    async def test_await_clarification_stores_deadline(self, queue):
+    async def test_await_clarification_stores_deadline(self, queue, db_path):
         task_id = await queue.push("code", {"instruction": "x"}, chat_id=99)
         await queue.pop()
         await queue.await_clarification(task_id)
-        task = await queue.get(task_id)
-        assert "_clarify_deadline" in task.payload
+        async with aiosqlite.connect(db_path) as db:
+            cursor = await db.execute(
+                "SELECT clarify_deadline FROM task_queue WHERE id = ?", (task_id,)
+            )
+            deadline = (await cursor.fetchone())[0]
+        assert deadline > datetime.utcnow().isoformat()
 
     async def test_find_waiting_clarification_returns_task(self, queue):
         task_id = await queue.push("code", {"instruction": "x"}, chat_id=55)
@@ -211,31 +339,23 @@ class TestClarificationHelpers:
         assert task.status == "pending"
         assert task.payload["clarify_answer"] == "my answer"
 
-    async def test_resume_with_answer_removes_deadline(self, queue):
+    async def test_resume_with_answer_removes_deadline(self, queue, db_path):
         task_id = await queue.push("code", {"instruction": "x"}, chat_id=55)
         await queue.pop()
         await queue.await_clarification(task_id)
         await queue.resume_with_answer(task_id, "answer")
-        task = await queue.get(task_id)
-        assert "_clarify_deadline" not in task.payload
+        async with aiosqlite.connect(db_path) as db:
+            cursor = await db.execute(
+                "SELECT clarify_deadline FROM task_queue WHERE id = ?", (task_id,)
+            )
+            assert (await cursor.fetchone())[0] is None
 
     async def test_expire_stale_clarifications_marks_failed(self, queue):
         task_id = await queue.push("code", {"instruction": "x"}, chat_id=55)
         await queue.pop()
         await queue.await_clarification(task_id)
         # Manually backdate the deadline to simulate expiry
-        import json
-
-        async with __import__("aiosqlite").connect(queue.db_path) as db:
-            cursor = await db.execute("SELECT payload FROM task_queue WHERE id = ?", (task_id,))
-            row = await cursor.fetchone()
-            payload = json.loads(row[0])
-            payload["_clarify_deadline"] = (datetime.utcnow() - timedelta(minutes=1)).isoformat()
-            await db.execute(
-                "UPDATE task_queue SET payload = ? WHERE id = ?",
-                (json.dumps(payload), task_id),
-            )
-            await db.commit()
+        await _backdate_deadline(queue.db_path, task_id)
 
         expired = await queue.expire_stale_clarifications()
         assert any(t[0] == task_id for t in expired)
@@ -244,21 +364,10 @@ class TestClarificationHelpers:
         assert "Timed out" in (task.error or "")
 
     async def test_expire_stale_clarifications_returns_chat_id(self, queue):
-        import json
-
         task_id = await queue.push("code", {"instruction": "x"}, chat_id=77)
         await queue.pop()
         await queue.await_clarification(task_id)
-        async with __import__("aiosqlite").connect(queue.db_path) as db:
-            cursor = await db.execute("SELECT payload FROM task_queue WHERE id = ?", (task_id,))
-            row = await cursor.fetchone()
-            payload = json.loads(row[0])
-            payload["_clarify_deadline"] = (datetime.utcnow() - timedelta(minutes=1)).isoformat()
-            await db.execute(
-                "UPDATE task_queue SET payload = ? WHERE id = ?",
-                (json.dumps(payload), task_id),
-            )
-            await db.commit()
+        await _backdate_deadline(queue.db_path, task_id)
 
         expired = await queue.expire_stale_clarifications()
         chat_ids = [chat_id for _, chat_id in expired]
@@ -272,6 +381,21 @@ class TestClarificationHelpers:
         # Deadline is 10 minutes in the future — should not expire
         assert not any(t[0] == task_id for t in expired)
 
+    async def test_expire_query_seeks_deadline_index(self, db_path):
+        async with aiosqlite.connect(db_path) as db:
+            cursor = await db.execute(
+                """
+                EXPLAIN QUERY PLAN
+                UPDATE task_queue
+                SET status = 'failed'
+                WHERE status = 'waiting_clarification' AND clarify_deadline < ?
+                RETURNING id, chat_id
+                """,
+                (datetime.utcnow().isoformat(),),
+            )
+            plan = " ".join(row[-1] for row in await cursor.fetchall())
+        assert "USING INDEX idx_task_queue_deadline (clarify_deadline<?)" in plan
+
 
 class TestDepth:
     async def test_zero_on_empty(self, queue):
@@ -294,3 +418,29 @@ class TestDepth:
         await queue.update(task_id, status="done")
         assert await queue.depth("done") == 1
         assert await queue.depth("pending") == 0
+
+
+# ---------------------------------------------------------------------------
+# connection
+# ---------------------------------------------------------------------------
+
+
+class TestConnection:
+    async def test_connection_is_reused_until_close(self, queue):
+        await queue.push("status", {})
+        first = queue._db
+        await queue.depth()
+        assert queue._db is first
+
+        await queue.close()
+        assert queue._db is None
+        assert await queue.depth() == 1
+
+    async def test_rolled_back_write_leaves_queue_unchanged(self, queue):
+        with pytest.raises(RuntimeError):
+            async with queue._transaction() as db:
+                await db.execute(
+                    "INSERT INTO task_queue (task_type, payload) VALUES ('status', '{}')"
+                )
+                raise RuntimeError("boom")
+        assert await queue.depth() == 0
@@ -4,6 +4,7 @@ Unit tests for TaskWorker.
 Mocks StateManager, TaskQueue, and handlers so no real DB or API calls are made.
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.agents.handlers.newsletter_handler import HandlerResult
@@ -21,6 +22,7 @@ def _make_worker() -> TaskWorker:
     worker.task_queue = MagicMock()
     # expire_stale_clarifications is awaited in poll() — must be AsyncMock
     worker.task_queue.expire_stale_clarifications = AsyncMock(return_value=[])
+    worker.task_queue.close = AsyncMock()
     return worker
 
 
@@ -46,6 +48,44 @@ class TestPoll:
         assert result == []
 
 
+class TestWaitForNextCycle:
+    async def test_waits_on_queue_push_signal(self):
+        worker = _make_worker()
+        worker.task_queue.wait_for_push = AsyncMock(return_value=False)
+
+        await worker.wait_for_next_cycle(5)
+
+        worker.task_queue.wait_for_push.assert_awaited_once_with(5)
+
+
+class TestRunForeverStopEvent:
+    async def test_stop_event_cuts_wait_short(self):
+        worker = _make_worker()
+        worker.run_cycle = AsyncMock()
+        stop_event = asyncio.Event()
+
+        async def wait_then_stop(timeout):
+            stop_event.set()
+            await asyncio.sleep(3600)  # Would hang without the stop event
+
+        worker.task_queue.wait_for_push = wait_then_stop
+
+        await asyncio.wait_for(worker.run_forever(interval_seconds=3600, stop_event=stop_event), 1)
+
+        worker.run_cycle.assert_awaited_once()
+
+    async def test_preset_stop_event_skips_cycles(self):
+        worker = _make_worker()
+        worker.run_cycle = AsyncMock()
+        stop_event = asyncio.Event()
+        stop_event.set()
+
+        await worker.run_forever(stop_event=stop_event)
+
+        worker.run_cycle.assert_not_awaited()
+        worker.task_queue.close.assert_awaited_once()
+
+
 # ---------------------------------------------------------------------------
 # triage
 # ---------------------------------------------------------------------------
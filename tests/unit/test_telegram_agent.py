@@ -7,7 +7,15 @@ Uses MagicMock for Update/Context objects.
 
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from src.agents.telegram_agent import TelegramAgent, _to_api_messages
+import pytest
+from telegram.error import TelegramError
+
+from src.agents.telegram_agent import (
+    TelegramAgent,
+    _OrjsonRequest,
+    _split_message,
+    _to_api_messages,
+)
 from src.memory.memory_store import Message
 
 
@@ -16,10 +24,14 @@ def _make_agent(owner_id: int = 42) -> TelegramAgent:
     sm.set_fact = AsyncMock()
     sm.get_fact = AsyncMock(return_value=None)
     sm.get_all_facts = AsyncMock(return_value={})
+    sm.get_telegram_update_offset = AsyncMock(return_value=None)
+    sm.set_telegram_update_offset = AsyncMock()
     agent = TelegramAgent(state_manager=sm)
+    agent._owner_id = owner_id
     agent.task_queue = MagicMock()
     agent.task_queue.push = AsyncMock(return_value=1)
     agent.task_queue.find_waiting_clarification = AsyncMock(return_value=None)
+    agent.task_queue.close = AsyncMock()
     return agent
 
 
@@ -36,9 +48,178 @@ def _make_update(user_id: int, text: str = "", chat_id: int = 100) -> MagicMock:
 def _make_context(args: list[str] | None = None) -> MagicMock:
     ctx = MagicMock()
     ctx.args = args or []
+    ctx.bot.send_message = AsyncMock()
     return ctx
 
 
+# ---------------------------------------------------------------------------
+# Lifecycle
+# ---------------------------------------------------------------------------
+
+
+class TestLifecycle:
+    async def test_stop_ends_run_forever_and_shuts_down(self):
+        import asyncio
+
+        agent = _make_agent()
+        app = MagicMock()
+        app.initialize = AsyncMock()
+        app.start = AsyncMock()
+        app.stop = AsyncMock()
+        app.shutdown = AsyncMock()
+        app.updater.start_polling = AsyncMock()
+        app.updater.stop = AsyncMock()
+        app.bot.get_updates = AsyncMock()
+
+        with patch.object(agent, "_build_application", return_value=app):
+            runner = asyncio.create_task(agent.run_forever())
+            await asyncio.sleep(0)
+            agent.stop()
+            await asyncio.wait_for(runner, timeout=1)
+
+        app.updater.stop.assert_awaited_once()
+        app.shutdown.assert_awaited_once()
+        agent.task_queue.close.assert_awaited_once()
+
+    async def test_first_run_drops_pending_updates(self):
+        agent = _make_agent()
+        app = MagicMock()
+        app.updater.start_polling = AsyncMock()
+        app.bot.get_updates = AsyncMock()
+
+        await agent._start_polling(app)
+
+        app.bot.get_updates.assert_not_called()
+        assert app.updater.start_polling.call_args.kwargs["drop_pending_updates"] is True
+
+    async def test_resumes_from_stored_offset(self):
+        agent = _make_agent()
+        agent.state_manager.get_telegram_update_offset = AsyncMock(return_value=41)
+        app = MagicMock()
+        app.updater.start_polling = AsyncMock()
+        app.bot.get_updates = AsyncMock()
+
+        await agent._start_polling(app)
+
+        assert app.bot.get_updates.call_args.kwargs["offset"] == 42
+        assert "drop_pending_updates" not in app.updater.start_polling.call_args.kwargs
+
+    async def test_offset_recorded_after_owner_update_is_handled(self):
+        agent = _make_agent(owner_id=42)
+        update = _make_update(user_id=42, text="/status")
+        update.update_id = 77
+        calls = []
+        agent._commands["status"] = AsyncMock(side_effect=lambda *_: calls.append("handled"))
+        agent.state_manager.set_telegram_update_offset = AsyncMock(
+            side_effect=lambda update_id: calls.append(update_id)
+        )
+
+        await agent._dispatch(update, _make_context())
+
+        assert calls == ["handled", 77]
+
+    async def test_offset_not_recorded_for_unauthorized_update(self):
+        agent = _make_agent(owner_id=42)
+        update = _make_update(user_id=999, text="/status")
+        agent._commands["status"] = AsyncMock()
+
+        await agent._dispatch(update, _make_context())
+
+        agent.state_manager.set_telegram_update_offset.assert_not_called()
+
+    async def test_offset_not_recorded_when_handler_fails(self):
+        agent = _make_agent(owner_id=42)
+        update = _make_update(user_id=42, text="/status")
+        agent._commands["status"] = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with pytest.raises(RuntimeError):
+            await agent._dispatch(update, _make_context())
+
+        agent.state_manager.set_telegram_update_offset.assert_not_called()
+
+    def test_stop_before_run_is_noop(self):
+        _make_agent().stop()
+
+
+# ---------------------------------------------------------------------------
+# Dispatch
+# ---------------------------------------------------------------------------
+
+
+class TestDispatch:
+    async def test_command_routed_inline_with_args(self):
+        agent = _make_agent()
+        update = _make_update(user_id=42, text="/remember key some value")
+        ctx = _make_context()
+        handler = AsyncMock()
+        agent._commands["remember"] = handler
+
+        await agent._dispatch(update, ctx)
+
+        handler.assert_awaited_once_with(update, ctx)
+        assert ctx.args == ["key", "some", "value"]
+        ctx.application.create_task.assert_not_called()
+
+    async def test_queueing_command_runs_in_background(self):
+        agent = _make_agent()
+        update = _make_update(user_id=42, text="/code fix it")
+        ctx = _make_context()
+        handler = AsyncMock()
+        agent._commands["code"] = handler
+        ctx.application.create_task = MagicMock(side_effect=lambda coro, update: coro.close())
+
+        await agent._dispatch(update, ctx)
+
+        ctx.application.create_task.assert_called_once()
+        assert ctx.args == ["fix", "it"]
+
+    async def test_free_text_runs_in_background(self):
+        agent = _make_agent()
+        update = _make_update(user_id=42, text="hello there")
+        ctx = _make_context()
+        ctx.application.create_task = MagicMock(side_effect=lambda coro, update: coro.close())
+        with patch.object(agent, "_handle_free_text", new=AsyncMock()) as handler:
+            await agent._dispatch(update, ctx)
+
+        handler.assert_called_once_with(update, ctx)
+        ctx.application.create_task.assert_called_once()
+
+    async def test_command_addressed_to_this_bot_is_handled(self):
+        agent = _make_agent()
+        update = _make_update(user_id=42, text="/Status@ElvBot")
+        ctx = _make_context()
+        ctx.bot.username = "elvbot"
+        handler = AsyncMock()
+        agent._commands["status"] = handler
+
+        await agent._dispatch(update, ctx)
+
+        handler.assert_awaited_once()
+
+    async def test_command_for_other_bot_is_ignored(self):
+        agent = _make_agent()
+        update = _make_update(user_id=42, text="/status@OtherBot")
+        ctx = _make_context()
+        ctx.bot.username = "ElvBot"
+        handler = AsyncMock()
+        agent._commands["status"] = handler
+
+        await agent._dispatch(update, ctx)
+
+        handler.assert_not_called()
+
+    async def test_unknown_command_is_ignored(self):
+        agent = _make_agent()
+        update = _make_update(user_id=42, text="/bogus")
+        ctx = _make_context()
+        with patch.object(agent, "_handle_free_text", new=AsyncMock()) as free_text:
+            await agent._dispatch(update, ctx)
+
+        free_text.assert_not_called()
+        ctx.application.create_task.assert_not_called()
+        update.message.reply_text.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # Authorization
 # ---------------------------------------------------------------------------
@@ -48,21 +229,48 @@ class TestAuthorize:
     async def test_authorized_user_passes(self):
         agent = _make_agent(owner_id=42)
         update = _make_update(user_id=42)
-        with patch("src.agents.telegram_agent.settings") as mock_settings:
-            mock_settings.telegram_owner_id = 42
-            result = await agent._authorize(update)
+        result = await agent._authorize(update)
         assert result is True
         update.message.reply_text.assert_not_called()
 
     async def test_unauthorized_user_rejected(self):
         agent = _make_agent(owner_id=42)
         update = _make_update(user_id=999)
-        with patch("src.agents.telegram_agent.settings") as mock_settings:
-            mock_settings.telegram_owner_id = 42
-            result = await agent._authorize(update)
+        result = await agent._authorize(update)
         assert result is False
         update.message.reply_text.assert_awaited_once_with("Unauthorized.")
 
+    async def test_repeated_rejections_logged_once_per_window(self):
+        agent = _make_agent(owner_id=42)
+        with patch("src.agents.telegram_agent.logger") as mock_logger:
+            await agent._authorize(_make_update(user_id=999))
+            await agent._authorize(_make_update(user_id=999))
+            await agent._authorize(_make_update(user_id=998))
+        assert mock_logger.warning.call_count == 2
+
+    async def test_rejection_logged_again_after_window(self):
+        agent = _make_agent(owner_id=42)
+        with (
+            patch("src.agents.telegram_agent.logger") as mock_logger,
+            patch("src.agents.telegram_agent.time.monotonic", side_effect=[1000.0, 1061.0]),
+        ):
+            await agent._authorize(_make_update(user_id=999))
+            await agent._authorize(_make_update(user_id=999))
+        assert mock_logger.warning.call_count == 2
+
+    async def test_stale_rejection_entries_are_pruned(self):
+        agent = _make_agent(owner_id=42)
+        agent._rejections_logged = {1: 0.0, 2: 900.0}
+        with patch("src.agents.telegram_agent.time.monotonic", return_value=1000.0):
+            await agent._authorize(_make_update(user_id=999))
+        assert set(agent._rejections_logged) == {2, 999}
+
+    async def test_owner_id_read_from_settings_at_init(self):
+        with patch("src.agents.telegram_agent.settings") as mock_settings:
+            mock_settings.telegram_owner_id = 7
+            agent = TelegramAgent(state_manager=MagicMock())
+        assert await agent._authorize(_make_update(user_id=7)) is True
+
 
 # ---------------------------------------------------------------------------
 # /start and /help
@@ -107,7 +315,7 @@ class TestStatusCommand:
     async def test_status_calls_status_handler_inline(self):
         agent = _make_agent()
         update = _make_update(user_id=42)
-        # StatusHandler is imported lazily inside _handle_status — patch at source
+        # Patch on the class so the agent's StatusHandler instance picks it up
         with (
             patch.object(agent, "_authorize", new=AsyncMock(return_value=True)),
             patch(
@@ -151,11 +359,14 @@ class TestNewsletterCommand:
     async def test_newsletter_sends_acknowledgment(self):
         agent = _make_agent()
         update = _make_update(user_id=42, chat_id=77)
+        ctx = _make_context()
         with patch.object(agent, "_authorize", new=AsyncMock(return_value=True)):
-            await agent._handle_newsletter(update, _make_context())
+            await agent._handle_newsletter(update, ctx)
 
-        args = update.message.reply_text.call_args[0][0]
-        assert "task #1" in args.lower() or "#1" in args
+        kwargs = ctx.bot.send_message.call_args.kwargs
+        assert kwargs["chat_id"] == 77
+        assert "#1" in kwargs["text"]
+        update.message.reply_text.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
@@ -194,8 +405,9 @@ class TestCodeCommand:
         with patch.object(agent, "_authorize", new=AsyncMock(return_value=True)):
             await agent._handle_code(update, ctx)
 
-        args = update.message.reply_text.call_args[0][0]
-        assert "#1" in args
+        kwargs = ctx.bot.send_message.call_args.kwargs
+        assert kwargs["chat_id"] == 55
+        assert "#1" in kwargs["text"]
 
 
 # ---------------------------------------------------------------------------
@@ -381,6 +593,21 @@ class TestMemoryCommands:
         reply = update.message.reply_text.call_args[0][0]
         assert "No facts" in reply
 
+    async def test_recall_no_args_splits_long_fact_list(self):
+        agent = _make_agent()
+        facts = {f"key_{i:04d}": "x" * 100 for i in range(100)}
+        agent.state_manager.get_all_facts = AsyncMock(return_value=facts)
+        update = _make_update(user_id=42)
+        ctx = _make_context(args=[])
+        with patch.object(agent, "_authorize", new=AsyncMock(return_value=True)):
+            await agent._handle_recall(update, ctx)
+
+        replies = [c[0][0] for c in update.message.reply_text.call_args_list]
+        assert len(replies) > 1
+        assert all(len(r) <= 4096 for r in replies)
+        assert "key_0000" in replies[0]
+        assert "key_0099" in replies[-1]
+
 
 # ---------------------------------------------------------------------------
 # Memory context in code task payload (Phase D)
@@ -439,17 +666,37 @@ class TestCodeTaskMemoryContext:
         assert payload["context"] == []
         assert payload["instruction"] == "do the thing"
 
+    async def test_ack_preview_truncates_long_instruction(self):
+        agent = _make_agent()
+        instruction = "x" * 100
+        update = _make_update(user_id=42, chat_id=55)
+        ctx = _make_context()
+        await agent._queue_code_task(update, ctx, instruction)
+
+        text = ctx.bot.send_message.call_args.kwargs["text"]
+        assert text.endswith("Instruction: " + "x" * 80 + "...")
+
+    async def test_ack_preview_keeps_short_instruction(self):
+        agent = _make_agent()
+        update = _make_update(user_id=42, chat_id=55)
+        ctx = _make_context()
+        await agent._queue_code_task(update, ctx, "fix it")
+
+        text = ctx.bot.send_message.call_args.kwargs["text"]
+        assert text.endswith("Instruction: fix it")
+
     async def test_ack_message_has_no_phase_warning(self):
         """Phase C warning text has been removed from the acknowledgment."""
         agent = _make_agent()
         update = _make_update(user_id=42, text="do something", chat_id=55)
+        ctx = _make_context()
         with (
             patch.object(agent, "_authorize", new=AsyncMock(return_value=True)),
             patch.object(agent, "_classify_message", new=AsyncMock(return_value="code")),
         ):
-            await agent._handle_free_text(update, _make_context())
+            await agent._handle_free_text(update, ctx)
 
-        reply = update.message.reply_text.call_args[0][0]
+        reply = ctx.bot.send_message.call_args.kwargs["text"]
         assert "Phase C" not in reply
         assert "CodingTool arrives" not in reply
 
@@ -501,6 +748,53 @@ class TestNewChat:
         assert len(agent.memory_store.get_context(55)) == 1
 
 
+# ---------------------------------------------------------------------------
+# _OrjsonRequest
+# ---------------------------------------------------------------------------
+
+
+class TestOrjsonRequest:
+    def test_parses_json_payload(self):
+        payload = b'{"ok": true, "result": [{"update_id": 1}]}'
+        assert _OrjsonRequest.parse_json_payload(payload) == {
+            "ok": True,
+            "result": [{"update_id": 1}],
+        }
+
+    def test_invalid_utf8_falls_back_to_lenient_decode(self):
+        result = _OrjsonRequest.parse_json_payload(b'{"text": "bad \xff byte"}')
+        assert result["text"].startswith("bad ")
+
+    def test_invalid_json_raises_telegram_error(self):
+        with pytest.raises(TelegramError):
+            _OrjsonRequest.parse_json_payload(b"not json")
+
+    def test_application_uses_orjson_requests(self):
+        agent = _make_agent()
+        with patch("src.agents.telegram_agent.settings") as mock_settings:
+            mock_settings.telegram_bot_token = "123:abc"
+            app = agent._build_application()
+        assert isinstance(app.bot.request, _OrjsonRequest)
+
+
+# ---------------------------------------------------------------------------
+# _split_message helper
+# ---------------------------------------------------------------------------
+
+
+class TestSplitMessage:
+    def test_short_text_single_chunk(self):
+        assert _split_message("hello") == ["hello"]
+
+    def test_splits_on_line_breaks(self):
+        result = _split_message("aaa\nbbb\nccc", limit=8)
+        assert result == ["aaa\nbbb", "ccc"]
+
+    def test_hard_splits_long_line(self):
+        result = _split_message("x" * 10, limit=4)
+        assert result == ["xxxx", "xxxx", "xx"]
+
+
 # ---------------------------------------------------------------------------
 # _to_api_messages helper
 # ---------------------------------------------------------------------------